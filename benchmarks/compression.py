@@ -0,0 +1,51 @@
+"""Measure the throughput of compressed ASCII files compared to plain text.
+
+Run with :code:`python benchmarks/compression.py --events 1000000`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from timeit import default_timer
+
+from synthetic import write_synthetic_ascii
+
+from pawian.data import iter_ascii, read_ascii
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=10**6)
+    parser.add_argument("--particles", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "source.dat"
+        write_synthetic_ascii(source, args.events, args.particles)
+        frame = read_ascii(source)
+        plain_size = source.stat().st_size / 1e6
+        print(f"{args.events:,d} events, {plain_size:.1f} MB of plain text")
+        print("codec   size [MB]  ratio  write [MB/s]  read [MB/s]  stream [MB/s]")
+        for suffix in ["", ".gz", ".bz2", ".xz"]:
+            filename = Path(directory) / f"sample.dat{suffix}"
+            start = default_timer()
+            frame.pwa.write_ascii(filename)
+            write_time = default_timer() - start
+            start = default_timer()
+            read_ascii(filename)
+            read_time = default_timer() - start
+            start = default_timer()
+            for _ in iter_ascii(filename):
+                pass
+            stream_time = default_timer() - start
+            size = filename.stat().st_size / 1e6
+            print(
+                f"{suffix or 'plain':<6} {size:10.1f} {plain_size / size:6.2f}"
+                f" {plain_size / write_time:13.1f} {plain_size / read_time:12.1f}"
+                f" {plain_size / stream_time:14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare the parsing engines of :func:`pawian.data.read_ascii`.
+
+Run with :code:`python benchmarks/read_ascii.py --events 1000000 10000000`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from timeit import default_timer
+
+from synthetic import write_synthetic_ascii
+
+from pawian.data import read_ascii
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", nargs="+", type=int, default=[10**6, 10**7])
+    parser.add_argument("--particles", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for n_events in args.events:
+            for weights in [True, False]:
+                filename = Path(directory) / "sample.dat"
+                write_synthetic_ascii(filename, n_events, args.particles, weights)
+                size_mb = filename.stat().st_size / 1e6
+                timings = {}
+                for engine in ["pandas", "numpy"]:
+                    start = default_timer()
+                    read_ascii(
+                        filename, args.particles, engine=engine, workers=args.workers
+                    )
+                    timings[engine] = default_timer() - start
+                print(
+                    f"{n_events:>10,d} events, weights={weights!s:<5}, {size_mb:7.1f} MB:"
+                    f"  pandas {timings['pandas']:7.2f} s"
+                    f"  numpy {timings['numpy']:7.2f} s"
+                    f"  speed-up {timings['pandas'] / timings['numpy']:4.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
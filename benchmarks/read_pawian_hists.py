@@ -0,0 +1,139 @@
+"""Compare :func:`pawian.data.read_pawian_hists` with the former per-branch reader.
+
+Run with :code:`python benchmarks/read_pawian_hists.py --events 1000000 10000000`.
+
+The bundled samples are read with both readers. uproot cannot write
+:code:`TLorentzVector` branches, so the large synthetic tree has one flat branch per
+momentum component. For that tree, the per-branch requests of the former reader are
+compared with the single bulk request of the new reader.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from timeit import default_timer
+from typing import TYPE_CHECKING
+
+import awkward as ak
+import numpy as np
+import uproot
+from uproot.exceptions import KeyInFileError
+
+import pawian
+from pawian.data import create_skeleton_frame, read_pawian_hists
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SAMPLE_DIR = Path(pawian.__file__).parent / "samples"
+COMPONENTS = ["p_x", "p_y", "p_z", "E"]
+
+
+def read_pawian_hists_per_branch(filename: Path, type_name: str) -> pd.DataFrame:
+    """Reader that requests each particle and momentum component separately."""
+    tree_name = f"_{type_name}Fourvecs"
+    uproot_file = uproot.open(filename)
+    tree = uproot_file[tree_name]
+    particles = [branch.name for branch in tree if branch.name != "weight"]
+    weights = uproot_file[f"{tree_name}/weight"].array()
+    frame = create_skeleton_frame(particles, number_of_rows=len(weights))
+    if ak.max(weights) != ak.min(weights):
+        frame["weight"] = weights
+    try:
+        for particle in particles:
+            vectors = uproot_file[f"{tree_name}/{particle}"].array()
+            frame[particle, "p_x"] = vectors.fP.fX
+            frame[particle, "p_y"] = vectors.fP.fY
+            frame[particle, "p_z"] = vectors.fP.fZ
+            frame[particle, "E"] = vectors.fE
+    except (KeyError, KeyInFileError):
+        for particle in particles:
+            for label, member in zip(
+                COMPONENTS, ["fP/fP.fX", "fP/fP.fY", "fP/fP.fZ", "fE"]
+            ):
+                frame[particle, label] = uproot_file[
+                    f"{tree_name}/{particle}/{member}"
+                ].array()
+    return frame
+
+
+def time_call(function, repeat: int = 1) -> float:  # noqa: ANN001
+    start = default_timer()
+    for _ in range(repeat):
+        function()
+    return (default_timer() - start) / repeat
+
+
+def benchmark_samples(repeat: int) -> None:
+    for filename in sorted(SAMPLE_DIR.glob("pawianHists_*.root")):
+        for type_name in ["data", "fitted"]:
+            old = time_call(
+                lambda f=filename, t=type_name: read_pawian_hists_per_branch(f, t),
+                repeat,
+            )
+            new = time_call(
+                lambda f=filename, t=type_name: read_pawian_hists(f, t), repeat
+            )
+            print(
+                f"{filename.name:<32} {type_name:<6}  per-branch {1e3 * old:6.1f} ms"
+                f"  bulk {1e3 * new:6.1f} ms"
+            )
+
+
+def write_synthetic_tree(filename: Path, n_events: int, n_particles: int) -> None:
+    rng = np.random.default_rng(0)
+    branches = [f"p{i}_{c}" for i in range(n_particles) for c in COMPONENTS]
+    with uproot.recreate(filename, compression=uproot.ZLIB(1)) as root_file:
+        root_file.mktree("tree", dict.fromkeys([*branches, "weight"], np.float64))
+        block_size = 1_000_000
+        for start in range(0, n_events, block_size):
+            size = min(block_size, n_events - start)
+            root_file["tree"].extend({
+                name: rng.normal(size=size) for name in [*branches, "weight"]
+            })
+
+
+def benchmark_synthetic(n_events: int, n_particles: int, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        filename = Path(directory) / "synthetic.root"
+        write_synthetic_tree(filename, n_events, n_particles)
+        with uproot.open(filename) as root_file:
+            tree = root_file["tree"]
+            names = tree.keys()
+            per_branch = time_call(
+                lambda: [tree[name].array(array_cache=None) for name in names]
+            )
+            bulk = time_call(lambda: tree.arrays(names, array_cache=None))
+            with ThreadPoolExecutor(workers) as executor:
+                threaded = time_call(
+                    lambda: tree.arrays(
+                        names,
+                        array_cache=None,
+                        decompression_executor=executor,
+                        interpretation_executor=executor,
+                    )
+                )
+        print(
+            f"{n_events:>10,d} events, {len(names)} branches:"
+            f"  per-branch {per_branch:6.2f} s  bulk {bulk:6.2f} s"
+            f"  bulk with {workers} threads {threaded:6.2f} s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", nargs="+", type=int, default=[10**6, 10**7])
+    parser.add_argument("--particles", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    benchmark_samples(args.repeat)
+    for n_events in args.events:
+        benchmark_synthetic(n_events, args.particles, args.workers)
+
+
+if __name__ == "__main__":
+    main()
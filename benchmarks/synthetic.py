@@ -0,0 +1,31 @@
+"""Generate synthetic Pawian-like ASCII files for the benchmarks."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def write_synthetic_ascii(
+    filename: Path | str,
+    n_events: int,
+    n_particles: int = 3,
+    weights: bool = True,
+    seed: int = 0,
+) -> None:
+    """Write random momentum tuples in the format that Pawian reads."""
+    rng = np.random.default_rng(seed)
+    event_format = "%.6g\n" if weights else ""
+    event_format += "%.6g\t%.6g\t%.6g\t%.6g\n" * n_particles
+    block_size = 100_000
+    with open(filename, "w") as stream:
+        for start in range(0, n_events, block_size):
+            size = min(block_size, n_events - start)
+            values = rng.normal(size=(size, 4 * n_particles))
+            if weights:
+                values = np.column_stack([rng.random(size), values])
+            stream.write((event_format * size) % tuple(values.ravel().tolist()))
@@ -0,0 +1,64 @@
+"""Compare :meth:`.PwaAccessor.write_ascii` with the former row-wise writer.
+
+Run with :code:`python benchmarks/write_ascii.py --events 1000000`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+from timeit import default_timer
+
+import pandas as pd
+from synthetic import write_synthetic_ascii
+
+from pawian.data import read_ascii
+
+
+def write_ascii_row_wise(frame: pd.DataFrame, filename: Path) -> None:
+    """Writer that formats each particle row by row with `~pandas.DataFrame.apply`."""
+    new_dict = []
+    if frame.pwa.has_weights:
+        new_dict.append(frame.pwa.weights)
+    for par in frame.pwa.particles:
+        new_dict.append(  # noqa: PERF401
+            frame[par].apply(lambda x: " ".join(x.dropna().astype(str)), axis=1)
+        )
+    interleaved = pd.concat(new_dict).sort_index(kind="mergesort")
+    interleaved.to_csv(filename, header=False, index=False)
+
+
+def time_writers(frame: pd.DataFrame, output_file: Path, row_wise: bool) -> str:
+    writers = {
+        "round-trip": lambda: frame.pwa.write_ascii(output_file),
+        "%.6g": lambda: frame.pwa.write_ascii(output_file, "%.6g"),
+    }
+    if row_wise:
+        writers["row-wise"] = lambda: write_ascii_row_wise(frame, output_file)
+    timings = []
+    for name, writer in writers.items():
+        start = default_timer()
+        writer()
+        timings.append(f"{name} {default_timer() - start:7.2f} s")
+    return "  ".join(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", nargs="+", type=int, default=[10**5, 10**6])
+    parser.add_argument("--particles", type=int, default=3)
+    parser.add_argument("--skip-row-wise", action="store_true")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = Path(directory) / "input.dat"
+        output_file = Path(directory) / "output.dat"
+        for n_events in args.events:
+            write_synthetic_ascii(input_file, n_events, args.particles)
+            frame = read_ascii(input_file)
+            timings = time_writers(frame, output_file, not args.skip_row_wise)
+            print(f"{n_events:>10,d} events:  {timings}")
+
+
+if __name__ == "__main__":
+    main()
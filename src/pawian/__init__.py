@@ -7,10 +7,13 @@ be extracted to a separate module.
 """
 
 __all__ = [
+    "convert",
+    "cuts",
     "data",
+    "hist",
     "latex",
     "qa",
 ]
 
 
-from . import data, latex, qa
+from . import convert, cuts, data, hist, latex, qa
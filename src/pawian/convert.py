@@ -0,0 +1,318 @@
+"""Convert event samples between file formats.
+
+The :code:`pawian-convert` command converts many files in a pool of processes:
+
+.. code-block:: shell
+
+    pawian-convert samples/ extra.dat.gz --to pawb --output-dir converted/ --workers 8
+
+ASCII files without weight lines need the particles, as a number or as names, for
+instance :code:`--particles pi+ D0 D-`. With :code:`--skip-existing`, targets that
+were modified after their source are not converted again. Each file is streamed in
+chunks of events, so memory usage does not depend on the size of the files. The
+following formats are recognized from the file extension:
+
+- Pawian-like ASCII files (:file:`.dat`, :file:`.txt`), optionally compressed
+  (:file:`.gz`, :file:`.bz2`, :file:`.xz`), see :func:`.read_ascii`.
+- Columnar binary files (:file:`.pawb`), see :func:`.read_binary`.
+- Momentum tuple trees in :file:`pawianHists.root` files (:file:`.root`, input only),
+  see :func:`.read_pawian_hists`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from timeit import default_timer
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+from pawian.data import DataParserError, iter_events, write_ascii, write_binary
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    import pandas as pd
+
+OUTPUT_FORMATS = ["dat", "dat.gz", "dat.bz2", "dat.xz", "pawb"]
+"""File extensions of the formats to which files can be converted."""
+_ASCII_SUFFIXES = {".dat", ".txt"}
+_COMPRESSION_SUFFIXES = {".bz2", ".gz", ".xz"}
+
+
+class ConversionResult(NamedTuple):
+    """Summary of the conversion of one file by :func:`convert_file`."""
+
+    source: Path
+    target: Path
+    n_events: int
+    """Number of converted events, or zero if the file was skipped."""
+    n_bytes: int
+    """Size of the source file."""
+    seconds: float
+    skipped: bool
+    """Whether the target was already up to date."""
+
+
+def convert_file(  # noqa: PLR0913
+    source: Path | str,
+    target: Path | str,
+    type_name: Literal["data", "fitted"] = "data",
+    chunk_events: int = 100_000,
+    *,
+    skip_existing: bool = False,
+    particles: list[str] | int | None = None,
+) -> ConversionResult:
+    """Convert one event file to the format given by the extension of the target.
+
+    The target is written to a temporary file first, so that an interrupted conversion
+    never leaves an incomplete target.
+
+    Args:
+        source: The file to convert.
+        target: The file to write.
+        type_name: The momentum tuple tree to read if the source is a
+            :file:`pawianHists.root` file, see :func:`.read_pawian_hists`.
+        chunk_events: Number of events that are read and written at once.
+        skip_existing: Do not convert the file if the target is up to date, see
+            :func:`is_up_to_date`. The conversion parameters of an existing target are
+            not known, so only use this if they did not change.
+        particles: The particles in an ASCII source, see :func:`.read_ascii`.
+    """
+    source = Path(source)
+    target = Path(target)
+    n_bytes = source.stat().st_size
+    if skip_existing and is_up_to_date(source, target):
+        return ConversionResult(source, target, 0, n_bytes, 0.0, skipped=True)
+    start = default_timer()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # keep the extension, because it determines the compression of ASCII files
+    temp_target = target.with_name(f".{os.getpid()}.{target.name}")
+    n_events = 0
+
+    def count_events(frames: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        nonlocal n_events
+        for frame in frames:
+            n_events += len(frame)
+            yield frame
+
+    frames = count_events(iter_events(source, particles, type_name, chunk_events))
+    try:
+        if _get_format(target) == "binary":
+            write_binary(temp_target, frames, chunk_events)
+        else:
+            write_ascii(temp_target, frames, chunk_events=chunk_events)
+        os.replace(temp_target, target)
+    finally:
+        temp_target.unlink(missing_ok=True)
+    seconds = default_timer() - start
+    return ConversionResult(source, target, n_events, n_bytes, seconds, skipped=False)
+
+
+def is_up_to_date(source: Path | str, target: Path | str) -> bool:
+    """Check whether a target is not empty and was modified after its source."""
+    try:
+        target_stat = os.stat(target)
+    except FileNotFoundError:
+        return False
+    return (
+        target_stat.st_size > 0
+        and target_stat.st_mtime_ns >= os.stat(source).st_mtime_ns
+    )
+
+
+def _get_format(filename: Path) -> Literal["ascii", "binary", "root"] | None:
+    suffixes = [suffix.lower() for suffix in filename.suffixes]
+    if suffixes and suffixes[-1] in _COMPRESSION_SUFFIXES:
+        suffixes.pop()
+    if not suffixes:
+        return None
+    if suffixes[-1] in _ASCII_SUFFIXES:
+        return "ascii"
+    if suffixes[-1] == ".pawb":
+        return "binary"
+    if suffixes[-1] == ".root":
+        return "root"
+    return None
+
+
+def _get_stem(filename: Path) -> str:
+    """Get the file name without the format and compression extensions."""
+    name = filename.name
+    if filename.suffix.lower() in _COMPRESSION_SUFFIXES:
+        name = name[: -len(filename.suffix)]
+    return name[: -len(Path(name).suffix)]
+
+
+def _collect_jobs(
+    inputs: Sequence[Path], output_format: str, output_dir: Path | None
+) -> list[tuple[Path, Path]]:
+    """Find the files to convert and determine their targets.
+
+    Directories are searched recursively for files with a known format. Their
+    structure is reproduced in the output directory. Files that already have the
+    output format are skipped, so that the targets of an earlier run in the same
+    directory are not taken as sources.
+    """
+    jobs = []
+    for path in inputs:
+        is_directory = path.is_dir()
+        if is_directory:
+            sources = sorted(
+                p
+                for p in path.rglob("*")
+                if p.is_file()
+                and _get_format(p)
+                and not p.name.lower().endswith(f".{output_format}")
+            )
+            base = path
+        else:
+            sources = [path]
+            base = path.parent
+        for source in sources:
+            directory = source.parent
+            if output_dir is not None:
+                directory = output_dir / source.parent.relative_to(base)
+            target = directory / f"{_get_stem(source)}.{output_format}"
+            if is_directory and target.resolve() == source.resolve():
+                continue
+            jobs.append((source, target))
+    return jobs
+
+
+def _check_jobs(jobs: Iterable[tuple[Path, Path]]) -> str | None:
+    """Get an error message if a source would be overwritten or targets coincide."""
+    sources: dict[Path, Path] = {}
+    for source, target in jobs:
+        resolved_target = target.resolve()
+        if source.resolve() == resolved_target:
+            return f"{source} would be overwritten, use --output-dir"
+        other = sources.setdefault(resolved_target, source)
+        if other != source:
+            return f"{other} and {source} would both be converted to {target}"
+    return None
+
+
+def _convert_job(
+    job: tuple[Path, Path],
+    type_name: Literal["data", "fitted"],
+    chunk_events: int,
+    skip_existing: bool,
+    particles: list[str] | int | None,
+) -> ConversionResult | str:
+    source, target = job
+    try:
+        return convert_file(
+            source,
+            target,
+            type_name,
+            chunk_events,
+            skip_existing=skip_existing,
+            particles=particles,
+        )
+    except (DataParserError, OSError, ValueError) as exception:
+        return f"{source}: {exception}"
+
+
+def _parse_particles(values: list[str] | None) -> list[str] | int | None:
+    if values is not None and len(values) == 1 and values[0].isdigit():
+        return int(values[0])
+    return values
+
+
+def _format_result(result: ConversionResult) -> str:
+    if result.skipped:
+        return f"{result.source} -> {result.target}: up to date"
+    megabytes = result.n_bytes / 1e6
+    seconds = max(result.seconds, 1e-9)
+    return (
+        f"{result.source} -> {result.target}: {result.n_events:,d} events,"
+        f" {megabytes:.1f} MB in {result.seconds:.2f} s"
+        f" ({result.n_events / seconds:,.0f} events/s, {megabytes / seconds:.1f} MB/s)"
+    )
+
+
+def _report(results: Iterable[ConversionResult | str]) -> tuple[int, int, int]:
+    """Print the result of each conversion as it completes and sum up the results."""
+    n_failed = 0
+    total_events = 0
+    total_bytes = 0
+    for result in results:
+        if isinstance(result, str):
+            print(result, file=sys.stderr)
+            n_failed += 1
+            continue
+        print(_format_result(result), flush=True)
+        if not result.skipped:
+            total_events += result.n_events
+            total_bytes += result.n_bytes
+    return n_failed, total_events, total_bytes
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of the :code:`pawian-convert` command."""
+    parser = argparse.ArgumentParser(
+        prog="pawian-convert",
+        description="Convert event files between ASCII, compressed ASCII, and binary.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        type=Path,
+        help="Files to convert, or directories that are searched for event files",
+    )
+    parser.add_argument("--to", choices=OUTPUT_FORMATS, required=True)
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        help="Directory for the converted files, by default next to the input files",
+    )
+    parser.add_argument("--type", choices=["data", "fitted"], default="data")
+    parser.add_argument(
+        "--particles",
+        nargs="+",
+        help="Number or names of the particles in ASCII files without weights",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-events", type=int, default=100_000)
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Do not convert files of which the target is newer than the source",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.chunk_events < 1:
+        parser.error("--workers and --chunk-events have to be positive")
+    jobs = _collect_jobs(args.inputs, args.to, args.output_dir)
+    error = _check_jobs(jobs)
+    if error is not None:
+        parser.error(error)
+
+    start = default_timer()
+    convert = partial(
+        _convert_job,
+        type_name=args.type,
+        chunk_events=args.chunk_events,
+        skip_existing=args.skip_existing,
+        particles=_parse_particles(args.particles),
+    )
+    if args.workers == 1:
+        n_failed, total_events, total_bytes = _report(map(convert, jobs))
+    else:
+        with ProcessPoolExecutor(args.workers) as executor:
+            results = executor.map(convert, jobs)
+            n_failed, total_events, total_bytes = _report(results)
+    seconds = max(default_timer() - start, 1e-9)
+    print(
+        f"Converted {total_events:,d} events, {total_bytes / 1e6:.1f} MB in"
+        f" {seconds:.2f} s ({total_events / seconds:,.0f} events/s,"
+        f" {total_bytes / 1e6 / seconds:.1f} MB/s)"
+    )
+    if n_failed:
+        print(f"{n_failed} of {len(jobs)} files failed", file=sys.stderr)
+        return 1
+    return 0
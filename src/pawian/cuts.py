@@ -0,0 +1,361 @@
+"""Kinematic cuts on event samples.
+
+A cut is written as a small expression over kinematic quantities of (combinations of)
+particles, for instance:
+
+.. code-block:: python
+
+    from pawian.cuts import Cut
+
+    cut = Cut("3.7 < m(D0, D-) < 3.9 and cos_theta(pi+) < 0.9 or weight > 2")
+    mask = cut.evaluate(frame.pwa.to_sample())
+
+The expression is parsed once and can then be evaluated on many samples, such as the
+chunks of a large file, see :meth:`.PwaAccessor.select` and :func:`.data.select`. The
+following elements are available:
+
+- Quantities of the summed four-momentum of one or more particles:
+  :code:`m(...)` (mass), :code:`m2(...)` (squared mass), :code:`E(...)`,
+  :code:`px(...)`, :code:`py(...)`, :code:`pz(...)`, :code:`p(...)` (absolute
+  momentum), :code:`pt(...)` (transverse momentum), :code:`cos_theta(...)` (cosine of
+  the polar angle), and :code:`phi(...)` (azimuthal angle). The arguments are particle
+  names separated by commas.
+- :code:`weight`, which is one for samples without weights.
+- Numbers, :code:`+`, :code:`-`, :code:`*`, :code:`/`, :code:`**`, and parentheses.
+- Comparisons :code:`<`, :code:`<=`, :code:`>`, :code:`>=`, :code:`==`, and
+  :code:`!=`, which can be chained like in Python.
+- :code:`and`, :code:`or`, and :code:`not`.
+
+Masses are computed like :meth:`.PwaAccessor.invariant_mass`.
+"""
+
+from __future__ import annotations
+
+import re
+from operator import itemgetter
+from typing import TYPE_CHECKING, Callable, NoReturn, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pawian.data import EventSample
+
+_Value = tuple[Union[np.ndarray, float], bool]
+"""Result of a node and whether the node owns the array, so that it may overwrite it."""
+_Node = Callable[["_Context"], _Value]
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<operator>\*\*|<=|>=|==|!=|[-+*/<>(),]))"
+)
+_COMPARISONS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+_BOOLEAN_UFUNCS = {
+    *_COMPARISONS.values(),
+    np.logical_and,
+    np.logical_or,
+    np.logical_not,
+}
+_ARITHMETIC = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.divide,
+    "**": np.power,
+}
+
+
+class Cut:
+    """A parsed cut expression that can be evaluated on samples of events.
+
+    Args:
+        expression: The cut expression, see :mod:`pawian.cuts` for its syntax.
+
+    Raises:
+        ValueError: If the expression is not valid.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.__expression = expression
+        self.__evaluate = _Parser(expression).parse()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.__expression!r})"
+
+    @property
+    def expression(self) -> str:
+        """The cut expression."""
+        return self.__expression
+
+    def evaluate(self, sample: EventSample) -> np.ndarray:
+        """Compute a boolean mask of the events that pass the cut.
+
+        Each quantity is computed once per call, even if it appears several times in
+        the expression, and intermediate arrays are overwritten where possible.
+        """
+        value, _ = self.__evaluate(_Context(sample))
+        if not isinstance(value, np.ndarray) or value.dtype != bool:
+            msg = f"Cut {self.__expression!r} does not give a boolean for each event"
+            raise ValueError(msg)
+        return value
+
+
+class _Context:
+    """Sample on which a cut is evaluated and the quantities computed so far."""
+
+    def __init__(self, sample: EventSample) -> None:
+        self.sample = sample
+        self.__indices = {name: i for i, name in enumerate(sample.particles)}
+        self.__four_momenta: dict[tuple[str, ...], np.ndarray] = {}
+        self.__quantities: dict[tuple[str, tuple[str, ...]], np.ndarray] = {}
+
+    def get_four_momentum(self, particles: tuple[str, ...]) -> np.ndarray:
+        four_momentum = self.__four_momenta.get(particles)
+        if four_momentum is None:
+            missing = [p for p in particles if p not in self.__indices]
+            if missing:
+                msg = f"No particles {missing} in sample with {self.sample.particles}"
+                raise ValueError(msg)
+            indices = [self.__indices[p] for p in particles]
+            if len(indices) == 1:
+                four_momentum = self.sample.momenta[:, indices[0]]
+            else:
+                four_momentum = self.sample.momenta[:, indices].sum(axis=1)
+            self.__four_momenta[particles] = four_momentum
+        return four_momentum
+
+    def get_quantity(self, name: str, particles: tuple[str, ...]) -> np.ndarray:
+        key = name, particles
+        value = self.__quantities.get(key)
+        if value is None:
+            value = _QUANTITIES[name](self.get_four_momentum(particles))
+            self.__quantities[key] = value
+        return value
+
+
+def _compute_rho2(four_momentum: np.ndarray) -> np.ndarray:
+    p_xyz = four_momentum[:, :3]
+    return np.einsum("ij,ij->i", p_xyz, p_xyz)
+
+
+def _compute_mass2(four_momentum: np.ndarray) -> np.ndarray:
+    mass2 = np.square(four_momentum[:, 3])
+    mass2 -= _compute_rho2(four_momentum)
+    return mass2
+
+
+def _compute_mass(four_momentum: np.ndarray) -> np.ndarray:
+    # imported here, because pawian.data imports this module
+    from pawian.data import _compute_invariant_mass  # noqa: PLC0415
+
+    return _compute_invariant_mass(four_momentum.T, out=np.empty(len(four_momentum)))
+
+
+def _compute_cos_theta(four_momentum: np.ndarray) -> np.ndarray:
+    rho = np.sqrt(_compute_rho2(four_momentum))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.divide(four_momentum[:, 2], rho, out=rho)
+
+
+_QUANTITIES: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "m": _compute_mass,
+    "m2": _compute_mass2,
+    "E": itemgetter((slice(None), 3)),
+    "px": itemgetter((slice(None), 0)),
+    "py": itemgetter((slice(None), 1)),
+    "pz": itemgetter((slice(None), 2)),
+    "p": lambda p4: np.sqrt(_compute_rho2(p4)),
+    "pt": lambda p4: np.hypot(p4[:, 0], p4[:, 1]),
+    "cos_theta": _compute_cos_theta,
+    "phi": lambda p4: np.arctan2(p4[:, 1], p4[:, 0]),
+}
+
+
+def _apply(ufunc: np.ufunc, *operands: _Value) -> _Value:
+    """Apply a ufunc and write the result into an operand that is no longer needed."""
+    values = [value for value, _ in operands]
+    if not any(isinstance(value, np.ndarray) for value in values):
+        return ufunc(*values).item(), False
+    dtype = bool if ufunc in _BOOLEAN_UFUNCS else np.float64
+    out = None
+    for value, is_owned in operands:
+        if is_owned and isinstance(value, np.ndarray) and value.dtype == dtype:
+            out = value
+            break
+    return ufunc(*values, out=out), True
+
+
+def _create_comparison(left: _Node, comparisons: list[tuple[str, _Node]]) -> _Node:
+    def evaluate(context: _Context) -> _Value:
+        # chained comparisons are joined with 'and', like in Python
+        left_value = left(context)
+        result: _Value | None = None
+        for operator, right in comparisons:
+            right_value = right(context)
+            # the right operand is also the left operand of the next comparison
+            comparison = _apply(
+                _COMPARISONS[operator], (left_value[0], False), (right_value[0], False)
+            )
+            result = (
+                comparison
+                if result is None
+                else _apply(np.logical_and, result, comparison)
+            )
+            left_value = right_value
+        assert result is not None  # noqa: S101
+        return result
+
+    return evaluate
+
+
+class _Parser:
+    """Recursive descent parser that turns an expression into nested functions."""
+
+    def __init__(self, expression: str) -> None:
+        self.__expression = expression
+        self.__position = 0
+        self.__token: tuple[str, str] | None = None
+        self.__advance()
+
+    def parse(self) -> _Node:
+        node = self.__parse_or()
+        if self.__token is not None:
+            self.__fail(f"unexpected {self.__token[1]!r}")
+        return node
+
+    def __advance(self) -> None:
+        remaining = self.__expression[self.__position :]
+        if not remaining.strip():
+            self.__token = None
+            self.__position = len(self.__expression)
+            return
+        match = _TOKEN_PATTERN.match(self.__expression, self.__position)
+        if match is None or match.lastgroup is None:
+            self.__position += len(remaining) - len(remaining.lstrip())
+            self.__fail("invalid character")
+        self.__token = match.lastgroup, match[match.lastgroup]
+        self.__position = match.end()
+
+    def __accept(self, *values: str) -> str | None:
+        if self.__token is not None and self.__token[1] in values:
+            value = self.__token[1]
+            self.__advance()
+            return value
+        return None
+
+    def __expect(self, value: str) -> None:
+        if self.__accept(value) is None:
+            found = "end" if self.__token is None else repr(self.__token[1])
+            self.__fail(f"expected {value!r}, but found {found}")
+
+    def __fail(self, reason: str) -> NoReturn:
+        msg = (
+            f"Invalid cut expression: {reason} at position {self.__position}\n"
+            f"  {self.__expression}\n  {' ' * self.__position}^"
+        )
+        raise ValueError(msg)
+
+    def __parse_or(self) -> _Node:
+        node = self.__parse_and()
+        while self.__accept("or"):
+            node = self.__combine(np.logical_or, node, self.__parse_and())
+        return node
+
+    def __parse_and(self) -> _Node:
+        node = self.__parse_not()
+        while self.__accept("and"):
+            node = self.__combine(np.logical_and, node, self.__parse_not())
+        return node
+
+    def __parse_not(self) -> _Node:
+        if self.__accept("not"):
+            operand = self.__parse_not()
+            return lambda context: _apply(np.logical_not, operand(context))
+        return self.__parse_comparison()
+
+    def __parse_comparison(self) -> _Node:
+        node = self.__parse_sum()
+        comparisons = []
+        while operator := self.__accept(*_COMPARISONS):
+            comparisons.append((operator, self.__parse_sum()))
+        if not comparisons:
+            return node
+        return _create_comparison(node, comparisons)
+
+    def __parse_sum(self) -> _Node:
+        node = self.__parse_product()
+        while operator := self.__accept("+", "-"):
+            right = self.__parse_product()
+            node = self.__combine(_ARITHMETIC[operator], node, right)
+        return node
+
+    def __parse_product(self) -> _Node:
+        node = self.__parse_unary()
+        while operator := self.__accept("*", "/"):
+            right = self.__parse_unary()
+            node = self.__combine(_ARITHMETIC[operator], node, right)
+        return node
+
+    def __parse_unary(self) -> _Node:
+        if self.__accept("-"):
+            operand = self.__parse_unary()
+            return lambda context: _apply(np.negative, operand(context))
+        if self.__accept("+"):
+            return self.__parse_unary()
+        return self.__parse_power()
+
+    def __parse_power(self) -> _Node:
+        node = self.__parse_atom()
+        if self.__accept("**"):
+            node = self.__combine(np.power, node, self.__parse_unary())
+        return node
+
+    def __parse_atom(self) -> _Node:
+        if self.__token is None:
+            self.__fail("unexpected end")
+        kind, value = self.__token
+        if kind == "number":
+            self.__advance()
+            number = float(value)
+            return lambda _: (number, False)
+        if self.__accept("("):
+            node = self.__parse_or()
+            self.__expect(")")
+            return node
+        if kind == "name" and value == "weight":
+            self.__advance()
+            return _evaluate_weight
+        if kind != "name" or value not in _QUANTITIES:
+            self.__fail(f"unexpected {value!r}")
+        return self.__parse_quantity(value)
+
+    def __parse_quantity(self, name: str) -> _Node:
+        # particle names like pi+ are no tokens, so read the raw arguments
+        match = re.compile(r"\s*\(([^()]*)\)").match(self.__expression, self.__position)
+        if match is None:
+            self.__fail(f"expected particle names in parentheses after {name!r}")
+        particles = tuple(p.strip() for p in match[1].split(","))
+        if not all(particles):
+            self.__position = match.start(1)
+            self.__fail(f"empty particle name in {name}({match[1]})")
+        self.__position = match.end()
+        self.__advance()
+        return lambda context: (context.get_quantity(name, particles), False)
+
+    @staticmethod
+    def __combine(ufunc: np.ufunc, left: _Node, right: _Node) -> _Node:
+        return lambda context: _apply(ufunc, left(context), right(context))
+
+
+def _evaluate_weight(context: _Context) -> _Value:
+    weights = context.sample.weights
+    if weights is None:
+        return np.ones(len(context.sample)), True
+    return weights, False
@@ -15,7 +15,9 @@ tuples. The files have the following form:
        0.698477   -0.193756   -0.352357     2.03593
 
 The lines with single values are weights, but do not have to be present.
-Whitespaces are arbitrary.
+Whitespaces are arbitrary. Files can be compressed with gzip, bzip2 or xz, which is
+recognized from the file extension (:file:`.gz`, :file:`.bz2`, :file:`.xz`) or from
+the first bytes of the file.
 
 The allows you to import the ASCII file to a nicely formatted
 `~pandas.DataFrame` that has additional PWA methods in the form of
@@ -24,32 +26,78 @@ The allows you to import the ASCII file to a nicely formatted
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Literal
+import bz2
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import os
+import shutil
+import warnings
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import combinations, repeat
+from operator import itemgetter
+from pathlib import Path
+from tempfile import TemporaryFile
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, Callable, Literal, NamedTuple
 
 import awkward as ak
 import numpy as np
 import pandas as pd
 import uproot
-from uproot.exceptions import KeyInFileError
+
+from pawian.cuts import Cut
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
-    from pathlib import Path
+    from collections.abc import Iterable, Iterator
 
     from pandas.core.base import PandasObject
+    from uproot.behaviors.TTree import TTree
+    from uproot.reading import ReadOnlyDirectory
 
 
 _ENERGY_LABEL = "E"
 _MOMENTUM_LABELS = ["p_x", "p_y", "p_z", _ENERGY_LABEL]
 _WEIGHT_LABEL = "weight"
+_KINEMATICS_CHUNK_EVENTS = 1 << 14
+_BEAM_DIRECTION = (0.0, 0.0, 1.0, 1.0)
+_SPLIT_FOURVEC_MEMBERS = ["fP/fP.fX", "fP/fP.fY", "fP/fP.fZ", "fE"]
+_SUMMARY_QUANTITIES = [_ENERGY_LABEL, "p", "m"]
+_BINARY_MAGIC = b"PAWIANB1"
+_BINARY_ALIGNMENT = 64
+_COMPRESSION_SUFFIXES: dict[str, Literal["bz2", "gzip", "xz"]] = {
+    ".bz2": "bz2",
+    ".gz": "gzip",
+    ".xz": "xz",
+}
+_COMPRESSION_MAGIC: dict[Literal["bz2", "gzip", "xz"], bytes] = {
+    "bz2": b"BZh",
+    "gzip": b"\x1f\x8b",
+    "xz": b"\xfd7zXZ\x00",
+}
 
 
 class DataParserError(Exception):
     """Exception for if a data file can't be handled."""
 
 
+class KinematicsCacheInfo(NamedTuple):
+    """Statistics of the kinematics cache of a `.PwaAccessor`.
+
+    .. seealso:: :meth:`.PwaAccessor.cache_info`
+    """
+
+    hits: int
+    misses: int
+    currsize: int
+    nbytes: int
+
+
 # pyright: reportUntypedClassDecorator=false
-@pd.api.extensions.register_dataframe_accessor("pwa")
+@pd.api.extensions.register_dataframe_accessor("pwa")  # noqa: PLR0904
 class PwaAccessor:
     """PWA-specific accessor for a `~pandas.DataFrame`.
 
@@ -60,6 +108,12 @@ class PwaAccessor:
     def __init__(self, pandas_object: PandasObject) -> None:
         self._validate(pandas_object)
         self._obj = pandas_object
+        self._cache: dict[str, pd.DataFrame] = {}
+        self._cache_key: tuple | None = None
+        self._cache_sources: list[Any] = []
+        self._cache_is_computing = False
+        self._cache_hits = 0
+        self._cache_misses = 0
 
     @staticmethod
     def _validate(obj: PandasObject) -> None:
@@ -139,48 +193,457 @@ class PwaAccessor:
     @property
     def rho2(self) -> pd.DataFrame:
         """Compute a dataframe containing the square sum of the 3-momenta."""
-        p3_squared = self.p_xyz**2  # type: ignore[operator]
-        if self.has_particles:
-            return p3_squared.groupby(axis=1, level=0).sum()
-        return p3_squared.sum(axis=1)
+        return self._get_cached("rho2", self._compute_rho2)
 
     @property
     def rho(self) -> pd.DataFrame:
         """**Compute** a dataframe with the absolute value of the 3-momenta."""
-        return np.sqrt(self.rho2)  # type: ignore[call-overload]
+        return self._get_cached("rho", lambda: np.sqrt(self.rho2))  # type: ignore[call-overload]
 
     @property
     def mass2(self) -> pd.DataFrame:
         """**Compute** the square of the invariant masses."""
-        return self.energy**2 - self.rho2  # type: ignore[operator]
+        return self._get_cached("mass2", lambda: self.energy**2 - self.rho2)  # type: ignore[operator]
 
     @property
     def mass(self) -> pd.DataFrame:
         """**Compute** the invariant masses."""
-        return np.sqrt(self.mass2)  # type: ignore[call-overload]
+        return self._get_cached("mass", lambda: np.sqrt(self.mass2))  # type: ignore[call-overload]
 
-    def write_ascii(self, filename: str, **kwargs: Any) -> None:
-        """Write to Pawian-like ASCII file.
+    def invariant_mass(self, particles: Iterable[str]) -> pd.Series:
+        """**Compute** the invariant mass of a combination of particles.
+
+        The four-momenta of the particles are summed per event, so for instance
+        :code:`frame.pwa.invariant_mass(["pi+", "D0"])` corresponds to a
+        :code:`histMass = pi+ D0` entry in a Pawian configuration. The resulting
+        `~pandas.Series` is named after the concatenated particle names.
+
+        Like :attr:`mass`, events with a negative squared mass get a NaN mass. The
+        :code:`m(...)` quantity of :mod:`pawian.cuts` uses the same definition.
+        """
+        particles = list(particles)
+        indices = self._get_particle_indices(particles)
+        momenta = self.to_sample().momenta
+        values = np.empty(len(momenta))
+        for start in range(0, len(momenta), _KINEMATICS_CHUNK_EVENTS):
+            stop = start + _KINEMATICS_CHUNK_EVENTS
+            total = momenta[start:stop, indices].sum(axis=1)
+            _compute_invariant_mass(total.T, out=values[start:stop])
+        return pd.Series(values, index=self._obj.index, name="".join(particles))
+
+    def all_invariant_masses(self, order: int = 2) -> pd.DataFrame:
+        """**Compute** the invariant masses of all combinations of particles.
+
+        Computes the invariant mass of each combination of :code:`order` particles,
+        with the columns named as in :meth:`invariant_mass` and ordered like
+        `itertools.combinations`. The events are processed in blocks and, per block,
+        the combinations are visited depth first. That way, the four-momentum sum of
+        each sub-combination is computed only once and no intermediate
+        `~pandas.DataFrame` is created.
+        """
+        particles = self.particles
+        if not 1 <= order <= len(particles):
+            msg = (
+                f"order should be between 1 and the number of particles"
+                f" ({len(particles)}), but got {order}"
+            )
+            raise ValueError(msg)
+        momenta = self.to_sample().momenta
+        subsystems = list(combinations(particles, order))
+        values = np.empty((len(subsystems), len(momenta)))
+        buffers = np.empty((order, len(_MOMENTUM_LABELS), _KINEMATICS_CHUNK_EVENTS))
+        for start in range(0, len(momenta), _KINEMATICS_CHUNK_EVENTS):
+            stop = min(start + _KINEMATICS_CHUNK_EVENTS, len(momenta))
+            # component-major copy, so that all operations below are contiguous
+            block = np.ascontiguousarray(momenta[start:stop].transpose(1, 2, 0))
+            totals = _iter_four_momentum_sums(block, buffers[..., : stop - start])
+            for row, total in zip(values[:, start:stop], totals):
+                _compute_invariant_mass(total, out=row)
+        return pd.DataFrame(
+            values.T,
+            index=self._obj.index,
+            columns=["".join(subsystem) for subsystem in subsystems],
+            copy=False,
+        )
+
+    def boost_to_rest_frame(self, particles: Iterable[str]) -> pd.DataFrame:
+        """**Compute** the four-momenta in the rest frame of a set of particles.
+
+        Returns a `~pandas.DataFrame` with the same layout, where the four-momenta of
+        all particles are boosted into the rest frame of the summed four-momentum
+        of :code:`particles`. Weights are copied along.
+        """
+        indices = self._get_particle_indices(list(particles))
+        sample = self.to_sample()
+        boosted = np.empty_like(sample.momenta)
+        for start in range(0, len(sample), _KINEMATICS_CHUNK_EVENTS):
+            stop = start + _KINEMATICS_CHUNK_EVENTS
+            momenta = sample.momenta[start:stop]
+            frame = momenta[:, indices].sum(axis=1)
+            boosted[start:stop] = _boost(momenta, frame[:, np.newaxis])
+        frame = _create_frame(boosted, sample.particles, sample.weights)
+        frame.index = self._obj.index
+        return frame
+
+    def helicity_angles(self, particle: str, from_: Iterable[str]) -> pd.DataFrame:
+        r"""**Compute** the helicity angles of a particle in a decay.
+
+        The angles are those of :code:`particle` in the rest frame of the system of
+        particles :code:`from_`, which are reached from the center-of-mass frame of
+        all particles. The :math:`z`-axis points along the flight direction of the
+        system and the :math:`y`-axis is perpendicular to the system and the beam,
+        which is along the :math:`z`-axis of the center-of-mass frame.
+
+        This corresponds to the :code:`ThetaHeli_<particle>_From<system>` and
+        :code:`PhiHeli_<particle>_From<system>` histograms of Pawian. Note that, as
+        in Pawian, the polar angle is given as :math:`\cos\theta`.
+
+        If :code:`from_` contains all particles, the system has no flight direction
+        in the center-of-mass frame. The angles are then computed like in
+        :meth:`gj_angles`, which differs from the whole-event helicity histograms of
+        Pawian.
+
+        Returns:
+            A `~pandas.DataFrame` with columns :code:`cos_theta` and :code:`phi`.
+        """
+        return self._get_decay_angles(particle, from_, gottfried_jackson=False)
+
+    def gj_angles(self, particle: str, from_: Iterable[str]) -> pd.DataFrame:
+        r"""**Compute** the Gottfried-Jackson angles of a particle in a decay.
+
+        Same as :meth:`helicity_angles`, but with the :math:`z`-axis along the beam
+        as seen from the rest frame of :code:`from_`. If :code:`from_` contains all
+        particles, the :math:`z`-axis points along the momentum of the whole event
+        in the lab frame and :math:`\phi` is measured from the lab :math:`y`-axis.
+        This corresponds to the :code:`ThetaGJ` and :code:`PhiGJ` histograms of
+        Pawian.
+
+        Returns:
+            A `~pandas.DataFrame` with columns :code:`cos_theta` and :code:`phi`.
+        """
+        return self._get_decay_angles(particle, from_, gottfried_jackson=True)
+
+    def _get_decay_angles(
+        self, particle: str, from_: Iterable[str], gottfried_jackson: bool
+    ) -> pd.DataFrame:
+        from_ = list(from_)
+        if particle not in from_:
+            msg = f"Particle {particle} is not in the decaying system {from_}"
+            raise ValueError(msg)
+        indices = self._get_particle_indices(from_)
+        daughter_index = self._get_particle_indices([particle])[0]
+        momenta = self.to_sample().momenta
+        values = np.empty((2, len(momenta)))
+        for start in range(0, len(momenta), _KINEMATICS_CHUNK_EVENTS):
+            stop = start + _KINEMATICS_CHUNK_EVENTS
+            _compute_decay_angles(
+                momenta[start:stop],
+                daughter_index,
+                indices,
+                gottfried_jackson,
+                out=values[:, start:stop],
+            )
+        return pd.DataFrame(
+            values.T, index=self._obj.index, columns=["cos_theta", "phi"], copy=False
+        )
+
+    def _get_particle_indices(self, particles: list[str]) -> list[int]:
+        available = self.particles
+        if not particles or len(set(particles)) != len(particles):
+            msg = f"Expecting a non-empty list of unique particles, but got {particles}"
+            raise ValueError(msg)
+        missing = [p for p in particles if p not in available]
+        if missing:
+            msg = f"Dataframe doesn't contain particles {missing}"
+            raise ValueError(msg)
+        return [available.index(p) for p in particles]
+
+    def cache_info(self) -> KinematicsCacheInfo:
+        """Get statistics of the cache of computed kinematic properties.
+
+        The properties :attr:`rho2`, :attr:`rho`, :attr:`mass2`, and :attr:`mass`
+        are computed once and then kept as long as the columns, the index, and the
+        arrays that back the dataframe are not replaced, for instance with
+        :code:`frame[column] = values`. They are returned as read-only views on the
+        cached result. The cache holds at most one result for each of these
+        properties, so :code:`nbytes` is bounded by four times the size of the energy
+        columns.
+
+        .. note:: Checking the values themselves would cost a pass over the whole
+            frame on every access, so values that are overwritten in place, such as
+            with :code:`frame.iloc[0, 0] = 1.0` or :code:`frame.loc[:, column] =
+            values`, are not detected. Call :meth:`cache_clear` after such edits.
+        """
+        return KinematicsCacheInfo(
+            hits=self._cache_hits,
+            misses=self._cache_misses,
+            currsize=len(self._cache),
+            nbytes=sum(v.to_numpy().nbytes for v in self._cache.values()),
+        )
+
+    def cache_clear(self) -> None:
+        """Remove all computed kinematic properties and reset the statistics."""
+        self._cache.clear()
+        self._cache_key = None
+        self._cache_sources = []
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    def _get_cached(
+        self, name: str, compute: Callable[[], pd.DataFrame]
+    ) -> pd.DataFrame:
+        is_outermost = not self._cache_is_computing
+        if is_outermost:
+            # properties that are computed from other properties validate only once
+            self._validate_cache()
+        if name in self._cache:
+            self._cache_hits += 1
+        else:
+            self._cache_misses += 1
+            self._cache_is_computing = True
+            try:
+                self._cache[name] = _make_read_only(compute())
+            finally:
+                self._cache_is_computing = not is_outermost
+        # a new frame on the same read-only values, so that the caller cannot modify
+        # the cached result by editing or adding columns
+        return self._cache[name].copy(deep=False)
+
+    def _validate_cache(self) -> None:
+        """Drop the cache if the columns, the index, or the arrays of the frame changed.
+
+        Replacing a column, adding rows, or renaming columns results in a different
+        key. The columns, the index, and the arrays are kept alive with the cache, so
+        that their memory cannot be freed and reused while the cache refers to it.
+        """
+        frame = self._obj
+        # the internal block arrays are much faster to get than a Series per column
+        arrays = frame._mgr.arrays  # noqa: SLF001
+        sources = [frame.columns, frame.index, *arrays]
+        key = (len(frame), *map(id, sources))
+        if key != self._cache_key:
+            self._cache.clear()
+            self._cache_key = key
+            self._cache_sources = sources
+
+    def _compute_rho2(self) -> pd.DataFrame:
+        p3_squared = self.p_xyz**2  # type: ignore[operator]
+        if self.has_particles:
+            return p3_squared.groupby(axis=1, level=0).sum()
+        return p3_squared.sum(axis=1)
+
+    def mask(self, cut: Cut | str) -> pd.Series:
+        """Check for each event whether it passes a kinematic cut.
+
+        The cut is evaluated in chunks of events, so that its intermediate arrays stay
+        small. See :mod:`pawian.cuts` for the syntax of the cut expression.
+        """
+        if isinstance(cut, str):
+            cut = Cut(cut)
+        sample = self.to_sample()
+        mask = np.empty(len(sample), dtype=bool)
+        for start in range(0, len(sample), _KINEMATICS_CHUNK_EVENTS):
+            stop = start + _KINEMATICS_CHUNK_EVENTS
+            weights = None if sample.weights is None else sample.weights[start:stop]
+            chunk = EventSample(sample.momenta[start:stop], sample.particles, weights)
+            mask[start:stop] = cut.evaluate(chunk)
+        return pd.Series(mask, index=self._obj.index)
+
+    def select(self, cut: Cut | str) -> pd.DataFrame:
+        """Select the events that pass a kinematic cut.
+
+        .. code-block:: python
+
+            selected = frame.pwa.select("m(D0, D-) > 3.8 and cos_theta(pi+) < 0.9")
+
+        .. seealso:: :meth:`mask`, :func:`select` for files that do not fit into memory
+        """
+        return self._obj[self.mask(cut).to_numpy()]
+
+    def unweight(
+        self, seed: int | None = None, max_weight: float | None = None
+    ) -> pd.DataFrame:
+        """Unweight the events with the accept-reject method.
+
+        Each event is kept with a probability of its weight divided by the largest
+        weight. The random number of each event only depends on the :code:`seed` and
+        the event number in the index of the frame, so a file gives the same events
+        whether it is unweighted at once or in chunks, see :func:`unweight`.
 
         Args:
-            filename: Name of the file to write to.
-            kwargs: Additional keyword arguments to pass to
-                :meth:`pandas.DataFrame.to_csv`.
+            seed: Seed of the random numbers.
+            max_weight: Weight that is accepted with probability one. Defaults to the
+                largest weight in the frame.
+
+        Returns:
+            The accepted events without the weight column.
         """
-        new_dict = []
-        if self.has_weights:
-            new_dict.append(self._obj[_WEIGHT_LABEL])
-        for par in self.particles:
-            # cspell:ignore astype dropna
-            new_dict.append(  # noqa: PERF401
-                self._obj[par].apply(
-                    lambda x: " ".join(x.dropna().astype(str)),
-                    axis=1,
-                )
+        if max_weight is None:
+            max_weight = _find_max_weight([self._obj])
+        return _unweight_block(self._obj, _get_random_key(seed), max_weight)
+
+    def downsample(self, size: float, seed: int | None = None) -> pd.DataFrame:
+        """Randomly select a number or a fraction of the events.
+
+        Like :meth:`unweight`, the random number of each event only depends on the
+        :code:`seed` and the event number in the index, so that the selection is
+        reproducible for chunked samples, see :func:`downsample`. The event numbers
+        therefore have to be unique, which is not the case for frames of several files
+        that are combined with :func:`pandas.concat` without :code:`ignore_index`.
+
+        Args:
+            size: Number of events to select, if an `int`, or the probability to keep
+                each event, if a `float` between 0 and 1.
+            seed: Seed of the random numbers.
+
+        Raises:
+            ValueError: If the index does not contain unique event numbers.
+        """
+        frame = self._obj
+        key = _get_random_key(seed)
+        threshold = _get_downsample_threshold(size, key, lambda: [frame.index])
+        return _downsample_block(frame, key, threshold)
+
+    def to_sample(self) -> EventSample:
+        """Convert to an array-backed :class:`EventSample`.
+
+        .. seealso:: :meth:`EventSample.from_frame`
+        """
+        return EventSample.from_frame(self._obj)
+
+    def write_ascii(
+        self,
+        filename: Path | str,
+        float_format: str | None = None,
+        chunk_events: int = 100_000,
+        **kwargs: Any,
+    ) -> None:
+        """Write to Pawian-like ASCII file.
+
+        .. seealso:: :func:`write_ascii`
+        """
+        _warn_to_csv_kwargs(kwargs)
+        write_ascii(filename, self._obj, float_format, chunk_events)
+
+    def write_binary(self, filename: Path | str, chunk_events: int = 1_000_000) -> None:
+        """Write to a columnar binary file that can be read with :func:`read_binary`.
+
+        .. seealso:: :func:`write_binary`
+        """
+        write_binary(filename, self._obj, chunk_events)
+
+
+class EventSample:
+    """Array-backed container of events.
+
+    Holds the four-momenta of all particles in one array of shape :code:`(n_events,
+    n_particles, 4)`, with the components ordered as :code:`p_x, p_y, p_z, E`, plus an
+    optional array of weights. All kinematic properties are plain `numpy.ndarray`
+    views or results, so that hot loops do not have to go through `pandas`.
+
+    Use :meth:`from_frame` and :meth:`to_frame` to convert from and to the
+    `~pandas.DataFrame` layout of the `.PwaAccessor`. These conversions do not copy
+    the data where possible, so the sample and the frame may share memory.
+    """
+
+    def __init__(
+        self,
+        momenta: np.ndarray,
+        particles: Iterable[str],
+        weights: np.ndarray | None = None,
+    ) -> None:
+        self.momenta = np.asarray(momenta, dtype=np.float64)
+        self.particles = list(particles)
+        self.weights = None if weights is None else np.asarray(weights, np.float64)
+        expected_shape = (len(self.particles), len(_MOMENTUM_LABELS))
+        if self.momenta.ndim != 3 or self.momenta.shape[1:] != expected_shape:  # noqa: PLR2004
+            msg = (
+                f"Momenta should have shape (n_events, {expected_shape[0]}, 4), but"
+                f" got {self.momenta.shape}"
             )
-        # cspell:ignore mergesort
-        interleaved = pd.concat(new_dict).sort_index(kind="mergesort")
-        interleaved.to_csv(filename, header=False, index=False, **kwargs)
+            raise ValueError(msg)
+        if self.weights is not None and self.weights.shape != (len(self.momenta),):
+            msg = (
+                f"There are {len(self.momenta)} events, but weights have shape"
+                f" {self.weights.shape}"
+            )
+            raise ValueError(msg)
+
+    def __len__(self) -> int:
+        return len(self.momenta)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> EventSample:
+        """Create a sample from a `~pandas.DataFrame` with a `.PwaAccessor` layout.
+
+        If the momentum columns of the frame are ordered like those created by
+        :func:`read_ascii` and form a single block of memory, the sample is a view on
+        that block.
+        """
+        particles = frame.pwa.particles
+        columns = _create_multi_column(particles)
+        if frame.columns[: len(columns)].equals(columns):
+            values = frame.iloc[:, : len(columns)].to_numpy(dtype=np.float64)
+        else:
+            values = frame[columns.to_list()].to_numpy(dtype=np.float64)
+        momenta = values.reshape(len(frame), len(particles), len(_MOMENTUM_LABELS))
+        weights = None
+        if frame.pwa.has_weights:
+            weights = frame.pwa.weights.to_numpy(dtype=np.float64)
+        return cls(momenta, particles, weights)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Convert to a `~pandas.DataFrame` with a `.PwaAccessor` layout.
+
+        Without weights, the frame is a view on :attr:`momenta` if it is contiguous
+        per event. With weights, momenta and weights are copied into one block.
+        """
+        return _create_frame(self.momenta, self.particles, self.weights)
+
+    @property
+    def has_weights(self) -> bool:
+        """Check if the sample contains weights."""
+        return self.weights is not None
+
+    @property
+    def energy(self) -> np.ndarray:
+        """View of the energies with shape :code:`(n_events, n_particles)`."""
+        return self.momenta[..., 3]
+
+    @property
+    def p_xyz(self) -> np.ndarray:
+        """View of the 3-momenta with shape :code:`(n_events, n_particles, 3)`."""
+        return self.momenta[..., :3]
+
+    @property
+    def rho2(self) -> np.ndarray:
+        """**Compute** the square sum of the 3-momenta."""
+        p_xyz = self.p_xyz
+        return np.einsum("...i,...i->...", p_xyz, p_xyz)
+
+    @property
+    def rho(self) -> np.ndarray:
+        """**Compute** the absolute value of the 3-momenta."""
+        return np.sqrt(self.rho2)
+
+    @property
+    def mass2(self) -> np.ndarray:
+        """**Compute** the square of the invariant masses."""
+        return self.energy**2 - self.rho2
+
+    @property
+    def mass(self) -> np.ndarray:
+        """**Compute** the invariant masses."""
+        return np.sqrt(self.mass2)
+
+
+def _make_read_only(result: pd.DataFrame | pd.Series) -> pd.DataFrame | pd.Series:
+    """Copy a result into one array that cannot be written to."""
+    values = result.to_numpy(dtype=np.float64, copy=True)
+    values.flags.writeable = False
+    if isinstance(result, pd.Series):
+        return pd.Series(values, index=result.index, name=result.name, copy=False)
+    return pd.DataFrame(values, index=result.index, columns=result.columns, copy=False)
 
 
 def create_skeleton_frame(
@@ -196,16 +659,134 @@ def create_skeleton_frame(
         index = pd.RangeIndex(number_of_rows)
     if particle_names is None:
         return pd.DataFrame(index=index, columns=_MOMENTUM_LABELS)
+    return pd.DataFrame(index=index, columns=_create_multi_column(particle_names))
+
+
+def _iter_four_momentum_sums(
+    block: np.ndarray, buffers: np.ndarray
+) -> Iterator[np.ndarray]:
+    """Sum the four-momenta of all combinations of particles.
+
+    Args:
+        block: Four-momenta with shape :code:`(n_particles, 4, n_events)`.
+        buffers: Buffer for the partial sums with shape :code:`(order, 4,
+            n_events)`, where :code:`order` is the number of particles to combine.
+
+    Yields:
+        Four-momentum sums of shape :code:`(4, n_events)` in the order of
+        `itertools.combinations`. These are views on the input arrays that are
+        overwritten by the next combinations.
+    """
+    n_particles = len(block)
+    order = len(buffers)
+
+    def recurse(
+        depth: int, first: int, previous: np.ndarray | None
+    ) -> Iterator[np.ndarray]:
+        for i in range(first, n_particles - order + depth + 1):
+            if previous is None:
+                total = block[i]
+            else:
+                total = np.add(previous, block[i], out=buffers[depth])
+            if depth + 1 == order:
+                yield total
+            else:
+                yield from recurse(depth + 1, i + 1, total)
+
+    return recurse(0, 0, None)
+
+
+def _compute_invariant_mass(four_momenta: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Compute invariant masses from four-momenta of shape :code:`(4, n_events)`.
+
+    A negative squared mass results in NaN, like :attr:`.PwaAccessor.mass`.
+    """
+    p_x, p_y, p_z, energy = four_momenta
+    mass2 = np.multiply(energy, energy, out=out)
+    mass2 -= p_x**2
+    mass2 -= p_y**2
+    mass2 -= p_z**2
+    return np.sqrt(mass2, out=mass2)
+
+
+def _boost(four_momenta: np.ndarray, frame: np.ndarray) -> np.ndarray:
+    """Boost four-momenta into the rest frame of another four-momentum.
+
+    Both arrays have the four-momentum components on the last axis and are
+    broadcast against each other.
+    """
+    beta = frame[..., :3] / frame[..., 3:]
+    beta2 = np.einsum("...i,...i->...", beta, beta)
+    gamma = 1 / np.sqrt(1 - beta2)
+    p_xyz = four_momenta[..., :3]
+    energy = four_momenta[..., 3]
+    beta_p = np.einsum("...i,...i->...", beta, p_xyz)
+    # (gamma - 1) / beta^2, written such that it is also defined for beta = 0
+    factor = gamma**2 / (gamma + 1)
+    boosted = np.empty(np.broadcast_shapes(four_momenta.shape, frame.shape))
+    boosted[..., :3] = p_xyz + (factor * beta_p - gamma * energy)[..., None] * beta
+    boosted[..., 3] = gamma * (energy - beta_p)
+    return boosted
+
+
+def _compute_decay_angles(
+    momenta: np.ndarray,
+    daughter_index: int,
+    system_indices: list[int],
+    gottfried_jackson: bool,
+    out: np.ndarray,
+) -> np.ndarray:
+    """Compute decay angles from four-momenta of shape :code:`(n_events, n, 4)`.
+
+    .. seealso:: :meth:`.PwaAccessor.helicity_angles`
+    """
+    total = momenta.sum(axis=1)
+    daughter = _boost(momenta[:, daughter_index], total)
+    if len(system_indices) == momenta.shape[1]:
+        # the whole event is at rest in the center-of-mass frame, so the axes are
+        # defined by its flight direction in the lab frame
+        z_axis = _normalize(total[:, :3])
+        y_axis = _normalize(np.cross(z_axis, [0.0, 1.0, 0.0]))
+    else:
+        system = _boost(momenta[:, system_indices].sum(axis=1), total)
+        daughter = _boost(daughter, system)
+        beam = _boost(np.array(_BEAM_DIRECTION), system)
+        helicity_axis = _normalize(system[:, :3])
+        y_axis = _normalize(np.cross(beam[:, :3], helicity_axis))
+        z_axis = _normalize(beam[:, :3]) if gottfried_jackson else helicity_axis
+    return _compute_angles(daughter[:, :3], z_axis, y_axis, out)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _compute_angles(
+    p_xyz: np.ndarray, z_axis: np.ndarray, y_axis: np.ndarray, out: np.ndarray
+) -> np.ndarray:
+    r"""Compute :math:`\cos\theta` and :math:`\phi` of 3-momenta in a frame."""
+    x_axis = np.cross(y_axis, z_axis)
+    p_x = np.einsum("ij,ij->i", p_xyz, x_axis)
+    p_y = np.einsum("ij,ij->i", p_xyz, y_axis)
+    p_z = np.einsum("ij,ij->i", p_xyz, z_axis)
+    np.divide(p_z, np.linalg.norm(p_xyz, axis=-1), out=out[0])
+    np.arctan2(p_y, p_x, out=out[1])
+    return out
+
+
+def _create_multi_column(particle_names: Iterable[str]) -> pd.MultiIndex:
     cols = [(p, mom) for p in particle_names for mom in _MOMENTUM_LABELS]
-    multi_column = pd.MultiIndex.from_tuples(
-        tuples=cols, names=["Particle", "Momentum"]
-    )
-    return pd.DataFrame(index=index, columns=multi_column)
+    return pd.MultiIndex.from_tuples(tuples=cols, names=["Particle", "Momentum"])
 
 
-def read_ascii(  # noqa: C901
-    filename: str,
+def read_ascii(  # noqa: PLR0913
+    filename: Path | str,
     particles: list[str] | int | None = None,
+    engine: Literal["numpy", "pandas"] = "numpy",
+    workers: int = 1,
+    cache: AsciiCache | bool = False,
+    *,
+    events: slice | None = None,
     **kwargs: Any,
 ) -> pd.DataFrame:
     """Import from a Pawian-like ASCII file.
@@ -214,10 +795,604 @@ def read_ascii(  # noqa: C901
         filename: The name of the file to read.
         particles: A list of particles to read. If `None`, all particles are read. If
             `int`, column names for the particles are numbered.
+        engine: How the tokenized file is converted to a `~pandas.DataFrame`. The
+            :code:`"numpy"` engine interprets the parsed numbers as one flat buffer of
+            shape :code:`(n_events, n_rows, 4)`, so that the weights and momenta are
+            obtained through stride views and are copied only once. The
+            :code:`"pandas"` engine copies the rows column by column.
+        workers: Number of processes that parse the file. If larger than one, the
+            file is split into byte ranges that start at an event boundary and each
+            range is tokenized in a separate process. The result is identical to
+            reading the file serially. Compressed files cannot be split and are
+            always read by one process.
+        cache: Store the parsed events in a binary sidecar file and load them from
+            there on the next call, see :class:`AsciiCache`. If `True`, the default
+            cache directory is used.
+        events: Range of events to read. Only the bytes of these events are parsed.
+            The events are found with the stored event index of the file, see
+            :func:`build_event_index`. Without a valid index, the file is scanned for
+            the events, which is faster than parsing it, but nothing is stored. The
+            step may be negative. The index of the frame contains the event numbers.
+            Cannot be combined with :code:`workers` or :code:`cache`.
         kwargs: Additional keyword arguments to pass to :func:`pandas.read_table`.
+            Cannot be combined with :code:`workers` or :code:`cache`.
+
+    .. seealso:: :func:`iter_ascii` for reading files that do not fit in memory.
+    """
+    if events is not None and (cache or workers > 1):
+        msg = "events cannot be combined with cache or workers"
+        raise TypeError(msg)
+    if cache:
+        if kwargs:
+            msg = f"Keyword arguments {sorted(kwargs)} cannot be combined with cache"
+            raise TypeError(msg)
+        return _load_or_store(
+            AsciiCache() if cache is True else cache,
+            filename,
+            particles,
+            read=lambda: read_ascii(filename, particles, engine, workers),
+        )
+    _check_engine(engine)
+    if workers < 1:
+        msg = f"workers has to be positive, but got {workers}"
+        raise ValueError(msg)
+    has_weights, file_n_particles = _peek_layout(filename)
+    particles = _resolve_particles(filename, particles, has_weights, file_n_particles)
+    if workers > 1 and kwargs:
+        msg = f"Keyword arguments {sorted(kwargs)} cannot be combined with workers"
+        raise TypeError(msg)
+    if events is not None:
+        return _read_event_range(
+            filename, events, particles, has_weights, engine, **kwargs
+        )
+    if workers > 1 and _detect_compression(filename) is None:
+        buffer = _read_buffer_in_parallel(filename, has_weights, workers)
+        full_table = pd.DataFrame(buffer, columns=_MOMENTUM_LABELS, copy=False)
+    else:
+        with _open_ascii(filename, "rb") as stream:
+            full_table = _read_table(stream, **kwargs)
+    if engine == "numpy":
+        return _buffer_to_frame(full_table, particles, has_weights, filename)
+    return _table_to_frame(full_table, particles, has_weights)
+
+
+def _load_or_store(
+    cache: AsciiCache,
+    filename: Path | str,
+    particles: list[str] | int | None,
+    read: Callable[[], pd.DataFrame],
+) -> pd.DataFrame:
+    frame = cache.load(filename, particles)
+    if frame is None:
+        frame = read()
+        cache.store(filename, frame)
+    return frame
+
+
+def build_event_index(
+    filename: Path | str,
+    particles: list[str] | int | None = None,
+    block_size: int = 1 << 24,
+) -> np.ndarray:
+    """Build an index of the byte offsets at which the events in an ASCII file start.
+
+    The file is scanned once block by block. The index is an array of
+    :code:`n_events + 1` offsets, of which the last is the size of the file, and is
+    stored next to the file as :file:`<filename>.index.npy`, plus a
+    :file:`<filename>.index.json` with the layout of the events and the size and
+    modification time of the file. :func:`read_ascii` uses the index to read a range
+    of events without parsing the rest of the file:
+
+    .. code-block:: python
+
+        build_event_index("data.dat")
+        events = read_ascii("data.dat", events=slice(9_000_000, 9_001_000))
+
+    Args:
+        filename: The name of the file to index. Compressed files cannot be indexed,
+            because they cannot be read from an arbitrary position.
+        particles: The particles in the file, see :func:`read_ascii`. Only their
+            number matters, which is only needed if the file contains no weights.
+        block_size: Number of bytes that are scanned at once.
+    """
+    if _detect_compression(filename) is not None:
+        msg = f"Cannot build an event index of compressed file {filename}"
+        raise ValueError(msg)
+    has_weights, file_n_particles = _peek_layout(filename)
+    particles = _resolve_particles(filename, particles, has_weights, file_n_particles)
+    rows_per_event = len(particles) + int(has_weights)
+    offsets = _compute_event_offsets(filename, rows_per_event, block_size)
+    index_path, metadata_path = _get_event_index_paths(filename)
+    metadata = {
+        **_fingerprint_file(filename, hashed=False),
+        "rows_per_event": rows_per_event,
+    }
+    with _atomic_open(index_path) as stream:
+        np.save(stream, offsets)
+    with _atomic_open(metadata_path) as stream:
+        stream.write(json.dumps(metadata).encode())
+    return offsets
+
+
+def _load_event_index(filename: Path | str, rows_per_event: int) -> np.ndarray | None:
+    """Memory-map the stored event index of a file, if it is still valid."""
+    index_path, metadata_path = _get_event_index_paths(filename)
+    try:
+        metadata = json.loads(metadata_path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    fingerprint = _fingerprint_file(filename, hashed=False)
+    if any(metadata.get(key) != value for key, value in fingerprint.items()):
+        return None
+    if metadata.get("rows_per_event") != rows_per_event:
+        return None
+    try:
+        return np.load(index_path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+
+def _get_event_index_paths(filename: Path | str) -> tuple[Path, Path]:
+    return Path(f"{filename}.index.npy"), Path(f"{filename}.index.json")
+
+
+def _compute_event_offsets(
+    filename: Path | str, rows_per_event: int, block_size: int
+) -> np.ndarray:
+    """Find the byte offsets of every :code:`rows_per_event`-th non-blank line."""
+    event_starts = []
+    n_rows = 0
+    position = 0
+    remainder = b""
+    with open(filename, "rb") as stream:
+        while True:
+            block = stream.read(block_size)
+            buffer = remainder + block
+            if block:
+                # only scan complete lines, the rest is prepended to the next block
+                end = buffer.rfind(b"\n") + 1
+                remainder = buffer[end:]
+                buffer = buffer[:end]
+            row_starts = _find_row_starts(buffer)
+            first = -n_rows % rows_per_event
+            event_starts.append(position + row_starts[first::rows_per_event])
+            n_rows += len(row_starts)
+            position += len(buffer)
+            if not block:
+                break
+    if n_rows % rows_per_event:
+        msg = (
+            f"File {filename} contains {n_rows} non-empty lines, which is not a"
+            f" multiple of {rows_per_event} lines per event"
+        )
+        raise DataParserError(msg)
+    return np.concatenate([*event_starts, [position]]).astype(np.int64)
+
+
+def _find_row_starts(buffer: bytes) -> np.ndarray:
+    """Find the byte offsets of the lines that contain more than whitespace."""
+    characters = np.frombuffer(buffer, dtype=np.uint8)
+    line_starts = np.concatenate([[0], np.flatnonzero(characters == ord("\n")) + 1])
+    if line_starts[-1] == len(characters):
+        line_starts = line_starts[:-1]
+    # whitespace and other control characters come before the space character
+    is_row = np.logical_or.reduceat(characters > ord(" "), line_starts)
+    return line_starts[is_row]
+
+
+def _read_event_range(
+    filename: Path | str,
+    events: slice,
+    particles: list[str],
+    has_weights: bool,
+    engine: Literal["numpy", "pandas"],
+    **kwargs: Any,
+) -> pd.DataFrame:
+    rows_per_event = len(particles) + int(has_weights)
+    offsets = _load_event_index(filename, rows_per_event)
+    if offsets is None:
+        # a read should not write files next to the data, so only scan in memory
+        if _detect_compression(filename) is not None:
+            msg = f"Cannot read a range of events of compressed file {filename}"
+            raise ValueError(msg)
+        offsets = _compute_event_offsets(filename, rows_per_event, block_size=1 << 24)
+    event_range = range(len(offsets) - 1)[events]
+    if not event_range:
+        n_columns = len(particles) * len(_MOMENTUM_LABELS) + int(has_weights)
+        values = np.empty((0, n_columns))
+        return _wrap_values(values, particles, has_weights, event_range.start)
+    # parse the events in file order, a negative step then starts at the last row
+    first_event, last_event = sorted((event_range[0], event_range[-1]))
+    start, stop = int(offsets[first_event]), int(offsets[last_event + 1])
+    with open(filename, "rb") as stream:
+        stream.seek(start)
+        text = stream.read(stop - start)
+    table = _read_table(io.BytesIO(text), **kwargs)
+    if engine == "numpy":
+        frame = _buffer_to_frame(table, particles, has_weights, filename, first_event)
+    else:
+        frame = _table_to_frame(table, particles, has_weights, first_event)
+    return frame.iloc[:: event_range.step]
+
+
+def shard(
+    filename: Path | str,
+    n_shards: int,
+    output_dir: Path | str | None = None,
+    particles: list[str] | int | None = None,
+    workers: int = 1,
+) -> list[Path]:
+    """Split an ASCII file into shards of whole events without parsing the numbers.
+
+    The shards are byte ranges of the file that start at an event. They are written as
+    :file:`<stem>.<i><suffix>`, for instance :file:`data.0.dat`, :file:`data.1.dat`,
+    etc., and can be concatenated again with :func:`merge`:
+
+    .. code-block:: python
+
+        shards = shard("data.dat", n_shards=8, output_dir="shards", workers=4)
+
+    If the file has an event index, see :func:`build_event_index`, the shards get the
+    same number of events. Otherwise, a file with weights is split at weight lines into
+    shards of about the same size. A file without weights is scanned once to find its
+    events.
+
+    Args:
+        filename: The ASCII file to split. Compressed files cannot be split, because
+            they cannot be read from an arbitrary position.
+        n_shards: Number of shards. A file with fewer events gives fewer shards.
+        output_dir: Directory for the shards, by default the directory of the file.
+        particles: The particles in the file, see :func:`read_ascii`. Only their number
+            matters, which is only needed if the file contains no weights.
+        workers: Number of threads that copy shards in parallel.
+
+    Returns:
+        The paths of the shards in the order of the events.
+    """
+    if n_shards < 1 or workers < 1:
+        msg = f"n_shards and workers have to be positive, but got {n_shards}, {workers}"
+        raise ValueError(msg)
+    if _detect_compression(filename) is not None:
+        msg = f"Cannot shard compressed file {filename}"
+        raise ValueError(msg)
+    boundaries = _get_shard_boundaries(filename, n_shards, particles)
+    path = Path(filename)
+    directory = path.parent if output_dir is None else Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    width = len(str(len(boundaries) - 2))
+    targets = [
+        directory / f"{path.stem}.{i:0{width}d}{path.suffix}"
+        for i in range(len(boundaries) - 1)
+    ]
+
+    def write_shard(target: Path, start: int, stop: int) -> None:
+        with _atomic_open(target) as stream:
+            _copy_byte_range(filename, start, stop, stream)
+
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(write_shard, targets, boundaries[:-1], boundaries[1:]))
+    return targets
+
+
+def merge(
+    filenames: Iterable[Path | str],
+    output: Path | str,
+    particles: list[str] | int | None = None,
+    workers: int = 1,
+) -> None:
+    """Concatenate ASCII files with the same particles into one file.
+
+    The files are copied byte by byte, so their numbers are not parsed. Before
+    anything is written, the files are checked to have the same weight structure and
+    number of particles. Files without weights contain no event structure, so they are
+    scanned once to check that their lines fit the number of :code:`particles`.
+
+    .. code-block:: python
+
+        merge(sorted(Path("fitted").glob("data.*.dat")), "data_fitted.dat")
+
+    Args:
+        filenames: The ASCII files to concatenate, in order. Compressed files are not
+            supported.
+        output: The file to write.
+        particles: The particles in the files, see :func:`read_ascii`. Only their
+            number matters, which is required if the files contain no weights.
+        workers: Number of threads that check and copy files in parallel.
+    """
+    filenames = list(filenames)
+    if not filenames:
+        msg = "Need at least one file to merge"
+        raise ValueError(msg)
+    if workers < 1:
+        msg = f"workers has to be positive, but got {workers}"
+        raise ValueError(msg)
+    if _detect_compression(output, mode="w") is not None:
+        msg = f"Cannot merge into compressed file {output}"
+        raise ValueError(msg)
+    for filename in filenames:
+        if _detect_compression(filename) is not None:
+            msg = f"Cannot merge compressed file {filename}"
+            raise ValueError(msg)
+    layout = _peek_layout(filenames[0])
+    with ThreadPoolExecutor(workers) as executor:
+        checks = executor.map(
+            _check_mergeable, filenames, repeat(layout), repeat(particles)
+        )
+        list(checks)
+        sizes = [os.path.getsize(filename) for filename in filenames]
+        # a missing new line at the end of a file would join lines of two files
+        newlines = list(map(_ends_without_newline, filenames, sizes))
+        offsets = np.cumsum([0, *sizes]) + np.cumsum([0, *newlines])
+        with _atomic_open(Path(output)) as stream:
+            stream.truncate(int(offsets[-1]))
+            stream.flush()
+            copies = executor.map(
+                _copy_into, filenames, sizes, repeat(stream.name), offsets.tolist()
+            )
+            list(copies)
+            for offset, newline in zip(offsets[1:], newlines):
+                if newline:
+                    stream.seek(int(offset) - 1)
+                    stream.write(b"\n")
+
+
+def _get_shard_boundaries(
+    filename: Path | str, n_shards: int, particles: list[str] | int | None
+) -> list[int]:
+    """Determine the byte ranges of shards, see :func:`shard`."""
+    has_weights, file_n_particles = _peek_layout(filename)
+    particles = _resolve_particles(filename, particles, has_weights, file_n_particles)
+    rows_per_event = len(particles) + int(has_weights)
+    offsets = _load_event_index(filename, rows_per_event)
+    if offsets is None and not has_weights:
+        offsets = _compute_event_offsets(filename, rows_per_event, block_size=1 << 24)
+    if offsets is None:
+        return _split_at_events(filename, has_weights, n_shards)
+    n_events = len(offsets) - 1
+    size = int(offsets[-1])
+    boundaries = [0]
+    for i in range(1, n_shards):
+        start = int(offsets[n_events * i // n_shards])
+        if boundaries[-1] < start < size:
+            boundaries.append(start)
+    boundaries.append(size)
+    return boundaries
+
+
+def _check_mergeable(
+    filename: Path | str,
+    layout: tuple[bool, int | None],
+    particles: list[str] | int | None,
+) -> None:
+    """Check that a file has a layout and, without weights, fits the particles."""
+    has_weights, file_n_particles = _peek_layout(filename)
+    if (has_weights, file_n_particles) != layout:
+        msg = (
+            "All files should have the same particles and weights, but"
+            f" {filename} has weights={has_weights} and {file_n_particles} particles"
+            f" instead of weights={layout[0]} and {layout[1]} particles"
+        )
+        raise ValueError(msg)
+    particles = _resolve_particles(filename, particles, has_weights, file_n_particles)
+    rows_per_event = len(particles) + int(has_weights)
+    if not has_weights and _load_event_index(filename, rows_per_event) is None:
+        _compute_event_offsets(filename, rows_per_event, block_size=1 << 24)
+
+
+def _ends_without_newline(filename: Path | str, size: int) -> bool:
+    if size == 0:
+        return False
+    with open(filename, "rb") as stream:
+        stream.seek(size - 1)
+        return stream.read(1) != b"\n"
+
+
+def _copy_into(
+    filename: Path | str, size: int, target: Path | str, offset: int
+) -> None:
+    with open(target, "r+b") as stream:
+        stream.seek(offset)
+        _copy_byte_range(filename, 0, size, stream)
+
+
+def _copy_byte_range(
+    filename: Path | str,
+    start: int,
+    stop: int,
+    target: BinaryIO,
+    block_size: int = 1 << 24,
+) -> None:
+    with open(filename, "rb") as stream:
+        stream.seek(start)
+        remaining = stop - start
+        while remaining > 0:
+            block = stream.read(min(block_size, remaining))
+            if not block:
+                break
+            target.write(block)
+            remaining -= len(block)
+
+
+def iter_ascii(
+    filename: Path | str,
+    particles: list[str] | int | None = None,
+    chunk_events: int = 100_000,
+    engine: Literal["numpy", "pandas"] = "numpy",
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a Pawian-like ASCII file in chunks of events.
+
+    The file is parsed lazily, so that memory usage only depends on
+    :code:`chunk_events` and not on the size of the file. Compressed files are
+    decompressed block by block while they are parsed. Each chunk is a
+    `~pandas.DataFrame` with the same layout as the one returned by
+    :func:`read_ascii` and its index continues where the previous chunk stopped.
+
+    Args:
+        filename: The name of the file to read.
+        particles: A list of particles to read, see :func:`read_ascii`.
+        chunk_events: Maximal number of events per chunk. The last chunk may contain
+            fewer events.
+        engine: The conversion engine, see :func:`read_ascii`.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    _check_engine(engine)
+    has_weights, file_n_particles = _peek_layout(filename)
+    particles = _resolve_particles(filename, particles, has_weights, file_n_particles)
+    rows_per_event = len(particles) + int(has_weights)
+    first_event = 0
+    chunk_rows = chunk_events * rows_per_event
+    stream = _open_ascii(filename, "rb")
+    with stream, _read_table(stream, chunksize=chunk_rows) as reader:
+        for table in reader:
+            if engine == "numpy":
+                frame = _buffer_to_frame(
+                    table, particles, has_weights, filename, first_event
+                )
+            else:
+                frame = _table_to_frame(table, particles, has_weights, first_event)
+            first_event += len(frame)
+            yield frame
+
+
+def write_ascii(
+    filename: Path | str,
+    sample: pd.DataFrame | Iterable[pd.DataFrame],
+    float_format: str | None = None,
+    chunk_events: int = 100_000,
+    **kwargs: Any,
+) -> None:
+    """Write events to a Pawian-like ASCII file.
+
+    The weights and momenta are interleaved into one 2-D array per block of events,
+    which is formatted in one go and streamed to the file. Events with a missing
+    (NaN) weight are written without a weight line.
+
+    Args:
+        filename: Name of the file to write to. If it ends with :file:`.gz`,
+            :file:`.bz2`, or :file:`.xz`, the file is compressed while writing.
+        sample: A `~pandas.DataFrame` with a `.PwaAccessor` layout, or an iterable of
+            those with the same particles, such as the one created by
+            :func:`iter_ascii`. An iterable is written frame by frame, so that it
+            does not have to fit into memory.
+        float_format: A printf-style format for the numbers, for instance
+            :code:`"%.6g"` for a fixed precision. By default, numbers are written with
+            the shortest representation that reads back exactly.
+        chunk_events: Number of events that are formatted at once.
+        kwargs: Deprecated and ignored. These used to be passed on to
+            :meth:`pandas.DataFrame.to_csv`.
+    """
+    _warn_to_csv_kwargs(kwargs)
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    if float_format is None:
+        float_format = "%r"
+    layout = None
+    with _open_ascii(filename, "wt") as stream:
+        for block in _iter_blocks(sample, chunk_events):
+            layout = _check_layout(block, layout)
+            stream.write(_format_ascii_block(block, *layout, float_format))
+
+
+def _format_ascii_block(
+    block: pd.DataFrame, particles: list[str], has_weights: bool, float_format: str
+) -> str:
+    """Format a block of events, without weight lines for missing weights."""
+    columns = [(p, mom) for p in particles for mom in _MOMENTUM_LABELS]
+    momentum_line = " ".join([float_format] * len(_MOMENTUM_LABELS)) + "\n"
+    event_format = momentum_line * len(particles)
+    values = block[columns].to_numpy(dtype=np.float64)
+    if not has_weights:
+        return event_format * len(values) % tuple(values.ravel().tolist())
+    weights = block[_WEIGHT_LABEL].to_numpy(dtype=np.float64)
+    values = np.column_stack([weights, values])
+    weighted_format = f"{float_format}\n{event_format}"
+    is_weighted = ~np.isnan(weights)
+    if is_weighted.all():
+        return weighted_format * len(values) % tuple(values.ravel().tolist())
+    is_written = np.ones(values.shape, dtype=bool)
+    is_written[:, 0] = is_weighted
+    formats = np.where(is_weighted, weighted_format, event_format)
+    return "".join(formats.tolist()) % tuple(values[is_written].tolist())
+
+
+def _warn_to_csv_kwargs(kwargs: dict[str, Any]) -> None:
+    if kwargs:
+        msg = (
+            "Keyword arguments for pandas.DataFrame.to_csv are deprecated and have no"
+            f" effect, got {sorted(kwargs)}"
+        )
+        warnings.warn(msg, DeprecationWarning, stacklevel=3)
+
+
+def _iter_blocks(
+    sample: pd.DataFrame | Iterable[pd.DataFrame], chunk_events: int
+) -> Iterator[pd.DataFrame]:
+    frames = [sample] if isinstance(sample, pd.DataFrame) else sample
+    for frame in frames:
+        for start in range(0, len(frame), chunk_events):
+            yield frame.iloc[start : start + chunk_events]
+
+
+def _check_layout(
+    frame: pd.DataFrame, layout: tuple[list[str], bool] | None
+) -> tuple[list[str], bool]:
+    """Check that a frame has the same particles and weights as the previous ones."""
+    frame_layout = frame.pwa.particles, frame.pwa.has_weights
+    if layout is not None and frame_layout != layout:
+        msg = (
+            "All frames should have the same particles and weights, but got"
+            f" {frame_layout} after {layout}"
+        )
+        raise ValueError(msg)
+    return frame_layout
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in {"numpy", "pandas"}:
+        msg = f'Wrong engine "{engine}": should be either "numpy" or "pandas"'
+        raise ValueError(msg)
+
+
+def _detect_compression(
+    filename: Path | str, mode: str = "r"
+) -> Literal["bz2", "gzip", "xz"] | None:
+    """Determine the compression of a file from its extension or its first bytes."""
+    suffix = Path(filename).suffix.lower()
+    if suffix in _COMPRESSION_SUFFIXES:
+        return _COMPRESSION_SUFFIXES[suffix]
+    if "r" not in mode:
+        return None
+    with open(filename, "rb") as stream:
+        head = stream.read(max(len(magic) for magic in _COMPRESSION_MAGIC.values()))
+    for compression, magic in _COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _open_ascii(filename: Path | str, mode: str = "rt") -> IO[Any]:
+    """Open a plain or compressed ASCII file.
+
+    Compressed files are opened as streams that (de)compress block by block, so they
+    are never inflated completely in memory or on disk.
     """
-    full_table = pd.read_table(
-        filepath_or_buffer=filename,
+    compression = _detect_compression(filename, mode)
+    if compression == "bz2":
+        return bz2.open(filename, mode)
+    if compression == "gzip":
+        return gzip.open(filename, mode, compresslevel=6)  # type: ignore[return-value]
+    if compression == "xz":
+        return lzma.open(filename, mode)
+    return open(filename, mode)
+
+
+def _read_table(source: Path | str | IO[Any], **kwargs: Any) -> Any:
+    """Tokenize an ASCII file into rows of up to four floats."""
+    return pd.read_table(
+        filepath_or_buffer=source,
         names=_MOMENTUM_LABELS,
         sep=r"\s+",
         skip_blank_lines=True,
@@ -225,70 +1400,665 @@ def read_ascii(  # noqa: C901
         **kwargs,
     )
 
-    # Determine if ascii file contains weights
-    py_values = full_table[_MOMENTUM_LABELS[1]]
-    has_weights = py_values.first_valid_index() > 0
+
+def _read_buffer_in_parallel(
+    filename: Path | str, has_weights: bool, workers: int
+) -> np.ndarray:
+    """Tokenize an ASCII file in a process pool and stitch the rows together."""
+    boundaries = _split_at_events(filename, has_weights, n_parts=workers)
+    starts = boundaries[:-1]
+    stops = boundaries[1:]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = executor.map(_read_buffer_part, repeat(filename), starts, stops)
+        return np.concatenate(list(parts))
+
+
+def _split_at_events(
+    filename: Path | str, has_weights: bool, n_parts: int
+) -> list[int]:
+    """Split a file into byte ranges that do not cut through an event.
+
+    If the file contains weights, each range starts at a weight line. Otherwise, events
+    cannot be recognized by their content and the ranges start at a line. Either way,
+    the rows of the ranges can be concatenated to the rows of the complete file.
+    """
+    size = os.path.getsize(filename)
+    boundaries = [0]
+    with open(filename, "rb") as stream:
+        for i in range(1, n_parts):
+            offset = max(size * i // n_parts, boundaries[-1])
+            start = _find_event_start(stream, offset, has_weights)
+            if boundaries[-1] < start < size:
+                boundaries.append(start)
+    boundaries.append(size)
+    return boundaries
+
+
+def _find_event_start(stream: BinaryIO, offset: int, has_weights: bool) -> int:
+    """Find the byte position of the first event that starts at or after an offset."""
+    if offset > 0:
+        stream.seek(offset - 1)
+        stream.readline()
+    else:
+        stream.seek(0)
+    while True:
+        position = stream.tell()
+        line = stream.readline()
+        if not line:
+            return position
+        n_values = len(line.split())
+        if n_values == 0:
+            continue
+        if not has_weights or n_values == 1:
+            return position
+
+
+def _read_buffer_part(filename: Path | str, start: int, stop: int) -> np.ndarray:
+    with open(filename, "rb") as stream:
+        stream.seek(start)
+        text = stream.read(stop - start)
+    table = _read_table(io.BytesIO(text))
+    return table.to_numpy(dtype=np.float64)
+
+
+def _buffer_to_frame(
+    table: pd.DataFrame,
+    particles: list[str],
+    has_weights: bool,
+    filename: Path | str,
+    first_event: int = 0,
+) -> pd.DataFrame:
+    """Interpret the rows of a parsed ASCII file as one buffer of events.
+
+    The parsed table holds one float64 buffer of shape :code:`(n_rows, 4)`, in which
+    weight rows are padded with NaN. That buffer is reshaped in place to
+    :code:`(n_events, rows_per_event, 4)`, so that the weights and the momenta are
+    stride views on the parsed numbers.
+    """
+    buffer = table.to_numpy(dtype=np.float64, copy=False)
+    rows_per_event = len(particles) + int(has_weights)
+    if len(buffer) % rows_per_event:
+        msg = (
+            f'File "{filename}" contains incomplete events: {len(buffer)} rows is not'
+            f" a multiple of {rows_per_event} rows per event"
+        )
+        raise DataParserError(msg)
+    events = buffer.reshape(-1, rows_per_event, len(_MOMENTUM_LABELS))
+    if not has_weights:
+        return _create_frame(events, particles, first_event=first_event)
+    if not np.isnan(events[:, 0, 1:]).all():
+        msg = f'File "{filename}" does not have a weight line at every event start'
+        raise DataParserError(msg)
+    return _create_frame(events[:, 1:], particles, events[:, 0, 0], first_event)
+
+
+def _create_frame(
+    momenta: np.ndarray,
+    particles: list[str],
+    weights: np.ndarray | None = None,
+    first_event: int = 0,
+) -> pd.DataFrame:
+    """Wrap an array of shape :code:`(n_events, n_particles, 4)` in a frame.
+
+    Without weights, the array is only copied if it is not contiguous per event. With
+    weights, the momenta and weights are copied once into a single block.
+    """
+    n_events = len(momenta)
+    if weights is None:
+        values = momenta.reshape(n_events, -1)
+    else:
+        values = np.empty((n_events, momenta[0].size + 1), dtype=np.float64)
+        values[:, :-1] = momenta.reshape(n_events, -1)
+        values[:, -1] = weights
+    return _wrap_values(values, particles, weights is not None, first_event)
+
+
+def _wrap_values(
+    values: np.ndarray,
+    particles: list[str],
+    has_weights: bool,
+    first_event: int = 0,
+) -> pd.DataFrame:
+    """Wrap a 2-D array of momenta, with weights in the last column, in a frame.
+
+    The frame consists of a single block that shares memory with :code:`values`.
+    """
+    n_events = len(values)
+    columns = _create_multi_column(particles)
+    if has_weights:
+        columns = columns.insert(len(columns), (_WEIGHT_LABEL, ""))
+    return pd.DataFrame(
+        values,
+        index=pd.RangeIndex(first_event, first_event + n_events),
+        columns=columns,
+        copy=False,
+    )
+
+
+def _peek_layout(filename: Path | str) -> tuple[bool, int | None]:
+    """Determine the event structure from the first lines of an ASCII file.
+
+    Returns whether the file contains weights and, if so, the number of particles per
+    event. Without weight lines, the number of particles cannot be determined.
+    """
+    has_weights: bool | None = None
+    n_particles = 0
+    with _open_ascii(filename, "rt") as stream:
+        for line in stream:
+            n_values = len(line.split())
+            if n_values == 0:
+                continue
+            if has_weights is None:
+                has_weights = n_values == 1
+                if not has_weights:
+                    return False, None
+                continue
+            if n_values == 1:
+                break
+            n_particles += 1
+    if has_weights is None:
+        msg = f'File "{filename}" does not contain any events'
+        raise DataParserError(msg)
+    return True, n_particles
+
+
+def _resolve_particles(
+    filename: Path | str,
+    particles: list[str] | int | None,
+    has_weights: bool,
+    file_n_particles: int | None,
+) -> list[str]:
     if not has_weights:
         if isinstance(particles, int):
-            particles = [f"Particle {i}" for i in range(1, particles + 1)]
-        elif particles is None or not isinstance(particles, list):
+            return [f"Particle {i}" for i in range(1, particles + 1)]
+        if particles is None or not isinstance(particles, list):
             msg = (
                 f'Cannot determine number of particles in file"{filename}"\n--> Please'
                 " provide an array of particles for interpretation"
             )
             raise DataParserError(msg)
+        return particles
+    if particles is None:
+        particles = [str(i) for i in range(1, file_n_particles + 1)]  # type: ignore[operator]
+    if isinstance(particles, int):
+        particles = [str(i) for i in range(1, particles + 1)]
+    if len(particles) != file_n_particles:
+        msg = (
+            f'File "{filename}" contains {file_n_particles}, but you said there'
+            f" were {len(particles)} ({particles})"
+        )
+        raise DataParserError(msg)
+    return particles
 
-    # Try to determine number of particles from file
-    if has_weights:
-        file_n_particles = py_values.index[py_values.isna()][1] - 1
-        if particles is None:
-            particles = [str(i) for i in range(1, file_n_particles + 1)]
-        if isinstance(particles, int):
-            particles = [str(i) for i in range(1, particles + 1)]
-        if len(particles) != file_n_particles:
-            msg = (
-                f'File "{filename}" contains {file_n_particles}, but you said there'
-                f" were {len(particles)} ({particles})"
-            )
-            raise DataParserError(msg)
 
-    # Prepare splitting into particle columns
+def _table_to_frame(
+    table: pd.DataFrame,
+    particles: list[str],
+    has_weights: bool,
+    first_event: int = 0,
+) -> pd.DataFrame:
+    """Convert a table of ASCII rows to a multi-column `~pandas.DataFrame`."""
     first_momentum_row = 0
-    n_rows = len(particles)  # type: ignore[arg-type]
+    n_rows = len(particles)
     if has_weights:
         first_momentum_row = 1
         n_rows += 1
-
-    # Create multi-column pandas.DataFrame
     frame = create_skeleton_frame(
-        particle_names=particles,  # type: ignore[arg-type]
-        number_of_rows=len(full_table) // n_rows,
+        particle_names=particles,
+        number_of_rows=len(table) // n_rows,
     )
-
-    # Convert imported table to the multi-column one
     if has_weights:
-        frame[_WEIGHT_LABEL] = full_table[_MOMENTUM_LABELS[0]][0::n_rows].reset_index(
+        frame[_WEIGHT_LABEL] = table[_MOMENTUM_LABELS[0]][0::n_rows].reset_index(
             drop=True
         )
-    for start_row, p in enumerate(particles, first_momentum_row):  # type: ignore[arg-type]
+    for start_row, p in enumerate(particles, first_momentum_row):
         for mom in _MOMENTUM_LABELS:
-            frame[p, mom] = full_table[mom][start_row::n_rows].reset_index(drop=True)
+            frame[p, mom] = table[mom][start_row::n_rows].reset_index(drop=True)
+    if first_event:
+        frame.index += first_event
+    return frame
+
+
+class AsciiCache:
+    """Binary sidecar cache for parsed ASCII files.
+
+    The events of a parsed file are stored as one :code:`.npy` block of shape
+    :code:`(n_events, 4 * n_particles)`, with an additional last column for the
+    weights, plus a small JSON file with the layout of the events and a fingerprint of
+    the source file. A cached entry is only used if the size, modification time and
+    content hash of the source file still match.
+
+    Whenever an entry is stored, the least recently used entries are removed until the
+    total size of the cache is below :code:`max_size`. Only files that are named after
+    a cache key (40 hexadecimal characters) are considered as entries, so other files
+    in the directory are never removed.
+
+    Args:
+        directory: Directory for the cache files. Defaults to the
+            :code:`PAWIAN_CACHE_DIR` environment variable or :file:`~/.cache/pawian`.
+        max_size: Maximal total size of the cache files in bytes.
+        verify_content: Compare a hash of the content of the source file. If `False`,
+            only its size and modification time are compared, which avoids reading the
+            source file.
+        mmap: Memory-map the cached block instead of reading it into memory. The
+            resulting `~pandas.DataFrame` is then read-only.
+
+    .. code-block:: python
+
+        from pawian.data import AsciiCache, read_ascii
+
+        cache = AsciiCache("/scratch/pawian-cache", max_size=50 * 1024**3)
+        frame = read_ascii("data.dat", cache=cache)  # parses and stores
+        frame = read_ascii("data.dat", cache=cache)  # loads the sidecar
+    """
+
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        max_size: int = 10 * 1024**3,
+        verify_content: bool = True,
+        mmap: bool = False,
+    ) -> None:
+        if directory is None:
+            directory = os.environ.get("PAWIAN_CACHE_DIR", "")
+            directory = directory or Path.home() / ".cache" / "pawian"
+        self.directory = Path(directory)
+        self.max_size = max_size
+        self.verify_content = verify_content
+        self.mmap = mmap
+
+    @property
+    def size(self) -> int:
+        """Total size of the cache files in bytes."""
+        return sum(path.stat().st_size for path in self._get_cache_files())
+
+    def load(
+        self, filename: Path | str, particles: list[str] | int | None = None
+    ) -> pd.DataFrame | None:
+        """Load the cached events of an ASCII file, if they are still valid."""
+        block_path, metadata_path = self._get_paths(filename)
+        try:
+            metadata = json.loads(metadata_path.read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+        fingerprint = _fingerprint_file(filename, hashed=False)
+        if any(metadata.get(key) != value for key, value in fingerprint.items()):
+            return None
+        if self.verify_content and metadata["hash"] != _hash_file(filename):
+            return None
+        has_weights: bool = metadata["has_weights"]
+        n_particles: int = metadata["n_particles"]
+        particles = _resolve_particles(
+            filename, particles, has_weights, n_particles if has_weights else None
+        )
+        if len(particles) != n_particles:
+            return None
+        try:
+            block = np.load(block_path, mmap_mode="r" if self.mmap else None)
+        except FileNotFoundError:
+            return None
+        os.utime(block_path)
+        return _wrap_values(block, particles, has_weights)
+
+    def store(self, filename: Path | str, frame: pd.DataFrame) -> None:
+        """Store the events of an ASCII file and evict old entries if necessary."""
+        particles = frame.pwa.particles
+        columns = [(p, mom) for p in particles for mom in _MOMENTUM_LABELS]
+        block = frame[columns].to_numpy(dtype=np.float64)
+        if frame.pwa.has_weights:
+            block = np.column_stack([block, frame.pwa.weights.to_numpy(np.float64)])
+        metadata = {
+            **_fingerprint_file(filename, hashed=True),
+            "has_weights": frame.pwa.has_weights,
+            "n_particles": len(particles),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        block_path, metadata_path = self._get_paths(filename)
+        with _atomic_open(block_path) as stream:
+            np.save(stream, block)
+        with _atomic_open(metadata_path) as stream:
+            stream.write(json.dumps(metadata).encode())
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits in its size."""
+        entries = []
+        for block_path in self._get_cache_files(".npy"):
+            metadata_path = block_path.with_suffix(".json")
+            paths = [p for p in (block_path, metadata_path) if p.exists()]
+            size = sum(p.stat().st_size for p in paths)
+            entries.append((block_path.stat().st_mtime_ns, size, paths))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, paths in sorted(entries, key=itemgetter(0)):
+            if total_size <= self.max_size:
+                break
+            for path in paths:
+                path.unlink(missing_ok=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for path in self._get_cache_files():
+            path.unlink(missing_ok=True)
+
+    def _get_cache_files(self, *suffixes: str) -> list[Path]:
+        """Get the files of the cache entries, which are named after their key."""
+        suffixes = suffixes or (".npy", ".json")
+        key_pattern = "[0-9a-f]" * 40
+        return [
+            path
+            for suffix in suffixes
+            for path in self.directory.glob(f"{key_pattern}{suffix}")
+        ]
+
+    def _get_paths(self, filename: Path | str) -> tuple[Path, Path]:
+        source = os.path.abspath(filename)
+        key = hashlib.sha1(source.encode(), usedforsecurity=False).hexdigest()
+        return self.directory / f"{key}.npy", self.directory / f"{key}.json"
+
+
+def _fingerprint_file(filename: Path | str, hashed: bool) -> dict[str, Any]:
+    stat = os.stat(filename)
+    fingerprint: dict[str, Any] = {
+        "source": os.path.abspath(filename),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if hashed:
+        fingerprint["hash"] = _hash_file(filename)
+    return fingerprint
+
+
+def _hash_file(filename: Path | str, block_size: int = 2**20) -> str:
+    file_hash = hashlib.blake2b(digest_size=16)
+    with open(filename, "rb") as stream:
+        while block := stream.read(block_size):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+@contextmanager
+def _atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Write to a temporary file that replaces :code:`path` once it is complete."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as stream:
+            yield stream
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def write_binary(
+    filename: Path | str,
+    sample: pd.DataFrame | Iterable[pd.DataFrame],
+    chunk_events: int = 1_000_000,
+) -> None:
+    """Write events to a columnar binary file that can be read with :func:`read_binary`.
+
+    The file starts with the magic bytes :code:`PAWIANB1`, the length of a JSON header
+    as little-endian 64-bit integer, and the JSON header itself. The data starts at the
+    next multiple of 64 bytes and consists of one contiguous little-endian float64
+    array of shape :code:`(n_events, 4)` per particle and an array of the weights, if
+    there are any. The header contains the offset of each of these arrays relative to
+    the start of the data.
+
+    Args:
+        filename: Name of the file to write to.
+        sample: A `~pandas.DataFrame` with a `.PwaAccessor` layout, or a non-empty
+            iterable of those with the same particles. The arrays of an iterable are
+            first collected in temporary files next to :code:`filename`, so that the
+            sample does not have to fit into memory.
+        chunk_events: Number of events that are copied to the file at once.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    filename = Path(filename)
+    if isinstance(sample, pd.DataFrame):
+        particles, has_weights = sample.pwa.particles, sample.pwa.has_weights
+        with _atomic_open(filename) as stream:
+            _write_binary_header(stream, particles, has_weights, len(sample))
+            for columns in _get_binary_column_groups(particles, has_weights):
+                _pad_binary_stream(stream)
+                positions = sample.columns.get_indexer(columns)
+                for block in _iter_blocks(sample, chunk_events):
+                    values = block.iloc[:, positions].to_numpy(dtype="<f8")
+                    stream.write(values.tobytes())
+        return
+    with ExitStack() as stack:
+        spools: list[BinaryIO] = []
+        layout = None
+        n_events = 0
+        for block in _iter_blocks(sample, chunk_events):
+            layout = _check_layout(block, layout)
+            column_groups = _get_binary_column_groups(*layout)
+            if not spools:
+                spools = [
+                    stack.enter_context(TemporaryFile(dir=filename.parent))
+                    for _ in column_groups
+                ]
+            for spool, columns in zip(spools, column_groups):
+                values = block.iloc[:, block.columns.get_indexer(columns)]
+                spool.write(values.to_numpy(dtype="<f8").tobytes())
+            n_events += len(block)
+        if layout is None:
+            msg = "Cannot write a binary file without any frames"
+            raise ValueError(msg)
+        with _atomic_open(filename) as stream:
+            _write_binary_header(stream, *layout, n_events)
+            for spool in spools:
+                _pad_binary_stream(stream)
+                spool.seek(0)
+                shutil.copyfileobj(spool, stream)
+
+
+def _get_binary_column_groups(
+    particles: list[str], has_weights: bool
+) -> list[list[tuple[str, str]]]:
+    column_groups = [[(p, mom) for mom in _MOMENTUM_LABELS] for p in particles]
+    if has_weights:
+        column_groups.append([(_WEIGHT_LABEL, "")])
+    return column_groups
 
+
+def _write_binary_header(
+    stream: BinaryIO, particles: list[str], has_weights: bool, n_events: int
+) -> None:
+    offsets = []
+    offset = 0
+    for columns in _get_binary_column_groups(particles, has_weights):
+        offsets.append(offset)
+        offset = _align_binary_offset(offset + 8 * n_events * len(columns))
+    header = {
+        "n_events": n_events,
+        "particles": particles,
+        "particle_offsets": offsets[: len(particles)],
+        "weight_offset": offsets[-1] if has_weights else None,
+    }
+    header_bytes = json.dumps(header).encode()
+    stream.write(_BINARY_MAGIC)
+    stream.write(len(header_bytes).to_bytes(8, "little"))
+    stream.write(header_bytes)
+
+
+def _pad_binary_stream(stream: BinaryIO) -> None:
+    """Write zeros up to the start of the next array."""
+    position = stream.tell()
+    stream.write(b"\0" * (_align_binary_offset(position) - position))
+
+
+def iter_binary(
+    filename: Path | str,
+    particles: Iterable[str] | None = None,
+    chunk_events: int = 1_000_000,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a binary file in chunks of events.
+
+    .. seealso:: :func:`read_binary`
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    header, _ = _read_binary_header(filename)
+    if particles is not None:
+        particles = list(particles)
+    for start in range(0, header["n_events"], chunk_events):
+        yield read_binary(filename, particles, slice(start, start + chunk_events))
+
+
+def read_binary(
+    filename: Path | str,
+    particles: Iterable[str] | None = None,
+    events: slice | None = None,
+) -> pd.DataFrame:
+    """Read a file that was written with :meth:`.PwaAccessor.write_binary`.
+
+    The file is memory-mapped, so that only the bytes of the selected particles and
+    events are read from disk:
+
+    .. code-block:: python
+
+        frame.pwa.write_binary("events.pawb")
+        pions = read_binary("events.pawb", particles=["pi+"], events=slice(0, 1000))
+
+    Args:
+        filename: The name of the file to read.
+        particles: Names of the particles to read. By default, all particles are read.
+        events: Range of events to read, also with a negative step. The index of
+            the frame contains the event numbers.
+    """
+    header, data_start = _read_binary_header(filename)
+    n_events: int = header["n_events"]
+    offsets = dict(zip(header["particles"], header["particle_offsets"]))
+    if particles is None:
+        particles = header["particles"]
+    particles = list(particles)
+    missing = [particle for particle in particles if particle not in offsets]
+    if missing:
+        msg = f"No particles {missing} in {filename}, only {header['particles']}"
+        raise ValueError(msg)
+    event_range = range(n_events)[events if events is not None else slice(None)]
+    has_weights = header["weight_offset"] is not None
+    n_momenta = len(_MOMENTUM_LABELS)
+    values = np.empty((len(event_range), len(particles) * n_momenta + has_weights))
+    if len(event_range):
+        for i, particle in enumerate(particles):
+            _read_binary_array(
+                filename,
+                offset=data_start + offsets[particle],
+                shape=(n_events, n_momenta),
+                event_range=event_range,
+                out=values[:, i * n_momenta : (i + 1) * n_momenta],
+            )
+        if has_weights:
+            _read_binary_array(
+                filename,
+                offset=data_start + header["weight_offset"],
+                shape=(n_events,),
+                event_range=event_range,
+                out=values[:, -1],
+            )
+    frame = _wrap_values(values, particles, has_weights)
+    frame.index = pd.RangeIndex.from_range(event_range)
     return frame
 
 
+def _read_binary_array(
+    filename: Path | str,
+    offset: int,
+    shape: tuple[int, ...],
+    event_range: range,
+    out: np.ndarray,
+) -> None:
+    """Memory-map an array in a binary file and copy a range of events into out."""
+    if event_range.step < 0:
+        # the stop of a descending range can be -1, which means the end for a slice
+        event_range = event_range[::-1]
+        out = out[::-1]
+    array = np.memmap(filename, dtype="<f8", mode="r", offset=offset, shape=shape)
+    out[...] = array[event_range.start : event_range.stop : event_range.step]
+
+
+def _read_binary_header(filename: Path | str) -> tuple[dict[str, Any], int]:
+    """Read the JSON header of a binary file and the position where the data starts."""
+    with open(filename, "rb") as stream:
+        magic = stream.read(len(_BINARY_MAGIC))
+        if magic != _BINARY_MAGIC:
+            msg = f"{filename} is not a binary event file"
+            raise DataParserError(msg)
+        header_length = int.from_bytes(stream.read(8), "little")
+        header = json.loads(stream.read(header_length))
+        return header, _align_binary_offset(stream.tell())
+
+
+def _align_binary_offset(offset: int) -> int:
+    return -(-offset // _BINARY_ALIGNMENT) * _BINARY_ALIGNMENT
+
+
 def read_pawian_hists(
-    filename: Path | str, type_name: Literal["data", "fitted"] = "data"
+    source: Path | str | ReadOnlyDirectory | TTree,
+    type_name: Literal["data", "fitted"] = "data",
+    workers: int = 1,
 ) -> pd.DataFrame:
     """Read a :file:`pawianHists.root`.
 
-    Import one of the momentum tuple branches of a :file:`pawianHists.root`.
+    Import one of the momentum tuple branches of a :file:`pawianHists.root`. All
+    branches are read with one bulk request, which is faster than reading them one by
+    one, especially for large trees.
 
     Args:
-        filename (str): Path to the file that you want to read.
-        type_name (str): :code:`"data"` or :code:`"fitted"`.
+        source: Path to the file that you want to read, or a file or tree that has
+            already been opened with `uproot.open`. An opened file is not closed.
+        type_name (str): :code:`"data"` or :code:`"fitted"`. Ignored if
+            :code:`source` is a tree.
+        workers: Number of threads that decompress and interpret the branches.
     """
-    # Determine tree name
+    if workers < 1:
+        msg = f"workers has to be positive, but got {workers}"
+        raise ValueError(msg)
+    if isinstance(source, uproot.TTree):
+        return _read_fourvecs_tree(source, workers)
+    tree_name = _get_fourvecs_tree_name(type_name)
+    if isinstance(source, uproot.ReadOnlyDirectory):
+        return _read_fourvecs_tree(source[tree_name], workers)
+    with uproot.open(source) as uproot_file:
+        return _read_fourvecs_tree(uproot_file[tree_name], workers)
+
+
+def iter_pawian_hists(
+    source: Path | str | ReadOnlyDirectory | TTree,
+    type_name: Literal["data", "fitted"] = "data",
+    step_size: int | str = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a momentum tuple branch of a :file:`pawianHists.root` in chunks.
+
+    Only one chunk of events is in memory at a time, so that fit samples that do not
+    fit into memory can still be processed. The chunks have the same layout as the
+    frame returned by :func:`read_pawian_hists`, and the index of a chunk continues
+    where the previous chunk stopped.
+
+    Args:
+        source: See :func:`read_pawian_hists`.
+        type_name: See :func:`read_pawian_hists`.
+        step_size: Number of events per chunk, or a memory size per chunk like
+            :code:`"100 MB"`, see `uproot.TTree.iterate`.
+    """
+    if isinstance(step_size, int) and step_size < 1:
+        msg = f"step_size has to be positive, but got {step_size}"
+        raise ValueError(msg)
+    if isinstance(source, uproot.TTree):
+        yield from _iter_fourvecs_tree(source, step_size)
+        return
+    tree_name = _get_fourvecs_tree_name(type_name)
+    if isinstance(source, uproot.ReadOnlyDirectory):
+        yield from _iter_fourvecs_tree(source[tree_name], step_size)
+        return
+    with uproot.open(source) as uproot_file:
+        yield from _iter_fourvecs_tree(uproot_file[tree_name], step_size)
+
+
+def _get_fourvecs_tree_name(type_name: str) -> str:
     if "dat" in type_name.lower():
         type_name = "data"
     elif "fit" in type_name.lower():
@@ -296,40 +2066,569 @@ def read_pawian_hists(
     else:
         msg = 'Wrong type_name: should be either "data" or "fitted"'
         raise ValueError(msg)
-    tree_name = f"_{type_name}Fourvecs"
+    return f"_{type_name}Fourvecs"
 
-    # Get particle names
-    uproot_file = uproot.open(filename)
-    tree = uproot_file[tree_name]
-    particles = [branch.name for branch in tree if branch.name != _WEIGHT_LABEL]
 
-    # Import tuples as dataframe
-    weights = uproot_file[f"{tree_name}/{_WEIGHT_LABEL}"].array()
-    frame = create_skeleton_frame(
-        particle_names=particles,
-        number_of_rows=len(weights),
+def _read_fourvecs_tree(tree: TTree, workers: int) -> pd.DataFrame:
+    layout = _FourvecsLayout.from_tree(tree)
+    executor = ThreadPoolExecutor(workers) if workers > 1 else None
+    try:
+        arrays = tree.arrays(
+            layout.expressions,
+            decompression_executor=executor,
+            interpretation_executor=executor,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    weights = ak.to_numpy(arrays[_WEIGHT_LABEL])
+    has_weights = len(weights) > 0 and weights.min() != weights.max()
+    return layout.to_frame(arrays, has_weights)
+
+
+def _iter_fourvecs_tree(tree: TTree, step_size: int | str) -> Iterator[pd.DataFrame]:
+    layout = _FourvecsLayout.from_tree(tree)
+    # whether there is a weight column has to be decided for the whole sample, so the
+    # weight branch is scanned first
+    weight_min, weight_max = np.inf, -np.inf
+    for arrays in tree.iterate([_WEIGHT_LABEL], step_size=step_size):
+        weights = ak.to_numpy(arrays[_WEIGHT_LABEL])
+        if len(weights):
+            weight_min = min(weight_min, weights.min())
+            weight_max = max(weight_max, weights.max())
+    has_weights = weight_min < weight_max
+    first_event = 0
+    for arrays in tree.iterate(layout.expressions, step_size=step_size):
+        frame = layout.to_frame(arrays, has_weights, first_event)
+        first_event += len(frame)
+        yield frame
+
+
+class _FourvecsLayout(NamedTuple):
+    particles: list[str]
+    is_split: list[bool]
+
+    @classmethod
+    def from_tree(cls, tree: TTree) -> _FourvecsLayout:
+        particles = [branch.name for branch in tree.branches]
+        particles.remove(_WEIGHT_LABEL)
+        # ROOT 5 splits the TLorentzVector members into sub-branches, ROOT 6 streams
+        # the objects into one branch
+        is_split = [bool(tree[particle].branches) for particle in particles]
+        return cls(particles, is_split)
+
+    @property
+    def expressions(self) -> list[str]:
+        expressions = [_WEIGHT_LABEL]
+        for particle, is_split in zip(self.particles, self.is_split):
+            if is_split:
+                expressions.extend(
+                    f"{particle}/{member}" for member in _SPLIT_FOURVEC_MEMBERS
+                )
+            else:
+                expressions.append(particle)
+        return expressions
+
+    def to_frame(
+        self, arrays: ak.Array, has_weights: bool, first_event: int = 0
+    ) -> pd.DataFrame:
+        weights = ak.to_numpy(arrays[_WEIGHT_LABEL])
+        n_columns = len(self.particles) * len(_MOMENTUM_LABELS) + int(has_weights)
+        values = np.empty((len(weights), n_columns))
+        for i, (particle, is_split) in enumerate(zip(self.particles, self.is_split)):
+            if is_split:
+                members = [arrays[f"{particle}/{m}"] for m in _SPLIT_FOURVEC_MEMBERS]
+            else:
+                vectors = arrays[particle]
+                members = [vectors.fP.fX, vectors.fP.fY, vectors.fP.fZ, vectors.fE]
+            for j, member in enumerate(members):
+                values[:, i * len(_MOMENTUM_LABELS) + j] = ak.to_numpy(member)
+        if has_weights:
+            values[:, -1] = weights
+        return _wrap_values(values, self.particles, has_weights, first_event)
+
+
+def iter_events(
+    filename: Path | str,
+    particles: list[str] | int | None = None,
+    type_name: Literal["data", "fitted"] = "data",
+    chunk_events: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over the events of a file in chunks, whatever its format.
+
+    The format is determined from the file extension: :file:`.root` files are read
+    with :func:`iter_pawian_hists`, :file:`.pawb` files with :func:`iter_binary`, and
+    all other files with :func:`iter_ascii`.
+
+    Args:
+        filename: The name of the file to read.
+        particles: The particles in an ASCII file, see :func:`read_ascii`. Ignored
+            for other formats, which contain the particle names.
+        type_name: The momentum tuple tree of a :file:`pawianHists.root` file, see
+            :func:`read_pawian_hists`.
+        chunk_events: Maximal number of events per chunk.
+    """
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".root":
+        return iter_pawian_hists(filename, type_name, step_size=chunk_events)
+    if suffix == ".pawb":
+        return iter_binary(filename, chunk_events=chunk_events)
+    return iter_ascii(filename, particles, chunk_events)
+
+
+def select(
+    source: Path | str | pd.DataFrame | Iterable[pd.DataFrame],
+    cut: Cut | str,
+    *,
+    particles: list[str] | int | None = None,
+    type_name: Literal["data", "fitted"] = "data",
+    chunk_events: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over the events of a sample that pass a kinematic cut.
+
+    The sample is read and filtered chunk by chunk, so a file that does not fit into
+    memory can be skimmed into a new file in one pass:
+
+    .. code-block:: python
+
+        selected = select("huge.dat.gz", "m(D0, D-) > 3.8", particles=3)
+        write_ascii("skimmed.dat", selected)
+
+    Args:
+        source: A file that can be read with :func:`iter_events`, a
+            `~pandas.DataFrame` with a `.PwaAccessor` layout, or an iterable of those.
+        cut: The cut expression, see :mod:`pawian.cuts`, or a parsed
+            :class:`~pawian.cuts.Cut`.
+        particles: The particles in an ASCII file, see :func:`read_ascii`.
+        type_name: The momentum tuple tree of a :file:`pawianHists.root` file, see
+            :func:`read_pawian_hists`.
+        chunk_events: Maximal number of events that are filtered at once.
+
+    Returns:
+        An iterator with one frame of the selected events of each chunk. These frames
+        can be empty.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    if isinstance(cut, str):
+        cut = Cut(cut)
+    if isinstance(source, (str, Path)):
+        source = iter_events(source, particles, type_name, chunk_events)
+    # not a generator itself, so that an invalid cut raises before iterating
+    return (block.pwa.select(cut) for block in _iter_blocks(source, chunk_events))
+
+
+def unweight(  # noqa: PLR0913
+    source: Path | str | pd.DataFrame | Iterable[pd.DataFrame],
+    seed: int | None = None,
+    max_weight: float | None = None,
+    *,
+    particles: list[str] | int | None = None,
+    type_name: Literal["data", "fitted"] = "data",
+    chunk_events: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Unweight the events of a sample chunk by chunk.
+
+    Uses the same random numbers as :meth:`.PwaAccessor.unweight`, so the accepted
+    events do not depend on the chunk size. Without a :code:`max_weight`, the largest
+    weight of a file is determined in an extra pass over the file:
+
+    .. code-block:: python
+
+        write_ascii("unweighted.dat", unweight("weighted_mc.dat", seed=42))
+
+    Args:
+        source: A file that can be read with :func:`iter_events`, a
+            `~pandas.DataFrame` with a `.PwaAccessor` layout, or an iterable of those.
+        seed: Seed of the random numbers.
+        max_weight: Weight that is accepted with probability one. Required for
+            iterables, because they cannot be read twice.
+        particles: The particles in an ASCII file, see :func:`read_ascii`.
+        type_name: The momentum tuple tree of a :file:`pawianHists.root` file, see
+            :func:`read_pawian_hists`.
+        chunk_events: Maximal number of events that are unweighted at once.
+
+    Returns:
+        An iterator with one frame of accepted events per chunk, without the weight
+        column.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    key = _get_random_key(seed)
+    if max_weight is None:
+        if isinstance(source, (str, Path)):
+            max_weight = _find_max_weight(
+                iter_events(source, particles, type_name, chunk_events)
+            )
+        elif isinstance(source, pd.DataFrame):
+            max_weight = _find_max_weight([source])
+        else:
+            msg = "Unweighting an iterable of frames requires a max_weight"
+            raise TypeError(msg)
+    if isinstance(source, (str, Path)):
+        source = iter_events(source, particles, type_name, chunk_events)
+    return (
+        _unweight_block(block, key, max_weight)
+        for block in _iter_blocks(source, chunk_events)
+    )
+
+
+def downsample(  # noqa: PLR0913
+    source: Path | str | pd.DataFrame | Iterable[pd.DataFrame],
+    size: float,
+    seed: int | None = None,
+    *,
+    particles: list[str] | int | None = None,
+    type_name: Literal["data", "fitted"] = "data",
+    chunk_events: int = 100_000,
+) -> Iterator[pd.DataFrame]:
+    """Randomly select a number or a fraction of the events of a sample.
+
+    Uses the same random numbers as :meth:`.PwaAccessor.downsample`, so the selected
+    events do not depend on the chunk size. A fraction is selected in one pass. For a
+    number of events, a file is read twice: first to find the events with the smallest
+    random numbers and then to select those.
+
+    Args:
+        source: A file that can be read with :func:`iter_events`, a
+            `~pandas.DataFrame` with a `.PwaAccessor` layout, or an iterable of those.
+        size: Number of events to select, if an `int`, or the probability to keep each
+            event, if a `float` between 0 and 1. A number of events is only supported
+            for files and frames, because iterables cannot be read twice.
+        seed: Seed of the random numbers.
+        particles: The particles in an ASCII file, see :func:`read_ascii`.
+        type_name: The momentum tuple tree of a :file:`pawianHists.root` file, see
+            :func:`read_pawian_hists`.
+        chunk_events: Maximal number of events that are processed at once.
+
+    Returns:
+        An iterator with one frame of selected events per chunk.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    key = _get_random_key(seed)
+    frames = source
+
+    def iter_indices() -> Iterator[pd.Index]:
+        if isinstance(frames, pd.DataFrame):
+            yield frames.index
+        elif isinstance(frames, (str, Path)):
+            for frame in iter_events(frames, particles, type_name, chunk_events):
+                yield frame.index
+        else:
+            msg = "Selecting a number of events from an iterable requires a fraction"
+            raise TypeError(msg)
+
+    threshold = _get_downsample_threshold(size, key, iter_indices)
+    if isinstance(source, (str, Path)):
+        source = iter_events(source, particles, type_name, chunk_events)
+    return (
+        _downsample_block(block, key, threshold)
+        for block in _iter_blocks(source, chunk_events)
+    )
+
+
+def _find_max_weight(frames: Iterable[pd.DataFrame]) -> float:
+    return max(
+        (float(f.pwa.weights.max()) for f in frames if f.pwa.has_weights and len(f)),
+        default=1.0,
+    )
+
+
+def _get_random_key(seed: int | None) -> np.uint64:
+    return np.random.SeedSequence(seed).generate_state(1, np.uint64)[0]
+
+
+def _get_event_uniforms(index: pd.Index, key: np.uint64) -> np.ndarray:
+    """Get a uniform random number in [0, 1) for each event number in an index.
+
+    The numbers are the outputs of the SplitMix64 generator at the positions given by
+    the event numbers. This makes them independent of how a sample is chunked.
+    """
+    if not pd.api.types.is_integer_dtype(index.dtype):
+        msg = (
+            "Random selections need event numbers in the index of the frame, but got"
+            f" an index of type {index.dtype}"
+        )
+        raise ValueError(msg)
+    if not index.is_unique:
+        # equal event numbers would get equal random numbers
+        msg = (
+            "Random selections need unique event numbers in the index of the frame,"
+            " for instance concatenate frames with ignore_index=True"
+        )
+        raise ValueError(msg)
+    state = index.to_numpy().astype(np.uint64)
+    state += np.uint64(1)
+    state *= np.uint64(0x9E3779B97F4A7C15)
+    state += key
+    state ^= state >> np.uint64(30)
+    state *= np.uint64(0xBF58476D1CE4E5B9)
+    state ^= state >> np.uint64(27)
+    state *= np.uint64(0x94D049BB133111EB)
+    state ^= state >> np.uint64(31)
+    state >>= np.uint64(11)
+    return state * 2.0**-53
+
+
+def _unweight_block(
+    frame: pd.DataFrame, key: np.uint64, max_weight: float
+) -> pd.DataFrame:
+    if not frame.pwa.has_weights:
+        return frame
+    weights = frame.pwa.weights.to_numpy(dtype=np.float64)
+    if len(weights) and (weights.min() < 0 or weights.max() > max_weight):
+        msg = (
+            f"Cannot unweight weights outside [0, {max_weight}], but got weights"
+            f" between {weights.min()} and {weights.max()}"
+        )
+        raise ValueError(msg)
+    is_accepted = _get_event_uniforms(frame.index, key) * max_weight < weights
+    return frame[is_accepted].drop(columns=_WEIGHT_LABEL, level=0)
+
+
+def _get_downsample_threshold(
+    size: float, key: np.uint64, iter_indices: Callable[[], Iterable[pd.Index]]
+) -> tuple[float, int]:
+    """Determine the largest random number and event number that are selected.
+
+    For a number of events, these are the ones with the smallest random numbers,
+    with ties broken by event number.
+    """
+    # bool is a subclass of int, but True is no number of events
+    is_count = isinstance(size, (int, np.integer)) and not isinstance(size, bool)
+    if is_count and size >= 0:
+        return _find_smallest_uniform(int(size), key, iter_indices())
+    if isinstance(size, float) and 0 <= size <= 1:
+        return size, -1
+    msg = (
+        "Size should be a non-negative number of events or a fraction between 0 and"
+        f" 1, but got {size!r}"
+    )
+    raise ValueError(msg)
+
+
+def _find_smallest_uniform(
+    n_events: int, key: np.uint64, indices: Iterable[pd.Index]
+) -> tuple[float, int]:
+    if n_events == 0:
+        return -1.0, -1
+    uniforms = np.empty(0)
+    event_numbers = np.empty(0, dtype=np.int64)
+    n_total = 0
+    for index in indices:
+        n_total += len(index)
+        uniforms = np.concatenate([uniforms, _get_event_uniforms(index, key)])
+        event_numbers = np.concatenate([event_numbers, index.to_numpy(np.int64)])
+        # only keep candidates, but prune rarely to not partition over and over
+        if len(uniforms) > 2 * max(n_events, len(index)):
+            is_candidate = uniforms <= _get_nth_smallest(uniforms, n_events)
+            uniforms = uniforms[is_candidate]
+            event_numbers = event_numbers[is_candidate]
+    if n_total <= n_events:
+        return 1.0, -1
+    max_uniform = _get_nth_smallest(uniforms, n_events)
+    n_smaller = int(np.count_nonzero(uniforms < max_uniform))
+    tied_event_numbers = event_numbers[uniforms == max_uniform]
+    max_event_number = _get_nth_smallest(tied_event_numbers, n_events - n_smaller)
+    return float(max_uniform), int(max_event_number)
+
+
+def _get_nth_smallest(values: np.ndarray, n: int) -> Any:
+    return np.partition(values, n - 1)[n - 1]
+
+
+def _downsample_block(
+    frame: pd.DataFrame, key: np.uint64, threshold: tuple[float, int]
+) -> pd.DataFrame:
+    max_uniform, max_event_number = threshold
+    uniforms = _get_event_uniforms(frame.index, key)
+    is_selected = uniforms < max_uniform
+    if max_event_number >= 0:
+        is_selected |= (uniforms == max_uniform) & (
+            frame.index.to_numpy() <= max_event_number
+        )
+    return frame[is_selected]
+
+
+class SampleSummary(NamedTuple):
+    """Summary statistics of an event sample, see :func:`summarize`."""
+
+    n_events: int
+    sum_weights: float
+    """Sum of the weights, which equals :attr:`n_events` if there are no weights."""
+    sum_weights2: float
+    """Sum of the squared weights."""
+    kinematics: pd.DataFrame
+    """Weighted :code:`mean` and :code:`rms` and the :code:`min` and :code:`max` of
+    the energy :code:`E`, momentum :code:`p`, and mass :code:`m` of each particle.
+    The RMS is the standard deviation, like :code:`TH1::GetRMS` in ROOT."""
+
+    @property
+    def effective_size(self) -> float:
+        r"""Effective sample size :math:`\left(\sum w\right)^2 / \sum w^2`."""
+        if self.sum_weights2 == 0:
+            return 0.0
+        return self.sum_weights**2 / self.sum_weights2
+
+
+def summarize(
+    source: Path | str | pd.DataFrame | Iterable[pd.DataFrame],
+    particles: list[str] | int | None = None,
+    type_name: Literal["data", "fitted"] = "data",
+    chunk_events: int = 100_000,
+    workers: int = 1,
+) -> SampleSummary:
+    """Compute summary statistics of an event sample in one pass.
+
+    The sample is processed chunk by chunk, so it does not have to fit into memory.
+    The means and variances of the chunks are merged with the pairwise update of Chan
+    et al., which is numerically stable also for large samples. For a given chunk
+    size, the result does not depend on the number of workers:
+
+    .. code-block:: python
+
+        summary = summarize("fit_sample.dat.gz", workers=4)
+        print(summary.n_events, summary.effective_size)
+        print(summary.kinematics)
+
+    Masses of events with a negative squared mass are negative, like
+    :code:`TLorentzVector::M` in ROOT.
+
+    Args:
+        source: A file that can be read with :func:`iter_events`, a
+            `~pandas.DataFrame` with a `.PwaAccessor` layout, or an iterable of those.
+        particles: The particles in an ASCII file, see :func:`read_ascii`.
+        type_name: The momentum tuple tree of a :file:`pawianHists.root` file, see
+            :func:`read_pawian_hists`.
+        chunk_events: Number of events that are summarized at once. The frames of an
+            iterable are split into chunks of at most this size.
+        workers: Number of threads that summarize chunks in parallel.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    if workers < 1:
+        msg = f"workers has to be positive, but got {workers}"
+        raise ValueError(msg)
+    if isinstance(source, (str, Path)):
+        source = iter_events(source, particles, type_name, chunk_events)
+    blocks = _iter_blocks(source, chunk_events)
+    total: _PartialSummary | None = None
+    if workers == 1:
+        for block in blocks:
+            total = _merge_summaries(total, _summarize_block(block))
+    else:
+        with ThreadPoolExecutor(workers) as executor:
+            # limit the number of chunks in memory and merge in the order of the chunks
+            pending: deque[Future[_PartialSummary]] = deque()
+            for block in blocks:
+                pending.append(executor.submit(_summarize_block, block))
+                if len(pending) > 2 * workers:
+                    total = _merge_summaries(total, pending.popleft().result())
+            for future in pending:
+                total = _merge_summaries(total, future.result())
+    if total is None:
+        msg = "Cannot summarize a sample without any frames"
+        raise ValueError(msg)
+    return total.finalize()
+
+
+class _PartialSummary(NamedTuple):
+    particles: list[str]
+    has_weights: bool
+    n_events: int
+    sum_weights: float
+    sum_weights2: float
+    mean: np.ndarray
+    """Weighted means of the quantities, ordered by particle and then quantity."""
+    m2: np.ndarray
+    """Weighted sums of squared differences from the means."""
+    min: np.ndarray
+    max: np.ndarray
+
+    def finalize(self) -> SampleSummary:
+        index = pd.MultiIndex.from_product([self.particles, _SUMMARY_QUANTITIES])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rms = np.sqrt(self.m2 / self.sum_weights)
+        kinematics = pd.DataFrame(
+            {"mean": self.mean, "rms": rms, "min": self.min, "max": self.max},
+            index=index,
+        )
+        return SampleSummary(
+            self.n_events, self.sum_weights, self.sum_weights2, kinematics
+        )
+
+
+def _summarize_block(frame: pd.DataFrame) -> _PartialSummary:
+    sample = EventSample.from_frame(frame)
+    mass2 = sample.mass2
+    values = np.stack(
+        [sample.energy, sample.rho, np.sign(mass2) * np.sqrt(np.abs(mass2))], axis=-1
+    ).reshape(len(sample), -1)
+    weights = sample.weights
+    if weights is None:
+        weights = np.ones(len(sample))
+    sum_weights = float(weights.sum())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = weights @ values / sum_weights
+    m2 = weights @ (values - mean) ** 2
+    if len(sample):
+        minimum, maximum = values.min(axis=0), values.max(axis=0)
+    else:
+        minimum = np.full(values.shape[1], np.inf)
+        maximum = np.full(values.shape[1], -np.inf)
+    return _PartialSummary(
+        sample.particles,
+        sample.has_weights,
+        len(sample),
+        sum_weights,
+        float(weights @ weights),
+        mean,
+        m2,
+        minimum,
+        maximum,
+    )
+
+
+def _merge_summaries(
+    first: _PartialSummary | None, second: _PartialSummary
+) -> _PartialSummary:
+    if first is None:
+        return second
+    first_layout = first.particles, first.has_weights
+    second_layout = second.particles, second.has_weights
+    if first_layout != second_layout:
+        # weighted and unweighted moments cannot be combined meaningfully
+        msg = (
+            "All frames should have the same particles and weights, but got"
+            f" {second_layout} after {first_layout}"
+        )
+        raise ValueError(msg)
+    if second.n_events == 0:
+        return first
+    if first.n_events == 0:
+        return second
+    sum_weights = first.sum_weights + second.sum_weights
+    delta = second.mean - first.mean
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = first.mean + delta * (second.sum_weights / sum_weights)
+        m2 = (
+            first.m2
+            + second.m2
+            + delta**2 * (first.sum_weights * second.sum_weights / sum_weights)
+        )
+    return _PartialSummary(
+        first.particles,
+        first.has_weights,
+        first.n_events + second.n_events,
+        sum_weights,
+        first.sum_weights2 + second.sum_weights2,
+        mean,
+        m2,
+        np.minimum(first.min, second.min),
+        np.maximum(first.max, second.max),
     )
-    if ak.max(weights) != ak.min(weights):
-        frame[_WEIGHT_LABEL] = weights
-    try:  # ROOT >= 6
-        for particle in particles:
-            vectors = uproot_file[f"{tree_name}/{particle}"].array()
-            frame[particle, _MOMENTUM_LABELS[0]] = vectors.fP.fX
-            frame[particle, _MOMENTUM_LABELS[1]] = vectors.fP.fY
-            frame[particle, _MOMENTUM_LABELS[2]] = vectors.fP.fZ
-            frame[particle, _MOMENTUM_LABELS[3]] = vectors.fE
-    except (KeyError, KeyInFileError):  # ROOT <= 5
-        for particle in particles:
-            frame[particle, _MOMENTUM_LABELS[0]] = uproot_file[
-                f"{tree_name}/{particle}/fP/fP.fX"
-            ].array()
-            frame[particle, _MOMENTUM_LABELS[1]] = uproot_file[
-                f"{tree_name}/{particle}/fP/fP.fY"
-            ].array()
-            frame[particle, _MOMENTUM_LABELS[2]] = uproot_file[
-                f"{tree_name}/{particle}/fP/fP.fZ"
-            ].array()
-            frame[particle, _MOMENTUM_LABELS[3]] = uproot_file[
-                f"{tree_name}/{particle}/fE"
-            ].array()
-    return frame
@@ -0,0 +1,162 @@
+"""Fill many histograms from event samples in one pass.
+
+Comparing a fit to data usually requires dozens of weighted histograms of masses,
+angles, and momenta per sample. Calling `numpy.histogram` for each of those scans the
+data over and over. The :func:`fill_many` function instead goes through the events
+block by block and fills all histograms from each block, so that each block is read
+only once and memory usage does not grow with the size of a streamed sample.
+"""
+
+from __future__ import annotations
+
+from itertools import accumulate
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping
+
+    from numpy.typing import ArrayLike
+
+
+class HistogramSpec(NamedTuple):
+    """Definition of a histogram with equally sized bins.
+
+    Like ROOT's :code:`TH1`, the bins include their lower edge and exclude their upper
+    edge, and values outside the :code:`range` are ignored.
+    """
+
+    variable: Callable[[pd.DataFrame], ArrayLike]
+    """Function that computes the values to bin from a block of events."""
+    bins: int
+    """Number of bins."""
+    range: tuple[float, float]
+    """Lower edge of the first bin and upper edge of the last bin."""
+
+
+def fill_many(
+    sample: pd.DataFrame | Iterable[pd.DataFrame],
+    specs: Mapping[str, HistogramSpec | tuple],
+    chunk_events: int = 100_000,
+) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    """Fill several histograms in one pass over a sample of events.
+
+    You can for instance histogram a mass and an energy like so:
+
+    .. code-block:: python
+
+        from pawian.data import read_ascii
+        from pawian.hist import HistogramSpec, fill_many
+
+        frame = read_ascii(FILENAME, particles=["pi+", "D0", "D-"])
+        hists = fill_many(
+            frame,
+            specs={
+                "pipD0": (lambda f: f.pwa.invariant_mass(["pi+", "D0"]), 100, (2, 2.3)),
+                "E_pip": HistogramSpec(lambda f: f["pi+", "E"], 50, (0.1, 0.6)),
+            },
+        )
+        edges, values = hists["pipD0"]
+
+    Args:
+        sample: A `~pandas.DataFrame` with a `.PwaAccessor` layout, or an iterable
+            of those, such as the ones created by :func:`.iter_ascii` and
+            :func:`.iter_pawian_hists`. If the frames contain weights, these are used
+            as histogram weights.
+        specs: Mapping of names to histogram definitions. A definition is a
+            :class:`HistogramSpec` or a tuple of the same form.
+        chunk_events: Number of events of an in-memory sample that are processed at
+            once.
+
+    Returns:
+        A `dict` with, for each name in :code:`specs`, an array of lower bin edges
+        and an array of bin contents, like
+        :meth:`.PawianHists.get_histogram_content`.
+    """
+    if chunk_events < 1:
+        msg = f"chunk_events has to be positive, but got {chunk_events}"
+        raise ValueError(msg)
+    histograms = {name: HistogramSpec(*spec) for name, spec in specs.items()}
+    for name, spec in histograms.items():
+        low, high = spec.range
+        if spec.bins < 1 or not low < high:
+            msg = (
+                f'Histogram "{name}" should have a positive number of bins and an'
+                f" increasing range, but got {spec.bins} bins and range {spec.range}"
+            )
+            raise ValueError(msg)
+    offsets = [0, *accumulate(spec.bins for spec in histograms.values())]
+    n_bins = offsets[-1]
+    values = np.zeros(n_bins)
+    for frame in _iter_frames(sample, chunk_events):
+        if len(frame) == 0:
+            continue
+        bin_indices = np.empty((len(histograms), len(frame)), dtype=np.intp)
+        for row, offset, spec in zip(bin_indices, offsets, histograms.values()):
+            _compute_bin_indices(spec, frame, offset, overflow=n_bins, out=row)
+        weights = None
+        if frame.pwa.has_weights:
+            weights = np.tile(
+                frame.pwa.weights.to_numpy(dtype=np.float64), len(histograms)
+            )
+        # values outside the ranges are all put in an extra bin that is dropped
+        values += np.bincount(
+            bin_indices.ravel(), weights=weights, minlength=n_bins + 1
+        )[:n_bins]
+    return {
+        name: (
+            np.linspace(*spec.range, num=spec.bins + 1)[:-1],
+            values[start:stop],
+        )
+        for (name, spec), start, stop in zip(
+            histograms.items(), offsets[:-1], offsets[1:]
+        )
+    }
+
+
+def _iter_frames(
+    sample: pd.DataFrame | Iterable[pd.DataFrame], chunk_events: int
+) -> Iterator[pd.DataFrame]:
+    if isinstance(sample, pd.DataFrame):
+        for start in range(0, len(sample), chunk_events):
+            yield sample.iloc[start : start + chunk_events]
+    else:
+        yield from sample
+
+
+def _compute_bin_indices(
+    spec: HistogramSpec,
+    frame: pd.DataFrame,
+    offset: int,
+    overflow: int,
+    out: np.ndarray,
+) -> np.ndarray:
+    """Compute bin indices like ROOT's :code:`TAxis::FindBin`, but starting at 0.
+
+    The :code:`offset` is added to the indices and values outside the range, as
+    well as NaN, get index :code:`overflow`.
+    """
+    values = np.asarray(spec.variable(frame), dtype=np.float64)
+    if values.shape != (len(frame),):
+        msg = (
+            "Histogram variable should give one value per event, so shape"
+            f" {(len(frame),)}, but got {values.shape}"
+        )
+        raise ValueError(msg)
+    low, high = spec.range
+    is_inside = (values >= low) & (values < high)
+    inside = values[is_inside]
+    # positions are non-negative, so truncation to integers equals rounding down
+    indices = (spec.bins * (inside - low) / (high - low)).astype(np.intp)
+    # rounding can push values just below the upper edge to position bins
+    np.minimum(indices, spec.bins - 1, out=indices)
+    # move values to the bin that contains them according to the edges, like
+    # numpy.histogram, in case rounding put them in a neighboring bin
+    edges = np.linspace(low, high, spec.bins + 1)
+    indices -= inside < edges[indices]
+    indices += (inside >= edges[indices + 1]) & (indices < spec.bins - 1)
+    out[:] = overflow
+    out[is_inside] = indices + offset
+    return out
@@ -8,24 +8,29 @@ from __future__ import annotations
 
 import logging
 import re  # regex
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from math import ceil, sqrt
-from typing import TYPE_CHECKING, Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple
 
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
 import uproot
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
 from uproot.behaviors.TH1 import TH1
+from uproot.behaviors.TProfile import TProfile
 
 from pawian.data import read_pawian_hists
 from pawian.latex import convert
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Iterable
 
-    import numpy as np
-    import pandas as pd
     from matplotlib.axes import Axes
     from matplotlib.container import BarContainer
-    from matplotlib.figure import Figure
+    from typing_extensions import Self
     from uproot.behaviors.TAxis import TAxis
     from uproot.behaviors.TH2 import TH2
     from uproot.behaviors.TH3 import TH3
@@ -35,32 +40,80 @@ _LOGGER = logging.getLogger(__name__)
 _LOGGER.info("Foobar")
 
 
+_VARIANT_PREFIXES = {"Data": "data", "Fit": "fit", "MC": "mc", "Mc": "mc"}
+_COMPARISON_METRICS = {"chi2": "chi2_ndf", "ks": "ks", "pull": "max_pull"}
+
+
+class CatalogueEntry(NamedTuple):
+    """Entry of :attr:`PawianHists.catalogue`."""
+
+    ndim: int
+    """Dimension of the histograms."""
+    variants: dict[str, str]
+    """Histogram names per variant :code:`"data"`, :code:`"fit"`, or :code:`"mc"`,
+    in the order in which they appear in the file."""
+
+
 class PawianHists:
     """Data container for a :file:`pawianHists.root` file.
 
     Data container for a :file:`pawianHists.root` file that is created by the QA step in
-    Pawian.
+    Pawian. The file stays open, so that histograms and the :attr:`data` and
+    :attr:`fit` samples are read only once they are needed. Use :meth:`close` or a
+    :code:`with` statement to close the file again:
+
+    .. code-block:: python
+
+        with PawianHists(FILENAME) as hist_file:
+            hist_file.draw_histogram(HISTOGRAM_NAME)
     """
 
     def __init__(self, filename: Path | str) -> None:
         self.import_file(filename)
 
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
     def import_file(self, filename: Path | str) -> None:
-        """Set data member by importing a :file:`pawianHists.root` file."""
+        """Set data member by importing a :file:`pawianHists.root` file.
+
+        Only the directory of the file is read. The :attr:`data` and :attr:`fit`
+        samples are read on first access, or with :meth:`load`.
+        """
+        if getattr(self, "_PawianHists__file", None) is not None:
+            self.close()
         self.__file: ReadOnlyDirectory = uproot.open(filename)
-        self.__data = read_pawian_hists(filename, type_name="data")
-        self.__fit = read_pawian_hists(filename, type_name="fitted")
+        self.__data: pd.DataFrame | None = None
+        self.__fit: pd.DataFrame | None = None
+        self.__histogram_dimensions = _get_histogram_dimensions(self.__file)
+        self.__catalogue = _create_catalogue(self.__histogram_dimensions)
+
+    def load(self) -> None:
+        """Read the :attr:`data` and :attr:`fit` samples if not yet done."""
+        _ = self.data, self.fit
+
+    def close(self) -> None:
+        """Close the file.
 
-    def get_uproot_histogram(self, name: str) -> TH1 | TH2 | TH3 | None:
+        Samples that have already been loaded remain available, so call
+        :meth:`load` first if you need them after closing the file.
+        """
+        self.__file.close()
+
+    def get_uproot_histogram(self, name: str) -> TH1 | TH2 | TH3 | TProfile | None:
         """Get a histogram from a :file:`pawianHists.root` file.
 
-        Get an `uproot` histogram from the :file:`pawianHists.root` file.
+        Get an `uproot` histogram from the :file:`pawianHists.root` file. Profile
+        histograms (:code:`TProfile`) are returned as well. Their values are the means
+        of the bins.
         """
-        try:
-            obj = self.__file[name]
-        except KeyError:
+        if self.__histogram_dimensions.get(name) != 1:
             return None
-        if isinstance(obj, TH1):
+        obj = self.__file[name]
+        if isinstance(obj, (TH1, TProfile)):
             return obj
         return None
 
@@ -100,7 +153,7 @@ class PawianHists:
 
             kwargs: See `matplotlib.pyplot.hist` arguments
         """
-        if name not in self.histogram_names:
+        if self.__histogram_dimensions.get(name) != 1:
             msg = f'Histogram "{name}" does not exist'
             raise KeyError(msg)
         hist_content = self.get_histogram_content(name)
@@ -135,28 +188,18 @@ class PawianHists:
             mc: Whether to draw the Monte Carlo histogram.
             kwargs: Arguments that are passed to :func:`draw_histogram`.
         """
-        if name not in self.unique_histogram_names:
+        entry = self.__catalogue.get(name)
+        if entry is None or entry.ndim != 1 or "data" not in entry.variants:
             msg = f'Histogram of type "{name}" does not exist'
             raise KeyError(msg)
-        # Construct regular expression
-        re_match_list = []
-        if data:
-            re_match_list.append("Data")
-        if fit:
-            re_match_list.append("Fit")
-        if mc:
-            re_match_list.extend(("MC", "Mc"))
-        re_match = "|".join(re_match_list)
-        re_match = f"({re_match}){name}"
-        # Makes selection of names plus corresponding labels
-        names = [k for k in self.histogram_names if re.fullmatch(re_match, k)]
-        matches = [re.match(re_match, k) for k in names]
-        labels = [match[1].lower() for match in matches if match is not None]
-        # Create histograms
+        selected = {"data": data, "fit": fit, "mc": mc}
         hists = {}
-        for hist_name, label in zip(names, labels):
-            histogram = self.draw_histogram(hist_name, plot_on, label=label, **kwargs)
-            hists[label] = histogram
+        for label, hist_name in entry.variants.items():
+            if selected[label]:
+                histogram = self.draw_histogram(
+                    hist_name, plot_on, label=label, **kwargs
+                )
+                hists[label] = histogram
         return hists
 
     def draw_all_histograms(
@@ -182,15 +225,136 @@ class PawianHists:
             if legend:
                 sub.legend()
 
+    def export_all(
+        self,
+        outdir: Path | str,
+        fmt: str = "png",
+        workers: int | None = None,
+        pdf: Path | str | None = None,
+    ) -> list[Path]:
+        """Render each combined histogram to its own file.
+
+        In contrast to :meth:`draw_all_histograms`, each histogram gets its own figure
+        and the bin contents are drawn as they are with `~matplotlib.axes.Axes.stairs`.
+        The histograms are read from the file first and are then rendered in a pool of
+        processes:
+
+        .. code-block:: python
+
+            with PawianHists(FILENAME) as hist_file:
+                hist_file.export_all("plots", fmt="svg", workers=8, pdf="plots.pdf")
+
+        Args:
+            outdir: Directory to which the files are written. It is created if it does
+                not exist. Each file is named after the histogram name without the
+                prepended :code:`Data`, :code:`Fit`, or :code:`MC/Mc`.
+            fmt: File format, such as :code:`"png"`, :code:`"svg"`, or
+                :code:`"pdf"`.
+            workers: Number of processes used for rendering. If `None`, the number of
+                CPUs is used, and if :code:`1`, the files are rendered in the current
+                process.
+            pdf: If given, write all histograms to this multi-page PDF file as well.
+                These pages are rendered in the current process.
+
+        Returns:
+            The paths of the files that were written for each histogram, in the order
+            of :attr:`unique_histogram_names`.
+        """
+        if workers is not None and workers < 1:
+            msg = f"workers has to be positive, but got {workers}"
+            raise ValueError(msg)
+        outdir = Path(outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        names = self.unique_histogram_names
+        contents = [self.__get_combined_content(name) for name in names]
+        filenames = [outdir / f"{name}.{fmt}" for name in names]
+        if workers == 1:
+            for name, content, filename in zip(names, contents, filenames):
+                _export_combined_histogram(name, content, filename)
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                list(
+                    executor.map(_export_combined_histogram, names, contents, filenames)
+                )
+        if pdf is not None:
+            with PdfPages(pdf) as pages:
+                for name, content in zip(names, contents):
+                    pages.savefig(_create_combined_figure(name, content))
+        return filenames
+
+    def __get_combined_content(
+        self, name: str
+    ) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Get the bin contents and all bin edges of each variant of a histogram."""
+        content = {}
+        for label, hist_name in self.__catalogue[name].variants.items():
+            histogram = self.get_uproot_histogram(hist_name)
+            if histogram is not None:
+                content[label] = histogram.values(), histogram.axes[0].edges()
+        return content
+
+    def compare(
+        self,
+        metric: Literal["chi2", "ks", "pull"] = "chi2",
+        reference: Literal["fit", "mc"] = "fit",
+    ) -> pd.DataFrame:
+        r"""Rank all histograms by how badly the data agree with the fit or MC.
+
+        Each 1-dimensional data histogram is paired with its :code:`reference`
+        counterpart from :attr:`catalogue`. The reference is scaled to the integral of
+        the data, so that only the shapes are compared. Profile histograms contain
+        mean values instead of counts, so their reference is not scaled. The
+        statistics of all histograms are computed at once on their concatenated bins:
+
+        - :code:`chi2`: Sum of the squared pulls of the bins, where the pull of a bin
+          is the difference of the contents divided by the square root of the sum of
+          their variances. Bins without variance are skipped.
+        - :code:`ndf` and :code:`chi2_ndf`: Number of bins that contribute to the
+          :math:`\chi^2`, and the :math:`\chi^2` divided by that number.
+        - :code:`ks`: Largest difference between the cumulative distributions, like
+          the Kolmogorov-Smirnov statistic.
+        - :code:`max_pull`: Largest absolute pull of a bin.
+
+        Args:
+            metric: The statistic by which the table is sorted, worst agreement first:
+                :code:`"chi2"` sorts by :code:`chi2_ndf`, :code:`"ks"` by
+                :code:`ks`, and :code:`"pull"` by :code:`max_pull`.
+            reference: Compare the data to the :code:`"fit"` or :code:`"mc"`
+                histograms.
+
+        Returns:
+            A `~pandas.DataFrame` with one row per name of :attr:`catalogue`.
+        """
+        if metric not in _COMPARISON_METRICS:
+            msg = f"metric should be one of {sorted(_COMPARISON_METRICS)}, not {metric}"
+            raise ValueError(msg)
+        names = []
+        data = []
+        references = []
+        normalize = []
+        for name, entry in self.__catalogue.items():
+            if entry.ndim != 1 or not {"data", reference} <= entry.variants.keys():
+                continue
+            data_hist = self.get_uproot_histogram(entry.variants["data"])
+            reference_hist = self.get_uproot_histogram(entry.variants[reference])
+            if data_hist is None or reference_hist is None:
+                continue
+            if not np.array_equal(
+                data_hist.axes[0].edges(), reference_hist.axes[0].edges()
+            ):
+                msg = f'Data and {reference} histograms of "{name}" have different bins'
+                raise ValueError(msg)
+            names.append(name)
+            data.append((data_hist.values(), data_hist.variances()))
+            references.append((reference_hist.values(), reference_hist.variances()))
+            normalize.append(not isinstance(data_hist, TProfile))
+        table = _compare_histograms(names, data, references, normalize)
+        return table.sort_values(_COMPARISON_METRICS[metric], ascending=False)
+
     @property
     def histogram_names(self) -> list[str]:
         """Get a list of all histogram names in a :file:`pawianHists.root` file."""
-        names = []
-        for name in self.__file:
-            obj = self.__file[name]
-            if isinstance(obj, TH1):
-                names.append(obj.name)
-        return names
+        return [name for name, ndim in self.__histogram_dimensions.items() if ndim == 1]
 
     @property
     def unique_histogram_names(self) -> list[str]:
@@ -199,15 +363,23 @@ class PawianHists:
         Get a list of histograms in the :file:`pawianHists.root` file of which the
         keywords :code:`Data`, :code:`MC`, or :code:`Fit` have been removed.
         """
-        names = []
-        for name in self.__file:
-            obj = self.__file[name]
-            if isinstance(obj, TH1):
-                hist_name = obj.name
-                if hist_name.startswith("Data"):
-                    hist_name = hist_name[4:]
-                    names.append(hist_name)
-        return names
+        return [
+            name[len("Data") :]
+            for name in self.histogram_names
+            if name.startswith("Data")
+        ]
+
+    @property
+    def catalogue(self) -> dict[str, CatalogueEntry]:
+        """Get the histograms in the file, grouped by their unique name.
+
+        The catalogue is created once when the file is opened, from the class names
+        in the directory of the file, so without reading any histogram. It maps each
+        unique histogram name, see :attr:`unique_histogram_names`, to the names of
+        its :code:`Data`, :code:`Fit`, and :code:`MC` or :code:`Mc` variants.
+        Histograms of all dimensions are included.
+        """
+        return self.__catalogue
 
     @property
     def particles(self) -> list[str]:
@@ -224,6 +396,8 @@ class PawianHists:
         .. seealso::
             :func:`fit <pawian.qa.PawianHists.fit>`
         """
+        if self.__data is None:
+            self.__data = read_pawian_hists(self.__file, type_name="data")
         return self.__data
 
     @property
@@ -235,4 +409,292 @@ class PawianHists:
 
         .. seealso:: :func:`pawian.qa.PawianHists.data`.
         """
+        if self.__fit is None:
+            self.__fit = read_pawian_hists(self.__file, type_name="fitted")
         return self.__fit
+
+
+class HistogramBands(NamedTuple):
+    """Per-bin statistics of a histogram over the files of a `PawianHistsCollection`."""
+
+    edges: np.ndarray
+    """All bin edges, so one more than the number of bins."""
+    mean: np.ndarray
+    """Mean bin contents."""
+    std: np.ndarray
+    """Standard deviation of the bin contents."""
+    min: np.ndarray
+    """Smallest bin contents."""
+    max: np.ndarray
+    """Largest bin contents."""
+
+
+class PawianHistsCollection:
+    """Collection of :file:`pawianHists.root` files, for instance of fit variants.
+
+    The files are opened concurrently and each histogram is stacked over all files, so
+    that a scan over fit variants can be summarised in one plot:
+
+    .. code-block:: python
+
+        with PawianHistsCollection(FILENAMES, workers=8) as collection:
+            bands = collection.get_bands("FitpipDm")
+            collection.draw_bands("FitpipDm")
+
+    Args:
+        filenames: The :file:`pawianHists.root` files.
+        workers: Number of threads used for opening the files. If `None`, the
+            default of `concurrent.futures.ThreadPoolExecutor` is used.
+    """
+
+    def __init__(
+        self, filenames: Iterable[Path | str], workers: int | None = None
+    ) -> None:
+        if workers is not None and workers < 1:
+            msg = f"workers has to be positive, but got {workers}"
+            raise ValueError(msg)
+        self.__filenames = [Path(filename) for filename in filenames]
+        if not self.__filenames:
+            msg = "Need at least one file"
+            raise ValueError(msg)
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(PawianHists, filename) for filename in self.__filenames
+            ]
+        errors = [future.exception() for future in futures]
+        if any(errors):
+            for future, error in zip(futures, errors):
+                if error is None:
+                    future.result().close()
+            raise next(error for error in errors if error is not None)
+        self.__files: list[PawianHists] = [future.result() for future in futures]
+        self.__stacks: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.__files)
+
+    def close(self) -> None:
+        """Close all files."""
+        for hist_file in self.__files:
+            hist_file.close()
+
+    def get_histogram_stack(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """Get the bin contents of a histogram in all files.
+
+        Returns:
+            An array of all bin edges and an array of shape
+            :code:`(n_files, n_bins)` with the bin contents in each file.
+
+        Raises:
+            KeyError: If a file does not contain a 1-dimensional histogram with this
+                name.
+            ValueError: If the binning differs between the files.
+        """
+        stack = self.__stacks.get(name)
+        if stack is not None:
+            return stack
+        edges = None
+        values = None
+        for idx, (filename, hist_file) in enumerate(
+            zip(self.__filenames, self.__files)
+        ):
+            histogram = hist_file.get_uproot_histogram(name)
+            if histogram is None:
+                msg = f'Histogram "{name}" does not exist in file {filename}'
+                raise KeyError(msg)
+            if edges is None or values is None:
+                edges = histogram.axes[0].edges()
+                values = np.empty((len(self.__files), len(edges) - 1))
+            elif not np.array_equal(histogram.axes[0].edges(), edges):
+                msg = (
+                    f'Binning of histogram "{name}" in file {filename} differs from'
+                    f" that in file {self.__filenames[0]}"
+                )
+                raise ValueError(msg)
+            values[idx] = histogram.values()
+        assert edges is not None  # noqa: S101
+        assert values is not None  # noqa: S101
+        stack = edges, values
+        self.__stacks[name] = stack
+        return stack
+
+    def get_bands(self, name: str) -> HistogramBands:
+        """Compute the per-bin mean, spread, and range of a histogram over all files.
+
+        .. seealso:: :meth:`get_histogram_stack`
+        """
+        edges, values = self.get_histogram_stack(name)
+        return HistogramBands(
+            edges=edges,
+            mean=values.mean(axis=0),
+            std=values.std(axis=0),
+            min=values.min(axis=0),
+            max=values.max(axis=0),
+        )
+
+    def draw_bands(self, name: str, plot_on: Axes | None = None) -> HistogramBands:
+        """Draw the mean of a histogram with its standard deviation and range.
+
+        Args:
+            name: The name of the histogram in the :file:`pawianHists.root` files.
+            plot_on: The axis on which to draw the histogram. If `None`, the current
+                axis of `matplotlib.pyplot` is used.
+        """
+        bands = self.get_bands(name)
+        if plot_on is None:
+            plot_on = plt.gca()
+        plot_on.stairs(
+            bands.max,
+            bands.edges,
+            baseline=bands.min,
+            fill=True,
+            alpha=0.2,
+            label="min/max",
+        )
+        plot_on.stairs(
+            bands.mean + bands.std,
+            bands.edges,
+            baseline=bands.mean - bands.std,
+            fill=True,
+            alpha=0.4,
+            label="std",
+        )
+        plot_on.stairs(bands.mean, bands.edges, label="mean")
+        return bands
+
+    @property
+    def filenames(self) -> list[Path]:
+        """Get the paths of the :file:`pawianHists.root` files."""
+        return list(self.__filenames)
+
+    @property
+    def files(self) -> list[PawianHists]:
+        """Get the opened :file:`pawianHists.root` files."""
+        return list(self.__files)
+
+    @property
+    def histogram_names(self) -> list[str]:
+        """Get the names of the 1-dimensional histograms that all files contain."""
+        names = self.__files[0].histogram_names
+        for hist_file in self.__files[1:]:
+            other_names = set(hist_file.histogram_names)
+            names = [name for name in names if name in other_names]
+        return names
+
+
+def _compare_histograms(
+    names: list[str],
+    data: list[tuple[np.ndarray, np.ndarray]],
+    references: list[tuple[np.ndarray, np.ndarray]],
+    normalize: list[bool],
+) -> pd.DataFrame:
+    """Compute comparison statistics of pairs of histograms on their joined bins.
+
+    References for which :code:`normalize` is `True` are scaled to the integral of the
+    data.
+    """
+    table = pd.DataFrame(index=pd.Index(names, name="name"))
+    if not names:
+        return table.reindex(
+            columns=["n_bins", "chi2", "ndf", "chi2_ndf", "ks", "max_pull"]
+        )
+    n_bins = np.array([len(values) for values, _ in data])
+    starts = np.concatenate([[0], np.cumsum(n_bins)[:-1]])
+    data_values, data_variances = (
+        np.concatenate(a, dtype=np.float64) for a in zip(*data)
+    )
+    reference_values, reference_variances = (
+        np.concatenate(a, dtype=np.float64) for a in zip(*references)
+    )
+    data_sums = np.add.reduceat(data_values, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(
+            normalize, data_sums / np.add.reduceat(reference_values, starts), 1.0
+        )
+        scale = np.repeat(scale, n_bins)
+        differences = data_values - scale * reference_values
+        pulls, is_used = _compute_pulls(
+            differences, data_variances + scale**2 * reference_variances
+        )
+        table["n_bins"] = n_bins
+        table["chi2"] = np.add.reduceat(pulls**2, starts)
+        table["ndf"] = np.add.reduceat(is_used.astype(int), starts)
+        table["chi2_ndf"] = table["chi2"] / table["ndf"]
+        cdf_differences = _cumsum_per_histogram(differences, starts, n_bins)
+        table["ks"] = np.maximum.reduceat(
+            np.abs(cdf_differences) / np.repeat(data_sums, n_bins), starts
+        )
+        table["max_pull"] = np.maximum.reduceat(np.abs(pulls), starts)
+    return table
+
+
+def _compute_pulls(
+    differences: np.ndarray, variances: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the pulls of bins, which are zero for bins without variance."""
+    is_used = variances > 0
+    pulls = np.zeros_like(differences)
+    pulls[is_used] = differences[is_used] / np.sqrt(variances[is_used])
+    return pulls, is_used
+
+
+def _cumsum_per_histogram(
+    values: np.ndarray, starts: np.ndarray, n_bins: np.ndarray
+) -> np.ndarray:
+    """Compute the cumulative sums of the bins of concatenated histograms."""
+    cumsum = np.cumsum(values)
+    return cumsum - np.repeat(cumsum[starts] - values[starts], n_bins)
+
+
+def _create_combined_figure(
+    name: str, content: dict[str, tuple[np.ndarray, np.ndarray]]
+) -> Figure:
+    # not created through pyplot, so that the figure is not kept alive by pyplot
+    figure = Figure()
+    axes = figure.add_subplot()
+    for label, (values, edges) in content.items():
+        axes.stairs(values, edges, label=label)
+    axes.set_title(f"${convert(name)}$")
+    axes.legend()
+    return figure
+
+
+def _export_combined_histogram(
+    name: str, content: dict[str, tuple[np.ndarray, np.ndarray]], filename: Path
+) -> None:
+    _create_combined_figure(name, content).savefig(filename)
+
+
+def _get_histogram_dimensions(directory: ReadOnlyDirectory) -> dict[str, int]:
+    """Get the names and dimensions of all histograms from their class names.
+
+    Histograms of other classes, like :code:`TH2Poly`, are skipped with a warning.
+    """
+    dimensions = {}
+    for name, classname in directory.classnames(cycle=False).items():
+        match = re.fullmatch(r"TH([123])[CSIFD]|TProfile(?:([23])D)?", classname)
+        if match is not None:
+            dimensions[name] = int(match[1] or match[2] or 1)
+        elif re.match(r"TH\d|TProfile", classname):
+            _LOGGER.warning(
+                'Skipping histogram "%s" of unsupported class %s', name, classname
+            )
+    return dimensions
+
+
+def _create_catalogue(dimensions: dict[str, int]) -> dict[str, CatalogueEntry]:
+    catalogue: dict[str, CatalogueEntry] = {}
+    for name, ndim in dimensions.items():
+        for prefix, label in _VARIANT_PREFIXES.items():
+            if name.startswith(prefix):
+                unique_name = name[len(prefix) :]
+                entry = catalogue.setdefault(unique_name, CatalogueEntry(ndim, {}))
+                entry.variants[label] = name
+                break
+    return catalogue
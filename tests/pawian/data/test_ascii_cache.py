@@ -0,0 +1,128 @@
+import os
+import shutil
+from os.path import dirname, realpath
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import AsciiCache, DataParserError, read_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    filename = tmp_path / "data.dat"
+    shutil.copy(INPUT_FILE_DATA, filename)
+    return filename
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+@pytest.mark.parametrize("mmap", [False, True])
+def test_read_ascii_cache(tmp_path, input_file, particles, mmap):
+    cache = AsciiCache(tmp_path / "cache", mmap=mmap)
+    assert cache.load(input_file, particles) is None
+    frame = read_ascii(input_file, particles, cache=cache)
+    assert len(list(cache.directory.iterdir())) == 2
+    cached_frame = cache.load(input_file, particles)
+    assert cached_frame is not None
+    assert_frame_equal(cached_frame, frame)
+    assert_frame_equal(read_ascii(input_file, particles, cache=cache), frame)
+    first_column = cached_frame.iloc[:, 0].to_numpy()
+    assert first_column.flags.writeable is not mmap
+
+
+def test_cache_invalidation(tmp_path, data_file):
+    cache = AsciiCache(tmp_path / "cache")
+    read_ascii(data_file, cache=cache)
+    assert cache.load(data_file) is not None
+
+    stat = os.stat(data_file)
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.load(data_file) is None
+    read_ascii(data_file, cache=cache)
+    assert cache.load(data_file) is not None
+
+    stat = os.stat(data_file)
+    content = data_file.read_bytes()
+    data_file.write_bytes(content.replace(b"0.99407", b"0.99408", 1))
+    os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert AsciiCache(cache.directory, verify_content=False).load(data_file) is not None
+    assert cache.load(data_file) is None
+    frame = read_ascii(data_file, cache=cache)
+    assert frame.pwa.weights.iloc[0] == 0.99408
+
+
+def test_cache_particles(tmp_path):
+    cache = AsciiCache(tmp_path / "cache")
+    read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"], cache=cache)
+    frame = cache.load(INPUT_FILE_DATA, 3)
+    assert frame is not None
+    assert frame.pwa.particles == ["1", "2", "3"]
+    with pytest.raises(DataParserError):
+        cache.load(INPUT_FILE_DATA, 2)
+
+    read_ascii(INPUT_FILE_MC, ["pi+", "D0", "D-"], cache=cache)
+    assert cache.load(INPUT_FILE_MC, 2) is None
+    with pytest.raises(DataParserError):
+        cache.load(INPUT_FILE_MC)
+
+
+def test_cache_eviction(tmp_path, data_file):
+    cache = AsciiCache(tmp_path / "cache")
+    read_ascii(data_file, cache=cache)
+    entry_size = cache.size
+    assert entry_size > 0
+
+    cache.max_size = int(2.5 * entry_size)
+    copies = []
+    for i in range(3):
+        filename = tmp_path / f"copy{i}.dat"
+        shutil.copy(data_file, filename)
+        copies.append(filename)
+    read_ascii(copies[0], cache=cache)
+    read_ascii(data_file, cache=cache)  # mark as recently used
+    read_ascii(copies[1], cache=cache)
+    assert cache.size <= cache.max_size
+    assert cache.load(data_file) is not None
+    assert cache.load(copies[0]) is None
+    assert cache.load(copies[1]) is not None
+
+    cache.clear()
+    assert cache.size == 0
+
+
+def test_cache_default_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("PAWIAN_CACHE_DIR", str(tmp_path))
+    assert AsciiCache().directory == tmp_path
+    with pytest.raises(TypeError, match=r"cannot be combined with cache$"):
+        read_ascii(INPUT_FILE_DATA, cache=True, nrows=10)
+
+
+def test_cache_keeps_other_files(tmp_path, data_file):
+    user_files = [
+        tmp_path / "data.dat.index.npy",
+        tmp_path / "data.dat.index.json",
+        tmp_path / "weights.npy",
+        tmp_path / "config.json",
+    ]
+    for filename in user_files:
+        filename.write_bytes(b"user data")
+    cache = AsciiCache(tmp_path, max_size=0)
+    read_ascii(data_file, cache=cache)
+    assert cache.size == 0
+    read_ascii(data_file, cache=AsciiCache(tmp_path))
+    assert cache.size > 0
+    cache.clear()
+    assert cache.size == 0
+    assert sorted(tmp_path.iterdir()) == sorted([data_file, *user_files])
@@ -0,0 +1,89 @@
+from os.path import dirname, realpath
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import (
+    DataParserError,
+    iter_ascii,
+    iter_binary,
+    read_ascii,
+    read_binary,
+    write_ascii,
+    write_binary,
+)
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+@pytest.mark.parametrize("chunk_events", [1, 300, 1_000_000])
+def test_binary_round_trip(tmp_path, input_file, particles, chunk_events):
+    frame = read_ascii(input_file, particles)
+    filename = tmp_path / "sample.pawb"
+    frame.pwa.write_binary(filename, chunk_events)
+    assert filename.read_bytes().startswith(b"PAWIANB1")
+    assert_frame_equal(read_binary(filename), frame)
+
+
+def test_write_streamed(tmp_path):
+    frame = read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"])
+    chunks = iter_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"], chunk_events=300)
+    write_binary(tmp_path / "sample.pawb", chunks, chunk_events=128)
+    assert_frame_equal(read_binary(tmp_path / "sample.pawb"), frame)
+    chunks = iter_binary(tmp_path / "sample.pawb", chunk_events=300)
+    write_ascii(tmp_path / "sample.dat", chunks)
+    assert_frame_equal(read_ascii(tmp_path / "sample.dat", frame.pwa.particles), frame)
+    with pytest.raises(ValueError, match=r"^All frames should have the same particles"):
+        write_binary(tmp_path / "mixed.pawb", [frame, frame[["pi+", "D0"]]])
+    with pytest.raises(ValueError, match=r"^Cannot write a binary file without"):
+        write_binary(tmp_path / "empty.pawb", [])
+    assert not (tmp_path / "mixed.pawb").exists()
+
+
+@pytest.mark.parametrize("particles", [["pi+"], ["D-", "pi+"]])
+@pytest.mark.parametrize(
+    "events",
+    [
+        None,
+        slice(100, 200),
+        slice(-10, None),
+        slice(5, 900, 7),
+        slice(3, 3),
+        slice(None, None, -1),
+        slice(10, None, -2),
+        slice(500, 100, -3),
+    ],
+)
+def test_read_binary_projection(tmp_path, particles, events):
+    frame = read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"])
+    filename = tmp_path / "sample.pawb"
+    frame.pwa.write_binary(filename)
+    expected = frame[[*particles, "weight"]]
+    if events is not None:
+        expected = expected.iloc[events]
+    projected = read_binary(filename, particles, events)
+    assert_frame_equal(projected, expected, check_column_type=False)
+    assert projected.pwa.particles == particles
+
+
+def test_read_binary_exceptions(tmp_path):
+    with pytest.raises(DataParserError, match=r"is not a binary event file$"):
+        read_binary(INPUT_FILE_DATA)
+    frame = read_ascii(INPUT_FILE_MC, ["pi+", "D0", "D-"])
+    filename = tmp_path / "sample.pawb"
+    frame.pwa.write_binary(filename)
+    with pytest.raises(ValueError, match=r"^No particles \['K\+'\] in"):
+        read_binary(filename, ["pi+", "K+"])
+    with pytest.raises(ValueError, match=r"^chunk_events has to be positive"):
+        frame.pwa.write_binary(filename, chunk_events=0)
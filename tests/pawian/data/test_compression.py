@@ -0,0 +1,46 @@
+from os.path import dirname, realpath
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import iter_ascii, read_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+
+
+@pytest.mark.parametrize(
+    ("suffix", "magic"),
+    [
+        (".bz2", b"BZh"),
+        (".gz", b"\x1f\x8b"),
+        (".xz", b"\xfd7zXZ\x00"),
+    ],
+)
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+def test_compressed_round_trip(tmp_path, input_file, particles, suffix, magic):
+    frame = read_ascii(input_file, particles)
+    compressed_file = tmp_path / f"sample.dat{suffix}"
+    frame.pwa.write_ascii(compressed_file)
+    assert compressed_file.read_bytes().startswith(magic)
+    plain_file = tmp_path / "plain.dat"
+    frame.pwa.write_ascii(plain_file)
+    assert compressed_file.stat().st_size < plain_file.stat().st_size / 2
+    assert_frame_equal(read_ascii(compressed_file, particles), frame)
+    assert_frame_equal(read_ascii(compressed_file, particles, workers=2), frame)
+    chunks = iter_ascii(compressed_file, particles, chunk_events=300)
+    assert_frame_equal(pd.concat(chunks), frame)
+
+    unnamed_file = tmp_path / "sample.dat"
+    compressed_file.rename(unnamed_file)
+    assert_frame_equal(read_ascii(unnamed_file, particles), frame)
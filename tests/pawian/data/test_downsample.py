@@ -0,0 +1,73 @@
+from os.path import dirname, realpath
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import downsample, iter_ascii, read_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+PARTICLES = ["pi+", "D0", "D-"]
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return read_ascii(INPUT_FILE_MC, PARTICLES)
+
+
+@pytest.mark.parametrize("size", [0, 1, 123, 999, 1000, 5000])
+def test_downsample_number(frame, size):
+    selected = frame.pwa.downsample(size, seed=7)
+    assert len(selected) == min(size, len(frame))
+    assert selected.index.is_monotonic_increasing
+    assert_frame_equal(selected, frame.loc[selected.index])
+    for chunk_events in [7, 1000]:
+        frames = downsample(
+            INPUT_FILE_MC, size, 7, particles=PARTICLES, chunk_events=chunk_events
+        )
+        assert_frame_equal(pd.concat(frames), selected)
+    assert_frame_equal(pd.concat(downsample(frame, size, 7, chunk_events=77)), selected)
+
+
+def test_downsample_fraction(frame):
+    selected = frame.pwa.downsample(0.3, seed=7)
+    assert 250 < len(selected) < 350
+    assert frame.pwa.downsample(0.0).empty
+    assert frame.pwa.downsample(1.0).equals(frame)
+    smaller = frame.pwa.downsample(0.2, seed=7)
+    assert smaller.index.isin(selected.index).all()
+    frames = downsample(iter_ascii(INPUT_FILE_MC, PARTICLES, 300), 0.3, seed=7)
+    assert_frame_equal(pd.concat(frames), selected)
+    part = frame.iloc[500:].pwa.downsample(0.3, seed=7)
+    assert_frame_equal(part, selected.loc[500:])
+
+
+def test_downsample_uniformity(frame):
+    numbers = np.concatenate([
+        frame.pwa.downsample(100, seed=seed).index.to_numpy() for seed in range(100)
+    ])
+    counts = np.bincount(numbers // 100, minlength=10)
+    assert counts.sum() == 10_000
+    assert counts.min() > 850
+    assert counts.max() < 1150
+
+
+def test_downsample_exceptions(frame):
+    for size in [-1, 1.5, -0.1, "10", True, False]:
+        with pytest.raises(ValueError, match="Size should be a non-negative number"):
+            frame.pwa.downsample(size)
+    with pytest.raises(TypeError, match="requires a fraction"):
+        downsample(iter_ascii(INPUT_FILE_MC, PARTICLES), 10)
+    with pytest.raises(ValueError, match="need event numbers in the index"):
+        frame.set_index(frame.index.astype(str)).pwa.downsample(0.5)
+    doubled = pd.concat([frame, frame])
+    with pytest.raises(ValueError, match="need unique event numbers"):
+        doubled.pwa.downsample(10)
+    with pytest.raises(ValueError, match="need unique event numbers"):
+        list(downsample(doubled, 0.5))
+    selected = pd.concat([frame, frame], ignore_index=True).pwa.downsample(10)
+    assert len(selected) == 10
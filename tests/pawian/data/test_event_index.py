@@ -0,0 +1,103 @@
+import os
+import shutil
+from os.path import dirname, realpath
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import DataParserError, build_event_index, read_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+PARTICLES = ["pi+", "D0", "D-"]
+
+
+@pytest.mark.parametrize("input_file", [INPUT_FILE_DATA, INPUT_FILE_MC])
+@pytest.mark.parametrize("block_size", [7, 1000, 1 << 24])
+def test_build_event_index(tmp_path, input_file, block_size):
+    filename = tmp_path / "sample.dat"
+    shutil.copy(input_file, filename)
+    offsets = build_event_index(filename, PARTICLES, block_size)
+    assert len(offsets) == 1001
+    assert offsets[0] == 0
+    assert offsets[-1] == filename.stat().st_size
+    assert (tmp_path / "sample.dat.index.npy").exists()
+    assert (tmp_path / "sample.dat.index.json").exists()
+    with open(filename, "rb") as stream:
+        stream.seek(offsets[1])
+        n_values = len(stream.readline().split())
+    assert n_values == (1 if input_file == INPUT_FILE_DATA else 4)
+
+
+@pytest.mark.parametrize("engine", ["numpy", "pandas"])
+@pytest.mark.parametrize(
+    "events",
+    [
+        slice(0, 1),
+        slice(100, 200),
+        slice(990, 2000),
+        slice(-5, None),
+        slice(3, 800, 9),
+        slice(None, None, -1),
+        slice(10, None, -2),
+        slice(500, 100, -3),
+        slice(100, 500, -1),
+    ],
+)
+def test_read_ascii_events(tmp_path, engine, events):
+    filename = tmp_path / "sample.dat"
+    shutil.copy(INPUT_FILE_MC, filename)
+    expected = read_ascii(filename, PARTICLES, engine).iloc[events]
+    frame = read_ascii(filename, PARTICLES, engine, events=events)
+    assert_frame_equal(frame, expected)
+    assert sorted(tmp_path.iterdir()) == [filename]
+    build_event_index(filename, PARTICLES)
+    frame = read_ascii(filename, PARTICLES, engine, events=events)
+    assert_frame_equal(frame, expected)
+
+
+def test_read_ascii_events_read_only(tmp_path, monkeypatch):
+    directory = tmp_path / "read_only"
+    directory.mkdir()
+    filename = directory / "sample.dat"
+    shutil.copy(INPUT_FILE_DATA, filename)
+    expected = read_ascii(filename).iloc[10:20]
+
+    def fail(path):
+        msg = f"Read-only file system: {path}"
+        raise PermissionError(msg)
+
+    # the directory mode does not stop the root user, so also fail any attempt to write
+    monkeypatch.setattr(pawian.data, "_atomic_open", fail)
+    directory.chmod(0o555)
+    try:
+        assert_frame_equal(read_ascii(filename, events=slice(10, 20)), expected)
+        assert list(directory.iterdir()) == [filename]
+    finally:
+        directory.chmod(0o755)
+
+
+def test_read_ascii_events_stale_index(tmp_path):
+    filename = tmp_path / "sample.dat"
+    shutil.copy(INPUT_FILE_DATA, filename)
+    build_event_index(filename)
+    text = filename.read_text()
+    filename.write_text("\n  \n" + text.replace("\n", "\n\n", 50))
+    os.utime(filename, ns=(0, 0))
+    expected = read_ascii(filename).iloc[500:510]
+    assert_frame_equal(read_ascii(filename, events=slice(500, 510)), expected)
+    assert len(read_ascii(filename, events=slice(10, 10))) == 0
+
+
+def test_event_index_exceptions(tmp_path):
+    filename = tmp_path / "sample.dat"
+    filename.write_text("0.5\n1 2 3 4\n1 2 3 4\n0.5\n1 2 3 4\n")
+    with pytest.raises(DataParserError, match=r"not a multiple of 3 lines per event"):
+        build_event_index(filename)
+    with pytest.raises(ValueError, match=r"^Cannot build an event index of compressed"):
+        build_event_index(tmp_path / "sample.dat.gz")
+    with pytest.raises(TypeError, match=r"^events cannot be combined"):
+        read_ascii(INPUT_FILE_DATA, workers=2, events=slice(10))
@@ -0,0 +1,68 @@
+from operator import itemgetter
+from os.path import dirname, realpath
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import EventSample, read_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+def test_frame_conversion(input_file, particles):
+    frame = read_ascii(input_file, particles)
+    sample = frame.pwa.to_sample()
+    assert len(sample) == 1000
+    assert sample.momenta.shape == (1000, 3, 4)
+    assert sample.particles == frame.pwa.particles
+    assert sample.has_weights == frame.pwa.has_weights
+    assert np.shares_memory(sample.momenta, frame.to_numpy())
+    assert_frame_equal(sample.to_frame(), frame)
+
+    reordered_frame = frame[sorted(frame.columns, key=itemgetter(1))]
+    reordered_sample = EventSample.from_frame(reordered_frame)
+    np.testing.assert_array_equal(reordered_sample.momenta, sample.momenta)
+
+
+def test_unweighted_to_frame_is_view():
+    momenta = np.random.default_rng(0).normal(size=(10, 2, 4))
+    frame = EventSample(momenta, ["a", "b"]).to_frame()
+    assert np.shares_memory(frame.to_numpy(), momenta)
+    assert frame.pwa.particles == ["a", "b"]
+    assert not frame.pwa.has_weights
+
+
+def test_kinematics():
+    frame = read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"])
+    sample = EventSample.from_frame(frame)
+    particles = sample.particles
+    np.testing.assert_array_equal(sample.energy, frame.pwa.energy[particles])
+    np.testing.assert_array_equal(
+        sample.p_xyz.reshape(len(sample), -1), frame.pwa.p_xyz.to_numpy()
+    )
+    np.testing.assert_allclose(sample.rho2, frame.pwa.rho2[particles], rtol=1e-14)
+    np.testing.assert_allclose(sample.rho, frame.pwa.rho[particles], rtol=1e-14)
+    np.testing.assert_allclose(sample.mass2, frame.pwa.mass2[particles], rtol=1e-12)
+    np.testing.assert_allclose(sample.mass, frame.pwa.mass[particles], rtol=1e-12)
+    np.testing.assert_array_equal(sample.weights, frame.pwa.weights)
+
+
+def test_validation():
+    with pytest.raises(ValueError, match=r"^Momenta should have shape"):
+        EventSample(np.zeros((10, 3, 4)), ["a", "b"])
+    with pytest.raises(ValueError, match=r"^Momenta should have shape"):
+        EventSample(np.zeros((10, 12)), ["a", "b", "c"])
+    with pytest.raises(ValueError, match=r"^There are 10 events, but weights"):
+        EventSample(np.zeros((10, 2, 4)), ["a", "b"], np.ones(9))
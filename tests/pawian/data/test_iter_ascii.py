@@ -0,0 +1,45 @@
+from os.path import dirname, realpath
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import DataParserError, iter_ascii, read_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_DATA, ["pi+", "D0", "D-"]),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+        (INPUT_FILE_MC, 3),
+    ],
+)
+@pytest.mark.parametrize("chunk_events", [128, 300, 1000, 5000])
+@pytest.mark.parametrize("engine", ["numpy", "pandas"])
+def test_iter_ascii(input_file, particles, chunk_events, engine):
+    """Concatenated chunks should be identical to reading the file at once."""
+    chunks = list(iter_ascii(input_file, particles, chunk_events, engine))
+    expected_lengths = [chunk_events] * (1000 // chunk_events)
+    if 1000 % chunk_events:
+        expected_lengths.append(1000 % chunk_events)
+    assert [len(chunk) for chunk in chunks] == expected_lengths
+    assert all(chunk.pwa.particles == chunks[0].pwa.particles for chunk in chunks)
+    frame = read_ascii(input_file, particles)
+    assert_frame_equal(pd.concat(chunks), frame)
+
+
+def test_iter_ascii_exceptions():
+    with pytest.raises(DataParserError):
+        next(iter_ascii(INPUT_FILE_MC))
+    with pytest.raises(DataParserError):
+        next(iter_ascii(INPUT_FILE_DATA, 4))
+    with pytest.raises(ValueError, match=r"^chunk_events has to be positive"):
+        next(iter_ascii(INPUT_FILE_DATA, chunk_events=0))
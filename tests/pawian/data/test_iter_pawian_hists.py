@@ -0,0 +1,49 @@
+from os.path import dirname, realpath
+
+import pandas as pd
+import pytest
+import uproot
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import iter_pawian_hists, read_pawian_hists
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+
+
+@pytest.mark.parametrize(
+    "input_file", ["pawianHists_ROOT5_SigmaKp.root", "pawianHists_ROOT6_DDpi.root"]
+)
+@pytest.mark.parametrize("type_name", ["data", "fitted"])
+@pytest.mark.parametrize("step_size", [100, 333, 10_000])
+def test_iter_pawian_hists(input_file, type_name, step_size):
+    """Concatenated chunks should be identical to reading the tree at once."""
+    input_file = f"{SAMPLE_DIR}/{input_file}"
+    chunks = list(iter_pawian_hists(input_file, type_name, step_size))
+    expected = read_pawian_hists(input_file, type_name)
+    n_events = len(expected)
+    expected_lengths = [step_size] * (n_events // step_size)
+    if n_events % step_size:
+        expected_lengths.append(n_events % step_size)
+    assert [len(chunk) for chunk in chunks] == expected_lengths
+    assert_frame_equal(pd.concat(chunks), expected)
+
+
+def test_iter_pawian_hists_sources():
+    input_file = f"{SAMPLE_DIR}/pawianHists_ROOT6_DDpi.root"
+    expected = read_pawian_hists(input_file, "fitted")
+    with uproot.open(input_file) as uproot_file:
+        chunks = iter_pawian_hists(uproot_file, "fitted", step_size="10 kB")
+        assert_frame_equal(pd.concat(chunks), expected)
+        chunks = iter_pawian_hists(uproot_file["_fittedFourvecs"], step_size=1000)
+        assert_frame_equal(pd.concat(chunks), expected)
+        assert not uproot_file.closed
+
+
+def test_iter_pawian_hists_exceptions():
+    input_file = f"{SAMPLE_DIR}/pawianHists_ROOT6_DDpi.root"
+    with pytest.raises(ValueError, match=r"^Wrong type_name"):
+        next(iter_pawian_hists(input_file, "wrong"))  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match=r"^step_size has to be positive"):
+        next(iter_pawian_hists(input_file, step_size=0))
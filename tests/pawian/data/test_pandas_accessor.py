@@ -1,10 +1,18 @@
+from itertools import combinations
 from os.path import dirname, realpath
 
+import numpy as np
 import pandas as pd
 import pytest
 
 import pawian
-from pawian.data import create_skeleton_frame, read_ascii
+from pawian.data import (
+    EventSample,
+    create_skeleton_frame,
+    read_ascii,
+    read_pawian_hists,
+)
+from pawian.qa import PawianHists
 
 PAWIAN_DIR = dirname(realpath(pawian.__file__))
 SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
@@ -113,3 +121,133 @@ def test_properties_single_column():
         match=r"This dataframe is single-level and does not contain particles",
     ):
         assert pi_data.pwa.particles
+
+
+def test_kinematics_cache():
+    frame = read_ascii(INPUT_FILE_DATA, particles=["pi+", "D0", "D-"])
+    assert frame.pwa.cache_info() == (0, 0, 0, 0)
+    mass = frame.pwa.mass
+    assert frame.pwa.mass.equals(mass)
+    assert frame.pwa.rho2.equals(frame.pwa.rho2)
+    hits, misses, currsize, nbytes = frame.pwa.cache_info()
+    assert (hits, misses, currsize) == (3, 3, 3)
+    assert nbytes == 3 * mass.to_numpy().nbytes
+
+    # results are read-only views, so editing them does not change the cache
+    assert np.shares_memory(frame.pwa.mass.to_numpy(), mass.to_numpy())
+    edited = frame.pwa.mass
+    with pytest.raises(ValueError, match="read-only"):
+        edited.iloc[0, 0] = -1.0
+    edited["pi+"] = -1.0
+    assert frame.pwa.mass.equals(mass)
+
+    # replacing a column invalidates the cache
+    frame["pi+", "E"] *= 2
+    new_mass = frame.pwa.mass
+    assert (new_mass["pi+"] > mass["pi+"]).all()
+    assert new_mass[["D0", "D-"]].equals(mass[["D0", "D-"]])
+    assert frame.pwa.cache_info().misses == 6
+
+    # in-place edits are not detected, until the cache is cleared
+    frame.iloc[0, 3] = 1.0
+    assert frame.pwa.mass.equals(new_mass)
+    frame.pwa.cache_clear()
+    assert frame.pwa.cache_info() == (0, 0, 0, 0)
+    assert frame.pwa.mass["pi+"].iloc[0] != new_mass["pi+"].iloc[0]
+    assert frame.pwa.cache_info().misses == 3
+
+    # derived frames have their own cache
+    assert frame.iloc[:10].pwa.cache_info() == (0, 0, 0, 0)
+    assert frame.iloc[:10].pwa.mass.equals(frame.pwa.mass.iloc[:10])
+
+
+def _compute_mass_by_hand(frame: pd.DataFrame, particles: list[str]) -> pd.Series:
+    total = sum(frame[particle] for particle in particles)
+    return np.sqrt(
+        total["E"] ** 2 - total["p_x"] ** 2 - total["p_y"] ** 2 - total["p_z"] ** 2
+    )
+
+
+@pytest.mark.parametrize("particles", [["pi+"], ["pi+", "D0"], ["D-", "pi+", "D0"]])
+def test_invariant_mass(particles):
+    frame = read_ascii(INPUT_FILE_DATA, particles=["pi+", "D0", "D-"])
+    mass = frame.pwa.invariant_mass(particles)
+    assert mass.name == "".join(particles)
+    expected = _compute_mass_by_hand(frame, particles)
+    np.testing.assert_allclose(mass, expected, rtol=1e-12)
+
+
+@pytest.mark.parametrize("order", [1, 2, 3, 4])
+def test_all_invariant_masses(order):
+    particles = ["a", "b", "c", "d", "e"]
+    rng = np.random.default_rng(seed=0)
+    momenta = rng.normal(size=(40_000, len(particles), 4))
+    momenta[..., 3] += 10
+    frame = EventSample(momenta, particles).to_frame()
+    masses = frame.pwa.all_invariant_masses(order)
+    subsystems = list(combinations(particles, order))
+    assert masses.columns.to_list() == ["".join(s) for s in subsystems]
+    for subsystem in subsystems:
+        expected = _compute_mass_by_hand(frame, list(subsystem))
+        np.testing.assert_allclose(masses["".join(subsystem)], expected, rtol=1e-12)
+
+
+def test_invariant_mass_exceptions():
+    frame = read_ascii(INPUT_FILE_DATA, particles=["pi+", "D0", "D-"])
+    with pytest.raises(ValueError, match=r"^Dataframe doesn't contain particles"):
+        frame.pwa.invariant_mass(["pi+", "pi-"])
+    with pytest.raises(ValueError, match=r"^Expecting a non-empty list"):
+        frame.pwa.invariant_mass(["pi+", "pi+"])
+    with pytest.raises(ValueError, match=r"^order should be between 1 and"):
+        frame.pwa.all_invariant_masses(order=4)
+
+
+def test_boost_to_rest_frame():
+    frame = read_ascii(INPUT_FILE_DATA, particles=["pi+", "D0", "D-"])
+    boosted = frame.pwa.boost_to_rest_frame(["pi+", "D0"])
+    assert boosted.columns.equals(frame.columns)
+    assert boosted.pwa.weights.equals(frame.pwa.weights)
+    total = boosted["pi+"] + boosted["D0"]
+    np.testing.assert_allclose(total[["p_x", "p_y", "p_z"]], 0, atol=1e-12)
+    np.testing.assert_allclose(
+        total["E"], frame.pwa.invariant_mass(["pi+", "D0"]), rtol=1e-12
+    )
+    np.testing.assert_allclose(boosted.pwa.mass, frame.pwa.mass, rtol=1e-9)
+
+
+@pytest.mark.parametrize("kind", ["Heli", "GJ"])
+@pytest.mark.parametrize(
+    ("particle", "system"),
+    [
+        ("pip", ["pip", "D0"]),
+        ("pip", ["pip", "Dm"]),
+        ("D0", ["D0", "Dm"]),
+    ],
+)
+def test_decay_angles(kind, particle, system):
+    """Decay angles should reproduce the histograms that Pawian produced."""
+    filename = f"{SAMPLE_DIR}/pawianHists_ROOT6_DDpi.root"
+    names = {"pip": "pi+", "D0": "D0", "Dm": "D-"}
+    frame = read_pawian_hists(filename, type_name="data")
+    if kind == "Heli":
+        angles = frame.pwa.helicity_angles(names[particle], [names[p] for p in system])
+    else:
+        angles = frame.pwa.gj_angles(names[particle], [names[p] for p in system])
+    assert angles.columns.to_list() == ["cos_theta", "phi"]
+    assert len(angles) == len(frame)
+    hist_file = PawianHists(filename)
+    suffix = f"{kind}_{particle}_From{''.join(system)}"
+    for column, name in [
+        ("cos_theta", f"DataTheta{suffix}"),
+        ("phi", f"DataPhi{suffix}"),
+    ]:
+        edges, values = hist_file.get_histogram_content(name)  # type: ignore[misc]
+        bins = [*edges, 2 * edges[-1] - edges[-2]]
+        computed, _ = np.histogram(angles[column], bins, weights=frame.pwa.weights)
+        np.testing.assert_allclose(computed, values, atol=1e-3)
+
+
+def test_decay_angles_exceptions():
+    frame = read_ascii(INPUT_FILE_DATA, particles=["pi+", "D0", "D-"])
+    with pytest.raises(ValueError, match=r"^Particle D- is not in the decaying"):
+        frame.pwa.helicity_angles("D-", ["pi+", "D0"])
@@ -1,9 +1,10 @@
 from os.path import dirname, realpath
 
 import pytest
+from pandas.testing import assert_frame_equal
 
 import pawian
-from pawian.data import DataParserError, read_ascii
+from pawian.data import DataParserError, _split_at_events, read_ascii
 
 PAWIAN_DIR = dirname(realpath(pawian.__file__))
 SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
@@ -101,3 +102,71 @@ def test_read_with_weights_wrong_particles():
         read_ascii(INPUT_FILE_DATA, 4)
     with pytest.raises(DataParserError):
         read_ascii(INPUT_FILE_MC)
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+def test_read_engines(input_file, particles):
+    """The numpy and pandas engines should result in the same frame."""
+    frame_numpy = read_ascii(input_file, particles, engine="numpy")
+    frame_pandas = read_ascii(input_file, particles, engine="pandas")
+    assert_frame_equal(frame_numpy, frame_pandas)
+    assert_frame_equal(read_ascii(input_file, particles, nrows=None), frame_pandas)
+
+
+def test_read_engine_exceptions(tmp_path):
+    with pytest.raises(ValueError, match=r"^Wrong engine"):
+        read_ascii(INPUT_FILE_DATA, engine="c")  # type: ignore[arg-type]
+
+    with open(INPUT_FILE_DATA) as stream:
+        lines = stream.readlines()
+    truncated_file = tmp_path / "truncated.dat"
+    truncated_file.write_text("".join(lines[:-1]))
+    with pytest.raises(DataParserError, match=r"contains incomplete events"):
+        read_ascii(truncated_file)
+    misaligned_file = tmp_path / "misaligned.dat"
+    misaligned_file.write_text("".join(lines[:8] + lines[9:] + lines[8:9]))
+    with pytest.raises(DataParserError, match=r"does not have a weight line"):
+        read_ascii(misaligned_file)
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+@pytest.mark.parametrize("workers", [2, 3, 7])
+@pytest.mark.parametrize("engine", ["numpy", "pandas"])
+def test_read_parallel(input_file, particles, workers, engine):
+    """Parallel reading should be identical to serial reading."""
+    frame_parallel = read_ascii(input_file, particles, engine, workers=workers)
+    frame_serial = read_ascii(input_file, particles, engine)
+    assert_frame_equal(frame_parallel, frame_serial, check_exact=True)
+
+
+def test_read_parallel_exceptions():
+    with pytest.raises(ValueError, match=r"^workers has to be positive"):
+        read_ascii(INPUT_FILE_DATA, workers=0)
+    with pytest.raises(TypeError, match=r"cannot be combined with workers$"):
+        read_ascii(INPUT_FILE_DATA, workers=2, nrows=10)
+
+
+@pytest.mark.parametrize("n_parts", [1, 2, 10, 1000])
+def test_split_at_events(n_parts):
+    boundaries = _split_at_events(INPUT_FILE_DATA, has_weights=True, n_parts=n_parts)
+    assert boundaries[0] == 0
+    assert boundaries == sorted(set(boundaries))
+    assert len(boundaries) <= n_parts + 1
+    with open(INPUT_FILE_DATA, "rb") as stream:
+        content = stream.read()
+    assert boundaries[-1] == len(content)
+    for start in boundaries[:-1]:
+        first_line = content[start:].split(b"\n", maxsplit=1)[0]
+        assert len(first_line.split()) == 1
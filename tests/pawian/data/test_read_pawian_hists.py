@@ -1,6 +1,8 @@
 from os.path import dirname, realpath
 
 import pytest
+import uproot
+from pandas.testing import assert_frame_equal
 
 import pawian
 from pawian.data import read_pawian_hists
@@ -41,6 +43,22 @@ def test_read_pawian_hists(input_file, has_weights, particles, energy):
     assert data[particles[0]].pwa.energy.mean() == energy
 
 
+@pytest.mark.parametrize(
+    "input_file", ["pawianHists_ROOT5_SigmaKp.root", "pawianHists_ROOT6_DDpi.root"]
+)
+@pytest.mark.parametrize("type_name", ["data", "fitted"])
+def test_read_pawian_hists_sources(input_file, type_name):
+    """Reading from an open file or tree should give the same as from a path."""
+    input_file = f"{SAMPLE_DIR}/{input_file}"
+    expected = read_pawian_hists(input_file, type_name)
+    with uproot.open(input_file) as uproot_file:
+        assert_frame_equal(read_pawian_hists(uproot_file, type_name), expected)
+        tree = uproot_file[f"_{type_name}Fourvecs"]
+        assert_frame_equal(read_pawian_hists(tree), expected)
+        assert_frame_equal(read_pawian_hists(tree, workers=4), expected)
+        assert not uproot_file.closed
+
+
 def test_read_pawian_hists_exception():
     """Test whether expected exceptions are raised."""
     with pytest.raises(
@@ -51,3 +69,5 @@ def test_read_pawian_hists_exception():
             f"{SAMPLE_DIR}/pawianHists_ROOT6_DDpi.root",
             type_name="wrong",  # type: ignore[arg-type]
         )
+    with pytest.raises(ValueError, match=r"^workers has to be positive"):
+        read_pawian_hists(f"{SAMPLE_DIR}/pawianHists_ROOT6_DDpi.root", workers=0)
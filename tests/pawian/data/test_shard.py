@@ -0,0 +1,67 @@
+import filecmp
+import shutil
+from os.path import dirname, realpath
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import DataParserError, build_event_index, merge, read_ascii, shard
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+PARTICLES = ["pi+", "D0", "D-"]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_shard_and_merge(tmp_path, workers):
+    shards = shard(INPUT_FILE_DATA, 4, tmp_path / "shards", workers=workers)
+    assert [path.name for path in shards] == [
+        f"momentum_tuples_data.{i}.dat" for i in range(4)
+    ]
+    frames = [read_ascii(path, PARTICLES) for path in shards]
+    assert sum(map(len, frames)) == 1000
+    merged = tmp_path / "merged.dat"
+    merge(shards, merged, workers=workers)
+    assert filecmp.cmp(merged, INPUT_FILE_DATA, shallow=False)
+
+
+def test_shard_equal_events(tmp_path):
+    filename = shutil.copy(INPUT_FILE_MC, tmp_path)
+    with pytest.raises(DataParserError, match="Cannot determine number of particles"):
+        shard(filename, 3)
+    shards = shard(filename, 3, particles=3)
+    assert [len(read_ascii(path, PARTICLES)) for path in shards] == [333, 333, 334]
+    filename = shutil.copy(INPUT_FILE_DATA, tmp_path)
+    build_event_index(filename)
+    shards = shard(filename, 7, tmp_path / "shards")
+    assert [len(read_ascii(path)) for path in shards] == [142] + [143] * 6
+    assert len(shard(filename, 2000, tmp_path / "many")) == 1000
+
+
+def test_merge_layouts(tmp_path):
+    frame = read_ascii(INPUT_FILE_MC, PARTICLES)
+    first = tmp_path / "first.dat"
+    second = tmp_path / "second.dat"
+    frame.iloc[:10].pwa.write_ascii(first)
+    second.write_text(first.read_text().rstrip("\n"))
+    merged = tmp_path / "merged.dat"
+    merge([second, first], merged, particles=3)
+    assert_frame_equal(
+        read_ascii(merged, PARTICLES),
+        read_ascii(first, PARTICLES)
+        .iloc[[*range(10), *range(10)]]
+        .reset_index(drop=True),
+    )
+    with pytest.raises(DataParserError, match="not a multiple of 4 lines per event"):
+        merge([first, second], merged, particles=4)
+    with pytest.raises(ValueError, match="All files should have the same particles"):
+        merge([first, INPUT_FILE_DATA], merged, particles=3)
+    with pytest.raises(ValueError, match="Cannot merge compressed file"):
+        merge([first, f"{SAMPLE_DIR}/missing.dat.gz"], merged)
+    with pytest.raises(ValueError, match="Cannot merge into compressed file"):
+        merge([first], tmp_path / "merged.dat.xz")
+    with pytest.raises(ValueError, match="Need at least one file"):
+        merge([], merged)
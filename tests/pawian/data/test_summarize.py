@@ -0,0 +1,73 @@
+from os.path import dirname, realpath
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import iter_ascii, read_ascii, read_pawian_hists, summarize
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+INPUT_FILE_ROOT6 = f"{SAMPLE_DIR}/pawianHists_ROOT6_DDpi.root"
+
+
+@pytest.mark.parametrize("chunk_events", [7, 77, 100_000])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_summarize(chunk_events, workers):
+    frame = read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"])
+    summary = summarize(
+        INPUT_FILE_DATA, ["pi+", "D0", "D-"], chunk_events=chunk_events, workers=workers
+    )
+    weights = frame.pwa.weights.to_numpy()
+    assert summary.n_events == 1000
+    assert summary.sum_weights == pytest.approx(weights.sum())
+    assert summary.sum_weights2 == pytest.approx((weights**2).sum())
+    assert summary.effective_size == pytest.approx(
+        weights.sum() ** 2 / (weights**2).sum()
+    )
+    sample = frame.pwa.to_sample()
+    quantities = {"E": sample.energy, "p": sample.rho, "m": sample.mass}
+    for i, particle in enumerate(sample.particles):
+        for quantity, values in quantities.items():
+            row = summary.kinematics.loc[particle, quantity]
+            mean = np.average(values[:, i], weights=weights)
+            variance = np.average((values[:, i] - mean) ** 2, weights=weights)
+            assert row["mean"] == pytest.approx(mean, rel=1e-12)
+            assert row["rms"] == pytest.approx(np.sqrt(variance), rel=1e-6)
+            assert row["min"] == values[:, i].min()
+            assert row["max"] == values[:, i].max()
+
+
+def test_summarize_sources():
+    frame = read_pawian_hists(INPUT_FILE_ROOT6, "fitted")
+    expected = summarize(frame, chunk_events=500)
+    summary = summarize(INPUT_FILE_ROOT6, type_name="fitted", chunk_events=500)
+    assert summary.n_events == expected.n_events == len(frame)
+    assert summary.sum_weights == expected.sum_weights
+    assert_frame_equal(summary.kinematics, expected.kinematics)
+    summary = summarize(iter_ascii(INPUT_FILE_MC, 3, chunk_events=300))
+    assert summary.n_events == 1000
+    assert summary.sum_weights == 1000
+    assert summary.effective_size == 1000
+    assert list(summary.kinematics.index.get_level_values(0).unique()) == [
+        "Particle 1",
+        "Particle 2",
+        "Particle 3",
+    ]
+
+
+def test_summarize_exceptions():
+    frame = read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"])
+    with pytest.raises(ValueError, match=r"^All frames should have the same"):
+        summarize([frame, frame[["pi+", "D0", "weight"]]])
+    unweighted = frame.drop(columns="weight", level=0)
+    for frames in [[frame, unweighted], [unweighted.iloc[:10], frame]]:
+        with pytest.raises(ValueError, match=r"same particles and weights"):
+            summarize(frames)
+    with pytest.raises(ValueError, match=r"^Cannot summarize a sample without"):
+        summarize([])
+    with pytest.raises(ValueError, match=r"^workers has to be positive"):
+        summarize(frame, workers=0)
@@ -0,0 +1,62 @@
+from os.path import dirname, realpath
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.data import iter_ascii, read_ascii, unweight
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+PARTICLES = ["pi+", "D0", "D-"]
+
+
+def test_unweight():
+    frame = read_ascii(INPUT_FILE_DATA, PARTICLES)
+    frame["weight"] = np.linspace(0, 2, num=len(frame))
+    unweighted = frame.pwa.unweight(seed=42)
+    assert not unweighted.pwa.has_weights
+    assert unweighted.pwa.particles == PARTICLES
+    assert 450 < len(unweighted) < 550
+    assert frame.loc[unweighted.index, "weight"].mean() > 1.2
+    assert_frame_equal(frame.pwa.unweight(seed=42), unweighted)
+    assert not frame.pwa.unweight(seed=43).index.equals(unweighted.index)
+    assert len(frame.pwa.unweight(seed=42, max_weight=4)) < len(unweighted)
+    # the random numbers depend on the event numbers, not on the positions
+    part = frame.iloc[300:500].pwa.unweight(seed=42, max_weight=2)
+    assert_frame_equal(part, unweighted.loc[300:499])
+
+
+@pytest.mark.parametrize("chunk_events", [7, 1000])
+def test_unweight_streamed(chunk_events):
+    expected = read_ascii(INPUT_FILE_DATA, PARTICLES).pwa.unweight(seed=1)
+    frames = unweight(
+        INPUT_FILE_DATA, 1, particles=PARTICLES, chunk_events=chunk_events
+    )
+    assert_frame_equal(pd.concat(frames), expected)
+    max_weight = read_ascii(INPUT_FILE_DATA, PARTICLES)["weight"].max()
+    frames = unweight(iter_ascii(INPUT_FILE_DATA, PARTICLES, 300), 1, max_weight)
+    assert_frame_equal(pd.concat(frames), expected)
+
+
+def test_unweight_unweighted():
+    frame = read_ascii(INPUT_FILE_MC, PARTICLES)
+    assert frame.pwa.unweight(seed=0) is frame
+    assert_frame_equal(pd.concat(unweight(frame, chunk_events=300)), frame)
+
+
+def test_unweight_exceptions():
+    frame = read_ascii(INPUT_FILE_DATA, PARTICLES)
+    with pytest.raises(ValueError, match="need unique event numbers"):
+        pd.concat([frame, frame]).pwa.unweight()
+    with pytest.raises(ValueError, match=r"Cannot unweight weights outside \[0, 0.5\]"):
+        frame.pwa.unweight(max_weight=0.5)
+    frame["weight"] -= 1
+    with pytest.raises(ValueError, match="Cannot unweight weights outside"):
+        frame.pwa.unweight()
+    with pytest.raises(TypeError, match="requires a max_weight"):
+        unweight(iter_ascii(INPUT_FILE_DATA, PARTICLES))
@@ -1,11 +1,12 @@
 from os import remove
 from os.path import dirname, realpath
 
+import numpy as np
 import pytest
 from pandas.testing import assert_frame_equal
 
 import pawian
-from pawian.data import read_ascii
+from pawian.data import read_ascii, write_ascii
 
 PAWIAN_DIR = dirname(realpath(pawian.__file__))
 SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
@@ -29,3 +30,66 @@ def test_write_ascii(input_file):
     frame_out = read_ascii(OUTPUT_FILE, particles=particles)
     assert_frame_equal(frame_in, frame_out)
     remove(OUTPUT_FILE)
+
+
+@pytest.mark.parametrize(
+    ("input_file", "particles"),
+    [
+        (INPUT_FILE_DATA, None),
+        (INPUT_FILE_MC, ["pi+", "D0", "D-"]),
+    ],
+)
+@pytest.mark.parametrize("chunk_events", [7, 333, 10_000])
+def test_write_ascii_round_trip(tmp_path, input_file, particles, chunk_events):
+    """The default float format should read back exactly."""
+    frame_in = read_ascii(input_file, particles)
+    frame_in.iloc[:, 0] *= 1 / 3
+    output_file = tmp_path / "output.dat"
+    frame_in.pwa.write_ascii(output_file, chunk_events=chunk_events)
+    frame_out = read_ascii(
+        output_file, frame_in.pwa.particles, float_precision="round_trip"
+    )
+    assert_frame_equal(frame_in, frame_out, check_exact=True)
+
+
+def test_write_ascii_float_format(tmp_path):
+    frame = read_ascii(INPUT_FILE_DATA).iloc[:2]
+    output_file = tmp_path / "output.dat"
+    frame.pwa.write_ascii(output_file, float_format="%.3f")
+    assert output_file.read_text().splitlines()[:5] == [
+        "0.994",
+        "-0.004 0.096 0.018 0.171",
+        "0.224 0.623 0.215 1.991",
+        "-0.174 -0.719 -0.233 2.024",
+        "0.991",
+    ]
+    with pytest.raises(ValueError, match=r"^chunk_events has to be positive"):
+        frame.pwa.write_ascii(output_file, chunk_events=0)
+
+
+def test_write_ascii_missing_weights(tmp_path):
+    frame = read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"]).iloc[:3]
+    unweighted_file = tmp_path / "unweighted.dat"
+    frame.drop(columns="weight", level=0).pwa.write_ascii(unweighted_file)
+    output_file = tmp_path / "output.dat"
+    frame_nan = frame.copy()
+    frame_nan["weight"] = np.nan
+    frame_nan.pwa.write_ascii(output_file)
+    assert output_file.read_text() == unweighted_file.read_text()
+    frame_nan["weight"] = [0.5, np.nan, 2.0]
+    frame_nan.pwa.write_ascii(output_file, chunk_events=2)
+    lines = output_file.read_text().splitlines()
+    assert len(lines) == 3 * 4 - 1
+    assert lines[0] == "0.5"
+    assert lines[4:8] == [*unweighted_file.read_text().splitlines()[3:6], "2.0"]
+
+
+def test_write_ascii_kwargs(tmp_path):
+    frame = read_ascii(INPUT_FILE_DATA).iloc[:2]
+    output_file = tmp_path / "output.dat"
+    with pytest.warns(DeprecationWarning, match=r"\['sep'\]$") as record:
+        frame.pwa.write_ascii(output_file, sep=";")
+    assert record[0].filename == __file__
+    with pytest.warns(DeprecationWarning, match="pandas.DataFrame.to_csv"):
+        write_ascii(output_file, frame, mode="a")
+    assert_frame_equal(read_ascii(output_file, frame.pwa.particles), frame)
@@ -0,0 +1,112 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.convert import convert_file, main
+from pawian.data import read_ascii, read_binary, read_pawian_hists
+
+SAMPLE_DIR = Path(pawian.__file__).parent / "samples"
+INPUT_FILE_DATA = SAMPLE_DIR / "momentum_tuples_data.dat"
+INPUT_FILE_MC = SAMPLE_DIR / "momentum_tuples_mc.dat"
+INPUT_FILE_ROOT6 = SAMPLE_DIR / "pawianHists_ROOT6_DDpi.root"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_main(tmp_path: Path, capsys, workers: int):
+    input_dir = tmp_path / "input"
+    (input_dir / "sub").mkdir(parents=True)
+    shutil.copy(INPUT_FILE_DATA, input_dir / "data.dat")
+    shutil.copy(INPUT_FILE_DATA, input_dir / "sub" / "copy.dat")
+    (input_dir / "notes.md").write_text("Not an event file")
+    output_dir = tmp_path / "output"
+    args = [str(input_dir), "--to", "pawb", "-o", str(output_dir)]
+    args += ["--workers", str(workers), "--chunk-events", "300"]
+
+    assert main(args) == 0
+    output = capsys.readouterr().out
+    assert "1,000 events" in output
+    assert "Converted 2,000 events" in output
+    expected = read_ascii(INPUT_FILE_DATA)
+    for target in ["data.pawb", "sub/copy.pawb"]:
+        assert_frame_equal(read_binary(output_dir / target), expected)
+    assert sorted(p.name for p in output_dir.rglob("*")) == [
+        "copy.pawb",
+        "data.pawb",
+        "sub",
+    ]
+
+    assert main(args) == 0
+    output = capsys.readouterr().out
+    assert "up to date" not in output
+    assert "Converted 2,000 events" in output
+
+    args.append("--skip-existing")
+    assert main(args) == 0
+    output = capsys.readouterr().out
+    assert output.count("up to date") == 2
+    assert "Converted 0 events" in output
+
+    source = input_dir / "data.dat"
+    target_mtime = (output_dir / "data.pawb").stat().st_mtime_ns
+    os.utime(source, ns=(target_mtime + 10**9, target_mtime + 10**9))
+    assert main(args) == 0
+    assert capsys.readouterr().out.count("up to date") == 1
+
+
+def test_main_in_place(tmp_path: Path, capsys):
+    shutil.copy(INPUT_FILE_DATA, tmp_path / "data.dat")
+    args = [str(tmp_path), "--to", "dat.gz", "--workers", "1", "--skip-existing"]
+    assert main(args) == 0
+    assert "Converted 1,000 events" in capsys.readouterr().out
+    assert main(args) == 0
+    output = capsys.readouterr().out
+    assert output.count("up to date") == 1
+    assert "data.dat.gz ->" not in output
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data.dat", "data.dat.gz"]
+
+    with pytest.raises(SystemExit):
+        main([str(tmp_path), "--to", "pawb"])
+    assert "would both be converted to" in capsys.readouterr().err
+    assert not (tmp_path / "data.pawb").exists()
+
+
+@pytest.mark.parametrize("particles", [["3"], ["pi+", "D0", "D-"]])
+def test_main_particles(tmp_path: Path, capsys, particles: list[str]):
+    args = [str(INPUT_FILE_MC), "--to", "pawb", "-o", str(tmp_path)]
+    assert main([*args, "--workers", "1"]) == 1
+    assert "Cannot determine number of particles" in capsys.readouterr().err
+    assert main([*args, "--particles", *particles]) == 0
+    expected = read_ascii(
+        INPUT_FILE_MC, int(particles[0]) if len(particles) == 1 else particles
+    )
+    assert_frame_equal(read_binary(tmp_path / "momentum_tuples_mc.pawb"), expected)
+
+
+def test_main_failure(tmp_path: Path, capsys):
+    bad_file = tmp_path / "bad.dat"
+    bad_file.write_text("1 2 3\n")
+    assert main([str(bad_file), "--to", "dat.gz", "--workers", "1"]) == 1
+    assert "bad.dat" in capsys.readouterr().err
+    assert not (tmp_path / "bad.dat.gz").exists()
+    with pytest.raises(SystemExit):
+        main([str(bad_file), "--to", "dat"])
+
+
+@pytest.mark.parametrize("suffix", [".dat", ".dat.xz", ".pawb"])
+def test_convert_file(tmp_path: Path, suffix: str):
+    expected = read_pawian_hists(INPUT_FILE_ROOT6, "fitted")
+    target = tmp_path / f"fit{suffix}"
+    result = convert_file(INPUT_FILE_ROOT6, target, "fitted", chunk_events=1000)
+    assert result.n_events == len(expected)
+    assert not result.skipped
+    if suffix == ".pawb":
+        assert_frame_equal(read_binary(target), expected)
+    else:
+        converted = read_ascii(target, expected.pwa.particles)
+        assert_frame_equal(converted, expected)
+    assert not convert_file(INPUT_FILE_ROOT6, target, "fitted").skipped
+    assert convert_file(INPUT_FILE_ROOT6, target, "fitted", skip_existing=True).skipped
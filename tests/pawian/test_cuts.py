@@ -0,0 +1,107 @@
+import re
+from os.path import dirname, realpath
+
+import numpy as np
+import pytest
+from pandas.testing import assert_frame_equal
+
+import pawian
+from pawian.cuts import Cut
+from pawian.data import iter_ascii, read_ascii, select, write_ascii
+
+PAWIAN_DIR = dirname(realpath(pawian.__file__))
+SAMPLE_DIR = f"{PAWIAN_DIR}/samples"
+INPUT_FILE_DATA = f"{SAMPLE_DIR}/momentum_tuples_data.dat"
+INPUT_FILE_MC = f"{SAMPLE_DIR}/momentum_tuples_mc.dat"
+
+
+@pytest.fixture(scope="module")
+def frame():
+    return read_ascii(INPUT_FILE_DATA, ["pi+", "D0", "D-"])
+
+
+def test_evaluate(frame):
+    sample = frame.pwa.to_sample()
+    mass = frame.pwa.invariant_mass(["D0", "D-"]).to_numpy()
+    pi_p = frame["pi+"][["p_x", "p_y", "p_z"]].to_numpy()
+    cos_theta = pi_p[:, 2] / np.linalg.norm(pi_p, axis=1)
+    weights = frame.pwa.weights.to_numpy()
+    expected = {
+        "m(D0, D-) > 2.1": mass > 2.1,
+        "m(D0,D-) > 2.1 and cos_theta(pi+) < 0.5": (mass > 2.1) & (cos_theta < 0.5),
+        "2.05 < m(D0, D-) <= 2.2": (mass > 2.05) & (mass <= 2.2),
+        "not (m2(D0, D-) < 2.1**2 or weight > 1)": ~((mass**2 < 4.41) | (weights > 1)),
+        "-E(pi+) + 2 * E(D0) / 1e0 >= p(D-) - 1": (
+            -frame["pi+", "E"] + 2 * frame["D0", "E"] >= frame.pwa.rho["D-"] - 1
+        ).to_numpy(),
+        "pt(pi+) < .1 or phi(pi+) > 0": (np.hypot(pi_p[:, 0], pi_p[:, 1]) < 0.1)
+        | (np.arctan2(pi_p[:, 1], pi_p[:, 0]) > 0),
+        "px(pi+) + py(pi+) == pz(pi+) - 1": (pi_p[:, 0] + pi_p[:, 1] == pi_p[:, 2] - 1),
+    }
+    for expression, values in expected.items():
+        mask = Cut(expression).evaluate(sample)
+        assert mask.dtype == bool
+        np.testing.assert_allclose(mask, values, err_msg=expression)
+
+
+def test_evaluate_negative_mass2():
+    """Masses should be defined like in PwaAccessor.invariant_mass."""
+    frame = read_ascii(INPUT_FILE_MC, ["pi+", "D0", "D-"])
+    frame.loc[::2, [("pi+", "E"), ("D0", "E")]] = 0.0
+    assert frame.pwa.mask("m2(pi+) < 0").sum() == len(frame) // 2
+    for particles in [["pi+"], ["pi+", "D0"]]:
+        with pytest.warns(RuntimeWarning, match="invalid value"):
+            expected = frame.pwa.invariant_mass(particles) > 0.1
+        with pytest.warns(RuntimeWarning, match="invalid value"):
+            mask = frame.pwa.mask(f"m({', '.join(particles)}) > 0.1")
+        np.testing.assert_array_equal(mask, expected)
+    assert not mask.iloc[::2].any()
+
+
+def test_invalid_expression(frame):
+    with pytest.raises(ValueError, match=r"expected '\)', but found end"):
+        Cut("(m(D0) > 1")
+    with pytest.raises(ValueError, match=re.escape("unexpected 'mass'")):
+        Cut("mass(D0) > 1")
+    with pytest.raises(ValueError, match="expected particle names in parentheses"):
+        Cut("m > 1")
+    with pytest.raises(ValueError, match="empty particle name"):
+        Cut("m(D0,) > 1")
+    with pytest.raises(ValueError, match="invalid character at position 6"):
+        Cut("E(D0) $ 1")
+    with pytest.raises(ValueError, match="unexpected '1'"):
+        Cut("E(D0) > 1 1")
+    with pytest.raises(ValueError, match=re.escape("No particles ['K+']")):
+        frame.pwa.mask("m(K+, D0) > 1")
+    with pytest.raises(ValueError, match="does not give a boolean for each event"):
+        frame.pwa.mask("m(D0) + 1")
+    with pytest.raises(ValueError, match="does not give a boolean for each event"):
+        frame.pwa.mask("1 < 2")
+
+
+def test_select(frame):
+    cut = "m(D0, D-) > 2.1 and cos_theta(pi+) < 0.5"
+    mask = frame.pwa.mask(cut)
+    assert mask.index.equals(frame.index)
+    selected = frame.pwa.select(Cut(cut))
+    assert_frame_equal(selected, frame[mask])
+    assert 0 < len(selected) < len(frame)
+    particles = ["pi+", "D0", "D-"]
+    for source in [INPUT_FILE_DATA, frame, iter_ascii(INPUT_FILE_DATA, particles, 300)]:
+        frames = list(select(source, cut, particles=particles, chunk_events=77))
+        assert all(len(f) <= 77 for f in frames)
+        values = np.concatenate([f.to_numpy() for f in frames])
+        np.testing.assert_array_equal(values, selected.to_numpy())
+    with pytest.raises(ValueError, match="Invalid cut expression"):
+        select(INPUT_FILE_DATA, "m(D0) >")
+
+
+def test_skim(frame, tmp_path):
+    cut = "E(pi+) > 0.2"
+    filename = tmp_path / "skimmed.dat"
+    particles = ["pi+", "D0", "D-"]
+    selected = select(INPUT_FILE_DATA, cut, particles=particles, chunk_events=100)
+    write_ascii(filename, selected)
+    skimmed = read_ascii(filename, particles)
+    expected = frame.pwa.select(cut).reset_index(drop=True)
+    assert_frame_equal(skimmed, expected, check_dtype=False)
@@ -0,0 +1,121 @@
+from operator import itemgetter
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import pawian
+from pawian.data import iter_ascii, read_ascii, read_pawian_hists
+from pawian.hist import HistogramSpec, fill_many
+from pawian.qa import PawianHists
+
+PAWIAN_DIR = Path(pawian.__file__).parent
+SAMPLE_DIR = PAWIAN_DIR / "samples"
+INPUT_FILE_DATA = SAMPLE_DIR / "momentum_tuples_data.dat"
+PARTICLES = ["pi+", "D0", "D-"]
+SPECS = {
+    "pipD0": HistogramSpec(
+        lambda f: f.pwa.invariant_mass(["pi+", "D0"]), 100, (1.9982, 2.3165)
+    ),
+    "E_pip": HistogramSpec(itemgetter(("pi+", "E")), 40, (0.1, 0.5)),
+    "cos_theta": HistogramSpec(
+        lambda f: f.pwa.gj_angles("D0", ["D0", "D-"])["cos_theta"],
+        20,
+        (-1, 1),
+    ),
+}
+
+
+@pytest.mark.parametrize("chunk_events", [100, 333, 1_000_000])
+def test_fill_many(chunk_events):
+    frame = read_ascii(INPUT_FILE_DATA, PARTICLES)
+    hists = fill_many(frame, SPECS, chunk_events)
+    assert list(hists) == list(SPECS)
+    for name, (variable, bins, (low, high)) in SPECS.items():
+        edges, values = hists[name]
+        all_edges = np.linspace(low, high, bins + 1)
+        np.testing.assert_array_equal(edges, all_edges[:-1])
+        expected, _ = np.histogram(
+            np.asarray(variable(frame)), all_edges, weights=frame.pwa.weights
+        )
+        np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+    streamed = fill_many(iter_ascii(INPUT_FILE_DATA, PARTICLES, 128), SPECS)
+    for name, (edges, values) in hists.items():
+        np.testing.assert_array_equal(streamed[name][0], edges)
+        np.testing.assert_allclose(streamed[name][1], values, rtol=1e-12)
+
+
+def test_fill_many_pawian_hists():
+    """Filling from the data tree should reproduce the histograms from Pawian."""
+    filename = SAMPLE_DIR / "pawianHists_ROOT6_DDpi.root"
+    hist_file = PawianHists(filename)
+    frame = read_pawian_hists(filename, type_name="data")
+    subsystems = {"pipD0": ["pi+", "D0"], "pipDm": ["pi+", "D-"], "D0Dm": ["D0", "D-"]}
+    specs = {}
+    for name, particles in subsystems.items():
+        edges, values = hist_file.get_histogram_content(f"Data{name}")  # type: ignore[misc]
+        width = edges[1] - edges[0]
+        specs[name] = (
+            lambda f, p=particles: f.pwa.invariant_mass(p),
+            len(values),
+            (edges[0], edges[-1] + width),
+        )
+    hists = fill_many(frame, specs)
+    for name in subsystems:
+        edges, values = hist_file.get_histogram_content(f"Data{name}")  # type: ignore[misc]
+        np.testing.assert_allclose(hists[name][0], edges, rtol=1e-6)
+        np.testing.assert_allclose(hists[name][1], values, atol=1e-4)
+
+
+def test_fill_many_bin_edges():
+    """Values on and next to bin edges should fall in the same bins as with numpy."""
+    frame = read_ascii(SAMPLE_DIR / "momentum_tuples_mc.dat", PARTICLES)
+    ranges: dict[str, tuple[int, tuple[float, float]]] = {
+        "a": (1000, (0, 1)),
+        "b": (1000, (0, 1)),
+        "c": (7, (-1, 0.3)),
+        "d": (3, (0.1, 0.7)),
+    }
+    edges = np.concatenate([
+        np.linspace(low, high, bins + 1) for bins, (low, high) in ranges.values()
+    ])
+    edge_values = np.concatenate([
+        edges,
+        np.nextafter(edges, -np.inf),
+        np.nextafter(edges, np.inf),
+    ])
+    edge_values = np.resize(edge_values, len(frame))
+    specs = {
+        name: HistogramSpec(lambda f: edge_values[f.index], bins, value_range)
+        for name, (bins, value_range) in ranges.items()
+    }
+    hists = fill_many(frame, specs, chunk_events=300)
+    for name, (bins, (low, high)) in ranges.items():
+        expected, _ = np.histogram(
+            edge_values[edge_values < high], bins, range=(low, high)
+        )
+        np.testing.assert_array_equal(hists[name][1], expected, err_msg=name)
+
+
+def test_fill_many_unweighted():
+    frame = read_ascii(SAMPLE_DIR / "momentum_tuples_mc.dat", PARTICLES)
+    hists = fill_many(
+        frame, {"E_pip": SPECS["E_pip"], "all": (itemgetter(("D0", "E")), 1, (0, 100))}
+    )
+    assert hists["E_pip"][1].sum() == np.count_nonzero(
+        (frame["pi+", "E"] >= 0.1) & (frame["pi+", "E"] < 0.5)
+    )
+    np.testing.assert_array_equal(hists["all"][1], [len(frame)])
+
+
+def test_fill_many_exceptions():
+    frame = read_ascii(INPUT_FILE_DATA, PARTICLES)
+    with pytest.raises(ValueError, match=r"^Histogram \"E\" should have a positive"):
+        fill_many(frame, {"E": (itemgetter(("pi+", "E")), 0, (0, 1))})
+    with pytest.raises(ValueError, match=r"^Histogram \"E\" should have a positive"):
+        fill_many(frame, {"E": (itemgetter(("pi+", "E")), 10, (1, 0))})
+    with pytest.raises(ValueError, match=r"^Histogram variable should give one value"):
+        fill_many(frame, {"E": (lambda f: f.pwa.energy, 10, (0, 1))})
+    with pytest.raises(ValueError, match=r"^chunk_events has to be positive"):
+        fill_many(frame, {}, chunk_events=0)
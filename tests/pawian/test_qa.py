@@ -1,12 +1,17 @@
 # pyright: reportAssertAlwaysTrue=false
+import re
 from pathlib import Path
 from statistics import mean
+from typing import Literal
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pytest
+import uproot
+from uproot.writing.identify import to_TAxis, to_TProfile
 
 import pawian
-from pawian.qa import PawianHists
+from pawian.qa import PawianHists, PawianHistsCollection, _get_histogram_dimensions
 
 PAWIAN_DIR = Path(pawian.__file__).parent
 SAMPLE_DIR = Path(f"{PAWIAN_DIR}/samples")
@@ -152,3 +157,179 @@ def test_lorentz_vectors(filename: str, energy: float):
     pawian_hists = PawianHists(SAMPLE_DIR / filename)
     particle = pawian_hists.particles[0]
     assert pawian_hists.data[particle].E.mean() == energy
+
+
+def test_lazy_loading(monkeypatch):
+    """Samples should only be read on first access and only once."""
+    calls = []
+
+    def read_pawian_hists(source, type_name):
+        calls.append(type_name)
+        return pawian.data.read_pawian_hists(source, type_name)
+
+    monkeypatch.setattr(pawian.qa, "read_pawian_hists", read_pawian_hists)
+    with PawianHists(SAMPLE_DIR / FILENAME_ROOT6) as pawian_hists:
+        assert pawian_hists.get_histogram_content("DataD0Dm") is not None
+        assert calls == []
+        assert len(pawian_hists.fit) == 2505
+        assert calls == ["fitted"]
+        pawian_hists.load()
+        pawian_hists.load()
+        assert calls == ["fitted", "data"]
+        assert pawian_hists.particles == ["pi+", "D0", "D-"]
+    assert len(calls) == 2
+    assert len(pawian_hists.data) == 501
+
+
+def test_close():
+    pawian_hists = PawianHists(SAMPLE_DIR / FILENAME_ROOT6)
+    pawian_hists.close()
+    with pytest.raises(OSError):  # noqa: PT011
+        pawian_hists.fit  # noqa: B018
+
+
+def test_catalogue():
+    pawian_hists = PawianHists(SAMPLE_DIR / FILENAME_ROOT6)
+    catalogue = pawian_hists.catalogue
+    assert list(catalogue) == pawian_hists.unique_histogram_names
+    entry = catalogue["pipDm"]
+    assert entry.ndim == 1
+    assert entry.variants == {"data": "DatapipDm", "mc": "MCpipDm", "fit": "FitpipDm"}
+    entry = catalogue["ThetaHeli_pip_FrompipD0Dm"]
+    assert entry.variants == {
+        "data": "DataThetaHeli_pip_FrompipD0Dm",
+        "mc": "McThetaHeli_pip_FrompipD0Dm",
+        "fit": "FitThetaHeli_pip_FrompipD0Dm",
+    }
+    assert sorted(
+        name for entry in catalogue.values() for name in entry.variants.values()
+    ) == sorted(pawian_hists.histogram_names)
+
+
+def _create_profile(name: str, means: np.ndarray) -> object:
+    entries = np.array([0, *np.full(len(means), 4.0), 0])
+    sum_weights = np.array([0, *(4 * means), 0])
+    sum_weights2 = np.array([0, *(4 * means**2 + 1), 0])
+    return to_TProfile(
+        name, "", sum_weights, entries.sum(), entries.sum(), entries.sum(), 0.0, 0.0,
+        sum_weights.sum(), sum_weights2.sum(), sum_weights2, entries, np.array([]),
+        to_TAxis("xaxis", "", len(means), 0.0, 1.0),
+    )  # fmt: skip
+
+
+def test_profiles(tmp_path: Path):
+    filename = tmp_path / "profiles.root"
+    means = np.array([1.0, 2.0, 3.0])
+    with uproot.recreate(filename) as root_file:
+        root_file["DataProf"] = _create_profile("DataProf", means)
+        root_file["FitProf"] = _create_profile("FitProf", 2 * means)
+    with PawianHists(filename) as pawian_hists:
+        assert pawian_hists.histogram_names == ["DataProf", "FitProf"]
+        entry = pawian_hists.catalogue["Prof"]
+        assert entry.ndim == 1
+        assert entry.variants == {"data": "DataProf", "fit": "FitProf"}
+        content = pawian_hists.get_histogram_content("DataProf")
+        assert content is not None
+        edges, values = content
+        np.testing.assert_allclose(edges, [0, 1 / 3, 2 / 3])
+        np.testing.assert_allclose(values, means)
+        row = pawian_hists.compare().loc["Prof"]
+    pulls = -means / np.sqrt(2 * 0.25 / 4)
+    assert row["chi2"] == pytest.approx((pulls**2).sum())
+
+
+def test_skipped_histograms(caplog):
+    class Directory:
+        def classnames(self, cycle: bool) -> dict[str, str]:  # noqa: ARG002
+            return {"h1": "TH1D", "p2": "TProfile2D", "poly": "TH2Poly", "t": "TTree"}
+
+    with caplog.at_level("WARNING", logger="pawian.qa"):
+        dimensions = _get_histogram_dimensions(Directory())  # type: ignore[arg-type]
+    assert dimensions == {"h1": 1, "p2": 2}
+    assert caplog.messages == ['Skipping histogram "poly" of unsupported class TH2Poly']
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("workers", [1, 2])
+def test_export_all(tmp_path: Path, workers: int):
+    with PawianHists(SAMPLE_DIR / FILENAME_ROOT6) as pawian_hists:
+        filenames = pawian_hists.export_all(
+            tmp_path / "plots", fmt="svg", workers=workers, pdf=tmp_path / "all.pdf"
+        )
+        names = pawian_hists.unique_histogram_names
+        with pytest.raises(ValueError, match=r"^workers has to be positive"):
+            pawian_hists.export_all(tmp_path, workers=0)
+    assert len(filenames) == 19
+    assert [filename.stem for filename in filenames] == names
+    assert sorted((tmp_path / "plots").iterdir()) == sorted(filenames)
+    pdf = (tmp_path / "all.pdf").read_bytes()
+    assert len(re.findall(rb"/Type /Page\b", pdf)) == 19
+
+
+def test_collection(tmp_path: Path):
+    original = PawianHists(SAMPLE_DIR / FILENAME_ROOT6)
+    edges, values = original.get_histogram_content("FitpipDm")  # type: ignore[misc]
+    edges = np.append(edges, 2 * edges[-1] - edges[-2])
+    filenames = [SAMPLE_DIR / FILENAME_ROOT6]
+    for factor in [2, 3]:
+        filename = tmp_path / f"variant{factor}.root"
+        with uproot.recreate(filename) as root_file:
+            root_file["FitpipDm"] = factor * values, edges
+            root_file["FitD0Dm"] = values, edges
+        filenames.append(filename)
+    with PawianHistsCollection(filenames, workers=3) as collection:
+        assert len(collection) == 3
+        assert collection.filenames == filenames
+        assert collection.histogram_names == ["FitpipDm", "FitD0Dm"]
+        stacked_edges, stack = collection.get_histogram_stack("FitpipDm")
+        assert stack.shape == (3, len(values))
+        np.testing.assert_allclose(stacked_edges, edges)
+        np.testing.assert_allclose(stack, [values, 2 * values, 3 * values])
+        bands = collection.get_bands("FitpipDm")
+        np.testing.assert_allclose(bands.mean, 2 * values)
+        np.testing.assert_allclose(bands.std, np.sqrt(2 / 3) * values)
+        np.testing.assert_allclose(bands.min, values)
+        np.testing.assert_allclose(bands.max, 3 * values)
+        _, axes = plt.subplots()
+        drawn_bands = collection.draw_bands("FitpipDm", axes)
+        np.testing.assert_allclose(drawn_bands.mean, bands.mean)
+        assert len(axes.patches) == 3
+        with pytest.raises(ValueError, match=r"^Binning of histogram \"FitD0Dm\""):
+            collection.get_histogram_stack("FitD0Dm")
+        with pytest.raises(KeyError, match=r"Histogram \"DatapipDm\" does not exist"):
+            collection.get_histogram_stack("DatapipDm")
+    with pytest.raises(FileNotFoundError):
+        PawianHistsCollection([*filenames, tmp_path / "non-existent.root"])
+    with pytest.raises(ValueError, match=r"^Need at least one file"):
+        PawianHistsCollection([])
+
+
+@pytest.mark.parametrize("reference", ["fit", "mc"])
+def test_compare(reference: Literal["fit", "mc"]):
+    pawian_hists = PawianHists(SAMPLE_DIR / FILENAME_ROOT6)
+    table = pawian_hists.compare(reference=reference)
+    assert sorted(table.index) == sorted(pawian_hists.unique_histogram_names)
+    assert table["chi2_ndf"].is_monotonic_decreasing
+    assert pawian_hists.compare("ks", reference)["ks"].is_monotonic_decreasing
+    assert pawian_hists.compare("pull", reference)["max_pull"].is_monotonic_decreasing
+
+    variants = pawian_hists.catalogue["pipDm"].variants
+    data = pawian_hists.get_uproot_histogram(variants["data"])
+    other = pawian_hists.get_uproot_histogram(variants[reference])
+    assert data is not None
+    assert other is not None
+    scale = data.values().sum() / other.values().sum()
+    differences = data.values() - scale * other.values()
+    variances = data.variances() + scale**2 * other.variances()
+    is_used = variances > 0
+    pulls = differences[is_used] / np.sqrt(variances[is_used])
+    cdf_differences = np.cumsum(differences) / data.values().sum()
+    row = table.loc["pipDm"]
+    assert row["n_bins"] == 100
+    assert row["ndf"] == is_used.sum()
+    assert row["chi2"] == pytest.approx((pulls**2).sum(), rel=1e-5)
+    assert row["max_pull"] == pytest.approx(np.abs(pulls).max(), rel=1e-5)
+    assert row["ks"] == pytest.approx(np.abs(cdf_differences).max(), rel=1e-5)
+
+    with pytest.raises(ValueError, match=r"^metric should be one of"):
+        pawian_hists.compare("likelihood")  # type: ignore[arg-type]